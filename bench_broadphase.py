@@ -0,0 +1,91 @@
+"""
+Pong.tick with the paddle SpatialHash against the every-ball-every-paddle
+loop it replaced, over a range of paddle and ball counts.
+
+    python bench_broadphase.py                          default 2..64 paddles, 10k and 100k balls
+    python bench_broadphase.py -p 64 -n 100000 -t 3     one configuration
+    python bench_broadphase.py -o broadphase.json       save ticks/sec as JSON (see bench_vector)
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from functools import cached_property
+
+from bench_vector import DEFAULT_TOLERANCE, compare, dump, load
+from broadphase import SpatialHash
+from pong import Pong
+from vector import MV, V, V_ZERO
+
+PADDLE_COUNTS = (2, 8, 16, 64)
+BALL_COUNTS = (10_000, 100_000)
+DT = 1 / 144
+
+class BruteForcePong(Pong):
+    "Pong with a single infinite cell, so every ball is tested against every paddle"
+
+    @cached_property
+    def paddleHash(self) -> SpatialHash:
+        return SpatialHash(float("inf"))
+
+def arena(cls: type, paddles: int, balls: int) -> Pong:
+    "a seeded game with `paddles` paddles spread over the left and right thirds"
+    game = cls(seed=1)
+    game.add_balls(balls)
+    # scatter the balls over the page so the paddles see a realistic hit rate
+    for ball in game.balls:
+        ball.assign(V.from_random_square(V_ZERO, game.pageSize - game.ballSize, game.rng))
+    rows = max(1, paddles // 4)
+    left, right = game.paddleBoundsLeft, game.paddleBoundsRight
+    game.paddles = []
+    for k in range(paddles):
+        lo, hi = (left, right)[k % 2]
+        column, row = (k // 2) % 2, (k // 4) % rows
+        game.paddles.append(MV(lo._x + (hi._x - lo._x) * column, lo._y + (hi._y - lo._y) * (row + 0.5) / rows))
+    game.paddleInput = [V_ZERO for _ in range(paddles)]
+    return game
+
+def ticks_per_second(game: Pong, ticks: int) -> float:
+    start = time.perf_counter()
+    for _ in range(ticks):
+        game.tick(DT)
+    return ticks / (time.perf_counter() - start)
+
+def run(paddleCounts=PADDLE_COUNTS, ballCounts=BALL_COUNTS, ticks: int = 2) -> dict[str, float]:
+    "ticks/sec keyed by `<hash|brute>.<paddles>x<balls>`"
+    results = {}
+    for balls in ballCounts:
+        for paddles in paddleCounts:
+            for name, cls in (("hash", Pong), ("brute", BruteForcePong)):
+                results[f"{name}.{paddles}x{balls}"] = ticks_per_second(arena(cls, paddles, balls), ticks)
+    return results
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pong paddle broadphase benchmark")
+    parser.add_argument("-p", "--paddles", type=int, nargs="+", default=PADDLE_COUNTS)
+    parser.add_argument("-n", "--balls", type=int, nargs="+", default=BALL_COUNTS)
+    parser.add_argument("-t", "--ticks", type=int, default=2)
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown in percent before failing")
+    args = parser.parse_args(argv)
+
+    results = run(args.paddles, args.balls, args.ticks)
+    print(f"{'paddles':>8}{'balls':>10}{'hash ms/tick':>16}{'brute ms/tick':>16}{'speedup':>10}")
+    for balls in args.balls:
+        for paddles in args.paddles:
+            fast, slow = results[f"hash.{paddles}x{balls}"], results[f"brute.{paddles}x{balls}"]
+            print(f"{paddles:>8}{balls:>10}{1000 / fast:>16.1f}{1000 / slow:>16.1f}{fast / slow:>9.1f}x")
+    if args.output:
+        dump(results, args.output)
+    if args.baseline:
+        regressions = compare(load(args.baseline), results, args.tolerance)
+        for key, old, new, change in regressions:
+            print(f"REGRESSION {key}: {old:,.2f} -> {new:,.2f} ticks/s ({change:+.1f}%)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
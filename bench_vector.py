@@ -0,0 +1,210 @@
+"""
+Microbenchmarks for the Vector operations the game ticks lean on.
+
+    python bench_vector.py                          print ops/sec per implementation
+    python bench_vector.py -o results.json          ...and save them as JSON
+    python bench_vector.py -b results.json -t 10    fail (exit 1) if any op is
+                                                    more than 10% slower than
+                                                    results.json
+
+Implementations measured:
+    checked  vector.CheckedVector, validating operands
+    fast     vector.FastVector, the unchecked default
+    mutable  vector.FastMutableVector using the in place i* methods
+    tuple    plain (x, y) tuples and inline arithmetic, as a floor
+    array    vector.VectorArray, per row over a batch of ARRAY_ROWS rows
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from math import cos, sin
+from timeit import Timer
+
+from vector import A, CheckedVector, FastMutableVector, FastVector, VectorArray
+
+np = None
+with suppress(ImportError):
+    import numpy as np
+
+OPERATIONS = ("add", "mul", "bind", "inside", "approach", "signs", "rotate", "unpack")
+ARRAY_ROWS = 10_000
+DEFAULT_TOLERANCE = 10.
+
+# each suite maps an operation to a zero argument callable doing it once,
+# plus how many vector operations one call stands for
+
+def vector_suite(cls: type) -> dict[str, tuple[Callable[[], object], int]]:
+    a, b = cls(3.25, -7.5), cls(-1.5, 2.25)
+    lo, hi = cls(-4, -4), cls(4, 4)
+    target = cls(200, 150)
+    angle = A(degrees=37)
+    def unpack():
+        x, y = a
+    return {
+        "add": (lambda: a + b, 1),
+        "mul": (lambda: a * b, 1),
+        "bind": (lambda: a.bind(lo, hi), 1),
+        "inside": (lambda: a.inside(lo, hi), 1),
+        "approach": (lambda: a.approach(target, 0.0006), 1),
+        "signs": (lambda: a.signs(), 1),
+        "rotate": (lambda: a.rotate(angle), 1),
+        "unpack": (unpack, 1),
+    }
+
+def mutable_suite() -> dict[str, tuple[Callable[[], object], int]]:
+    a, b = FastMutableVector(3.25, -7.5), FastVector(-1.5, 2.25)
+    lo, hi = FastVector(-4, -4), FastVector(4, 4)
+    target = FastVector(200, 150)
+    angle = A(degrees=37)
+    scratch = FastMutableVector(0, 0)
+    def unpack():
+        x, y = a._x, a._y
+    def rotate():
+        sinb, cosb = angle.sincos
+        scratch.set((cosb * a._x) - (sinb * a._y), (sinb * a._x) + (cosb * a._y))
+    return {
+        "add": (lambda: scratch.assign(a).iadd(b), 1),
+        "mul": (lambda: scratch.assign(a).imul(b), 1),
+        "bind": (lambda: scratch.assign(a).ibind(lo, hi), 1),
+        "inside": (lambda: a.inside(lo, hi), 1),
+        "approach": (lambda: scratch.assign(a).iapproach(target, 0.0006), 1),
+        "signs": (lambda: scratch.assign(a).isigns(), 1),
+        "rotate": (rotate, 1),
+        "unpack": (unpack, 1),
+    }
+
+def tuple_suite() -> dict[str, tuple[Callable[[], object], int]]:
+    a, b = (3.25, -7.5), (-1.5, 2.25)
+    lo, hi = (-4, -4), (4, 4)
+    target = (200, 150)
+    angle = A(degrees=37).radians
+    def unpack():
+        x, y = a
+    return {
+        "add": (lambda: (a[0] + b[0], a[1] + b[1]), 1),
+        "mul": (lambda: (a[0] * b[0], a[1] * b[1]), 1),
+        "bind": (lambda: (min(max(a[0], lo[0]), hi[0]), min(max(a[1], lo[1]), hi[1])), 1),
+        "inside": (lambda: lo[0] <= a[0] <= hi[0] and lo[1] <= a[1] <= hi[1], 1),
+        "approach": (lambda: (a[0] + (target[0] - a[0]) * 0.0006, a[1] + (target[1] - a[1]) * 0.0006), 1),
+        "signs": (lambda: (1 if round(a[0]) >= 0 else -1, 1 if round(a[1]) >= 0 else -1), 1),
+        "rotate": (lambda: (cos(angle) * a[0] - sin(angle) * a[1], sin(angle) * a[0] + cos(angle) * a[1]), 1),
+        "unpack": (unpack, 1),
+    }
+
+def array_suite() -> dict[str, tuple[Callable[[], object], int]]:
+    rng = np.random.default_rng(0)
+    a = VectorArray(rng.uniform(-8, 8, (ARRAY_ROWS, 2)))
+    b = VectorArray(rng.uniform(-8, 8, (ARRAY_ROWS, 2)))
+    lo, hi = FastVector(-4, -4), FastVector(4, 4)
+    target = FastVector(200, 150)
+    angle = A(degrees=37)
+    return {
+        "add": (lambda: a + b, ARRAY_ROWS),
+        "mul": (lambda: a * b, ARRAY_ROWS),
+        "bind": (lambda: a.bind(lo, hi), ARRAY_ROWS),
+        "inside": (lambda: a.inside(lo, hi), ARRAY_ROWS),
+        "approach": (lambda: a.approach(target, 0.0006), ARRAY_ROWS),
+        "signs": (lambda: a.signs(), ARRAY_ROWS),
+        "rotate": (lambda: a.rotate(angle), ARRAY_ROWS),
+        "unpack": (lambda: a._data.tolist(), ARRAY_ROWS),
+    }
+
+def suites() -> dict[str, dict[str, tuple[Callable[[], object], int]]]:
+    found = {
+        "checked": vector_suite(CheckedVector),
+        "fast": vector_suite(FastVector),
+        "mutable": mutable_suite(),
+        "tuple": tuple_suite(),
+    }
+    if np is not None:
+        found["array"] = array_suite()
+    return found
+
+def measure(func: Callable[[], object], weight: int, seconds: float, repeat: int) -> float:
+    "best ops/sec of `repeat` runs, each lasting about `seconds`"
+    timer = Timer(func)
+    # calibrate on a short run, then scale the loop count up to `seconds`
+    number = 1
+    while (elapsed := timer.timeit(number)) < 0.01:
+        number *= 10
+    number = max(1, int(number * seconds / elapsed))
+    best = min(timer.repeat(repeat, number))
+    return number * weight / best
+
+def run(seconds: float = 0.2, repeat: int = 3, only: str = None) -> dict[str, float]:
+    "ops/sec keyed by `<implementation>.<operation>`"
+    results = {}
+    for name, suite in suites().items():
+        for op in OPERATIONS:
+            key = f"{name}.{op}"
+            if only is None or only in key:
+                results[key] = measure(*suite[op], seconds, repeat)
+    return results
+
+def compare(baseline: dict[str, float], results: dict[str, float], tolerance: float = DEFAULT_TOLERANCE) -> list[tuple[str, float, float, float]]:
+    "(key, baseline ops/sec, new ops/sec, percent change) for every op slower by more than `tolerance` percent"
+    regressions = []
+    for key, new in results.items():
+        if key not in baseline:
+            continue
+        old = baseline[key]
+        change = (new - old) / old * 100
+        if change < -tolerance:
+            regressions.append((key, old, new, change))
+    return regressions
+
+def report(results: dict[str, float], baseline: dict[str, float] = None):
+    for key, ops in results.items():
+        line = f"{key:<20}{ops:>16,.0f} ops/s"
+        if baseline and key in baseline:
+            line += f"{(ops - baseline[key]) / baseline[key] * 100:>+10.1f}%"
+        print(line)
+
+def dump(results: dict[str, float], path: str):
+    with open(path, "w") as file:
+        json.dump({
+            "meta": {
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "machine": platform.machine(),
+                "numpy": None if np is None else np.__version__,
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }, file, indent=2)
+
+def load(path: str) -> dict[str, float]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Vector microbenchmarks")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="compare against the results in this JSON file")
+    parser.add_argument("-t", "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown in percent before failing")
+    parser.add_argument("-s", "--seconds", type=float, default=0.2, help="rough duration of each timing run")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="timing runs per op; the best is kept")
+    parser.add_argument("-k", "--only", help="only run ops whose key contains this text, e.g. fast. or .rotate")
+    args = parser.parse_args(argv)
+
+    baseline = load(args.baseline) if args.baseline else None
+    results = run(args.seconds, args.repeat, args.only)
+    report(results, baseline)
+    if args.output:
+        dump(results, args.output)
+    if baseline:
+        regressions = compare(baseline, results, args.tolerance)
+        for key, old, new, change in regressions:
+            print(f"REGRESSION {key}: {old:,.0f} -> {new:,.0f} ops/s ({change:+.1f}%)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,10 +5,16 @@ import os
 import sys
 from contextlib import suppress
 from functools import cached_property
-from math import atan, pi
+from random import Random
 
+from collision import hit_side, reflect
+from config import BreakoutConfig, Setting
+from events import (BALL_LOST, BLOCK_DESTROYED, BOTTOM_WALL, LEFT_WALL, PADDLE_HIT, RIGHT_WALL, TOP_WALL, WALL_HIT,
+    EventBuffer)
 from pyserve import create_log_target, initialise_log_manager
-from vector import V, Vector, A, Angle
+from snapshot import BREAKOUT, pack, restore_vectors, snapshot_vectors, unpack
+from vector import MV, MutableVector, Rect, V, Vector
+from vector import V_NEG_ONE, V_ONE, V_ZERO
 
 # work out where the program is running to find texture files.
 ROUTE = "\\".join(sys.argv[0].split("\\")[:-1:]) + "\\"
@@ -32,162 +38,201 @@ log = LM.create_log({"breakout", "stdout"}, defaultKwargs={"flush": True})
 
 class Breakout:
 
-    pageSize: Vector = V(1500, 1000)
+    # tuning constants and the bounds derived from them; every Setting
+    # below reads through to it
+    config: BreakoutConfig = BreakoutConfig()
+
+    pageSize: Vector = Setting()
 
     score: int = 0
 
     paddles: list[Vector]
+    paddleRects: list[Rect] = []
     balls: list[Vector]
     blocks: list[Vector]
+    blockRects: list[Rect]
 
     ballVelocities: list[Vector]
 
     paddleInput: list[Vector] = []
 
-    paddleSize: Vector = V(140, 24)
-    paddleOffset: Vector = V(0, 20)
-    paddleMaxSpeed: Vector = V(900, 600)
-    paddleElasticity: Vector = V(1, 1)
-    paddlePlayableSize: Vector = (pageSize.vy / 2)
-
-    ballSize: Vector = V(6, 6)
-    ballSpeedLow: Vector = V(1, 1)
-    ballSpeedHigh: Vector = V(2, 2)
-    ballSpeedRNGScale: float = 0.5
-    ballIdealSpeed: Vector = V(100, 200)
-    ballReturnToIdealFactor: float = 0.001
-    ballStartSpeed: Vector = V(0, 100)
-    ballStartLocation: Vector = (pageSize.vy / 4) + (pageSize.vx / 2)
-    ballBaseSpeed: Vector = V(100, 100)
-    ballBumpMultiplier: Vector = V(1, 1)
-
-    blockSize: Vector = V(42, 32)
+    paddleSize: Vector = Setting()
+    paddleOffset: Vector = Setting()
+    paddleMaxSpeed: Vector = Setting()
+    paddleElasticity: Vector = Setting()
+    paddlePlayableSize: Vector = Setting()
+
+    ballSize: Vector = Setting()
+    ballSpeedLow: Vector = Setting()
+    ballSpeedHigh: Vector = Setting()
+    ballSpeedRNGScale: float = Setting()
+    ballIdealSpeed: Vector = Setting()
+    ballReturnToIdealFactor: float = Setting()
+    ballStartSpeed: Vector = Setting()
+    ballStartLocation: Vector = Setting()
+    ballBaseSpeed: Vector = Setting()
+    ballBumpMultiplier: Vector = Setting()
+
+    blockSize: Vector = Setting()
+    paddleBounds: tuple[Vector, Vector] = Setting()
+
+    # contacts since the game was created, for stats and the match runner
+    paddleHits: int = 0
+    blockHits: int = 0
+    wallHits: int = 0
+    # when set, tick appends what happens to it (see events.py)
+    events: EventBuffer = None
+
+    seed: int
+    rng: Random
+
+    def __init__(self, seed: int = None, config: BreakoutConfig = None):
+        # every random draw the game makes comes from rng, so a seed replays a match
+        self.seed = seed
+        self.rng = Random(seed)
+        if config is not None:
+            self.config = config
 
     def create_game_normal(self):
-        self.balls = [self.ballStartLocation for _ in range(1)]
-        self.ballVelocities = [self.ballStartSpeed * Vector.from_random_sign() * Vector.from_random_square(self.ballSpeedLow, self.ballSpeedHigh) * self.ballSpeedRNGScale for _ in range(1)]
-        self.paddles = [(self.pageSize.vy - self.paddleSize.vy - self.paddleOffset.vy) 
-        + ((self.pageSize.vx) / 2 - (self.paddleSize.vx))]
-        self.paddleInput = [V(0, 0)]
+        self.balls = [MV(*self.ballStartLocation) for _ in range(1)]
+        self.ballVelocities = [MV(*(self.ballStartSpeed * Vector.from_random_sign(self.rng) * Vector.from_random_square(self.ballSpeedLow, self.ballSpeedHigh, self.rng) * self.ballSpeedRNGScale)) for _ in range(1)]
+        self.paddles = [MV(*((self.pageSize.vy - self.paddleSize.vy - self.paddleOffset.vy) 
+        + ((self.pageSize.vx) / 2 - (self.paddleSize.vx))))]
+        self.paddleInput = [V_ZERO]
         xdc = (self.pageSize.x // (self.blockSize.x)) - 1
         self.blocks = []
         for j in range(4):
             self.blocks.extend([V(self.blockSize.x * i + ((j % 2) * (self.blockSize.x / 2)), self.blockSize.y * j) for i in range(xdc)])
+        # blocks never move so their collision boxes are built once
+        self.blockRects = [Rect.from_vectors(block, self.blockSize) for block in self.blocks]
+
+    def snapshot(self) -> bytes:
+        "the whole match (balls, paddle, input, blocks, score, counters and rng) as one buffer, see snapshot.py"
+        return pack(BREAKOUT, (), (self.score, self.paddleHits, self.blockHits, self.wallHits), self.rng,
+            (snapshot_vectors(self.balls), snapshot_vectors(self.ballVelocities), snapshot_vectors(self.paddles),
+            snapshot_vectors(self.paddleInput), snapshot_vectors(self.blocks)))
+
+    def restore(self, data) -> Breakout:
+        "put back a snapshot(), reusing the existing vectors where the counts match"
+        _, (self.score, self.paddleHits, self.blockHits, self.wallHits), (balls, velocities, paddles, inputs, blocks) = unpack(data, BREAKOUT, self.rng)
+        self.balls = restore_vectors(balls, getattr(self, "balls", None), MV)
+        self.ballVelocities = restore_vectors(velocities, getattr(self, "ballVelocities", None), MV)
+        self.paddles = restore_vectors(paddles, getattr(self, "paddles", None), MV)
+        self.paddleInput = restore_vectors(inputs, self.paddleInput)
+        self.blocks = restore_vectors(blocks, getattr(self, "blocks", None))
+        if len(getattr(self, "blockRects", ())) != len(self.blocks):
+            # destroyed blocks are never tested, so their boxes don't matter
+            self.blockRects = [Rect(0, 0, 0, 0) if block is None else Rect.from_vectors(block, self.blockSize) for block in self.blocks]
+        return self
 
     def move_paddles(self, dt: float):
+        step = self._scratch
+        config = self.config
         for i, paddle in enumerate(self.paddles):
-            paddleInput = self.paddleInput[i].bind(V(-1, -1), V(1, 1))
-            self.paddles[i] = (paddle + (self.paddleMaxSpeed * paddleInput * dt)).bind(self.pageSize.vy - self.paddlePlayableSize, 
-            self.pageSize - self.paddleOffset - self.paddleSize)
+            step.assign(self.paddleInput[i]).ibind(V_NEG_ONE, V_ONE).imul(config.paddleMaxSpeed).imul(dt)
+            paddle.iadd(step).ibind(*config.paddleBounds)
 
     def passive_speed_modification(self):
-        for i, currentVelocity in enumerate(self.ballVelocities):
-            signs = currentVelocity.signs()
-            self.ballVelocities[i] = signs * abs(currentVelocity).approach(self.ballIdealSpeed, self.ballReturnToIdealFactor)
+        signs = self._scratch
+        ideal, factor = self.config.ballIdealSpeed, self.config.ballReturnToIdealFactor
+        for currentVelocity in self.ballVelocities:
+            signs.assign(currentVelocity).isigns()
+            currentVelocity.iabs().iapproach(ideal, factor).imul(signs)
 
     def block_collision(self, candidate: Vector, i: int, j: int, block: Vector):
-        blockCentre = block + (self.blockSize / 2)
-        candidateCentre = candidate + (self.ballSize / 2)
-        velocity = (self.ballVelocities[i] * self.ballBumpMultiplier)
-        angle = A(vector=(blockCentre - candidateCentre)).radians
-        full = A(degrees=360).radians
-        half = A(degrees=180).radians
-        theta = self.theta.radians
-        if angle <= theta and angle >= (full - theta):
-            # top of paddle
-            self.ballVelocities[i] = velocity.vx + -abs(velocity.vy)
-        elif angle >= theta and angle <= (half - theta):
-            # left side
-            self.ballVelocities[i] = -abs(velocity.vx) + velocity.vy
-        elif angle >= (half - theta) and angle <= (half + theta):
-            # bottom
-            self.ballVelocities[i] = velocity.vx + abs(velocity.vy)
-        else:
-            # right side
-            self.ballVelocities[i] = abs(velocity.vx) + velocity.vy
+        self.blockHits += 1
+        # the side the ball is least far into, see collision.hit_side
+        rect = self.blockRects[j]
+        self.bounce(i, self.ballVelocities[i] * self.ballBumpMultiplier, hit_side(candidate._x, candidate._y,
+            self.config.ballW, self.config.ballH, rect.x0, rect.y0, rect.x1, rect.y1))
 
     def paddle_collision(self, candidate: Vector, i: int, j: int, paddle: Vector):
-        paddleCentre = paddle + (self.paddleSize / 2)
-        candidateCentre = candidate + (self.ballSize / 2)
-        angle = A(vector=(paddleCentre - candidateCentre)).radians
-        full = A(degrees=360).radians
-        half = A(degrees=180).radians
-        theta = self.theta.radians
         #              <initial velocity>                            <paddle velocity>                              <scale up from collision>
         velocity = ((self.ballVelocities[i] + (self.paddleInput[j] * self.paddleMaxSpeed * self.paddleElasticity)) * self.ballBumpMultiplier)
-        if angle <= theta and angle >= (full - theta):
-            # top of paddle
-            self.ballVelocities[i] = velocity.vx + -abs(velocity.vy)
-        elif angle >= theta and angle <= (half - theta):
-            # left side
-            self.ballVelocities[i] = -abs(velocity.vx) + velocity.vy
-        elif angle >= (half - theta) and angle <= (half + theta):
-            # bottom
-            self.ballVelocities[i] = velocity.vx + abs(velocity.vy)
-        else:
-            # right side
-            self.ballVelocities[i] = abs(velocity.vx) + velocity.vy
+        self.paddleHits += 1
+        if self.events is not None:
+            self.events.add(PADDLE_HIT, i, j)
+        rect = self.paddleRects[j]
+        self.bounce(i, velocity, hit_side(candidate._x, candidate._y,
+            self.config.ballW, self.config.ballH, rect.x0, rect.y0, rect.x1, rect.y1))
+
+    def bounce(self, i: int, velocity: Vector, side: tuple[int, int]):
+        "ball i takes `velocity`, bounced off a surface facing `side` (see collision.TOP etc.)"
+        self.ballVelocities[i].set(*reflect(velocity._x, velocity._y, side))
 
     def wall_collision(self, i: int, candidate: Vector):
         velocity = self.ballVelocities[i]
+        events = self.events
+        config = self.config
         # top collision
         if candidate.y < 0:
-            self.ballVelocities[i] = velocity.vx + abs(velocity.vy)
-        elif candidate.y > (self.pageSize.y - self.ballSize.y):
-            self.ballVelocities[i] = velocity.vx + -abs(velocity.vy)
+            velocity._y = abs(velocity._y)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, TOP_WALL)
+        elif candidate.y > config.wallY:
+            velocity._y = -abs(velocity._y)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, BOTTOM_WALL)
         # side collision
         if candidate.x < 0:
-            self.ballVelocities[i] = abs(velocity.vx) + velocity.vy
-        elif candidate.x > (self.pageSize.x - self.ballSize.x):
-            self.ballVelocities[i] = -abs(velocity.vx) + velocity.vy
+            velocity._x = abs(velocity._x)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, LEFT_WALL)
+        elif candidate.x > config.wallX:
+            velocity._x = -abs(velocity._x)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, RIGHT_WALL)
+
+    def place_paddle_rects(self):
+        "refresh the collision box of every paddle from its position"
+        if len(self.paddleRects) != len(self.paddles):
+            self.paddleRects = [Rect(0, 0, 0, 0) for _ in self.paddles]
+        paddleSize = self.config.paddleSize
+        for rect, paddle in zip(self.paddleRects, self.paddles):
+            rect.place(paddle, paddleSize)
 
     def tick(self, dt: float):
         self.move_paddles(dt)
+        self.place_paddle_rects()
         self.passive_speed_modification()
+        ballRect = self._ballRect
+        ballSize, lostY = self.config.ballSize, self.config.lostY
         # ball behaviour
         for i, ball in enumerate(self.balls):
             # destroy balls at bottom
-            if self.balls[i] is None or self.balls[i].y > self.pageSize.y - self.paddleOffset.y:
+            if self.balls[i] is None:
+                continue
+            if self.balls[i].y > lostY:
                 self.balls[i] = None
+                if self.events is not None:
+                    self.events.add(BALL_LOST, i)
                 continue
-            # ball movement
-            candidate: Vector = ball + self.ballVelocities[i] * dt
+            # ball movement; the ball is moved in place and becomes the collision candidate
+            candidate = ball.iadd(self.ballVelocities[i], dt)
+            ballRect.place(candidate, ballSize)
             for j, paddle in enumerate(self.paddles):
-                if any((
-                    candidate.inside(paddle, paddle + self.paddleSize),
-                    (candidate + self.ballSize.vx).inside(paddle, paddle + self.paddleSize),
-                    (candidate + self.ballSize.vy).inside(paddle, paddle + self.paddleSize),
-                    (candidate + self.ballSize).inside(paddle, paddle + self.paddleSize)
-                )):
+                if ballRect.overlaps(self.paddleRects[j]):
                     self.paddle_collision(candidate, i, j, paddle)
             for j, block in enumerate(self.blocks):
                 if block is None:
                     continue
-                if any((
-                    candidate.inside(block, block + self.blockSize),
-                    (candidate + self.ballSize.vx).inside(block, block + self.blockSize),
-                    (candidate + self.ballSize.vy).inside(block, block + self.blockSize),
-                    (candidate + self.ballSize).inside(block, block + self.blockSize)
-                )):
+                if ballRect.overlaps(self.blockRects[j]):
                     self.block_collision(candidate, i, j, block)
                     self.blocks[j] = None
+                    if self.events is not None:
+                        self.events.add(BLOCK_DESTROYED, i, j)
             self.wall_collision(i, candidate)
-            self.balls[i] = candidate
 
     @cached_property
-    def theta(self) -> float:
-        # for a rectangle where the top two points are p1, p2 and the origin is o
-        # theta is precisely half the angle described p1 <- o -> p2 (p1 o p2) 
-        # this is used to distinguish between which side of the paddle was hit
-        # by a ball
-        #return (360 * (atan(self.paddleSize.x / self.paddleSize.y) / (2 * pi)))
-        return A(radians=(atan(self.paddleSize.x / self.paddleSize.y)))
+    def _scratch(self) -> MutableVector:
+        # reused by the tick helpers instead of allocating temporaries
+        return MV(0, 0)
 
     @cached_property
-    def block_theta(self) -> float:
-        # theta but for blocks instead of paddles
-        #return (360 * (atan(self.blockSize.x / self.blockSize.y) / (2 * pi)))
-        return A(radians=(atan(self.blockSize.x / self.blockSize.y)))
-
-
-
+    def _ballRect(self) -> Rect:
+        # collision box of whichever ball tick is currently moving
+        return Rect(0, 0, 0, 0)
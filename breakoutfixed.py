@@ -0,0 +1,134 @@
+
+from __future__ import annotations
+
+import numpy as np
+
+from breakout import Breakout
+from collision import hit_side, reflect
+from events import BALL_LOST, BLOCK_DESTROYED, BOTTOM_WALL, LEFT_WALL, PADDLE_HIT, RIGHT_WALL, TOP_WALL, WALL_HIT
+from fixedpoint import (FRACTION_BITS, ONE, BreakoutUnits, breakout_units, clamp, ease, from_fixed_speed, to_fixed,
+    to_fixed_speed)
+
+__all__ = ["FixedBreakout"]
+
+class FixedBreakout(Breakout):
+    """
+    Breakout in whole numbers, as pongfixed.FixedPong is Pong.
+
+    Balls, velocities and the paddle stay Vectors in px and px per
+    second, but always on a whole unit, so each tick reads them as ints
+    exactly, works in integer arithmetic and writes them back exactly.
+    The blocks never move, so their boxes are kept as one int32 array
+    and each ball is tested against all of them in one go.
+    tick(ticks) advances a whole number of ticks of 1/TICK_RATE s.
+    """
+
+    # x0, y0, x1, y1 of every block in units, and which are still standing
+    blockBoxes: np.ndarray
+    standing: np.ndarray
+
+    @property
+    def units(self) -> BreakoutUnits:
+        return breakout_units(self.config)
+
+    def create_game_normal(self):
+        super().create_game_normal()
+        self.place_blocks()
+
+    def restore(self, data) -> FixedBreakout:
+        super().restore(data)
+        self.place_blocks()
+        return self
+
+    def place_blocks(self):
+        "build blockBoxes and standing from .blocks"
+        units = self.units
+        boxes = np.zeros((len(self.blocks), 4), dtype=np.int32)
+        for j, block in enumerate(self.blocks):
+            if block is not None:
+                x, y = to_fixed(block._x), to_fixed(block._y)
+                boxes[j] = x, y, x + units.blockW, y + units.blockH
+        self.blockBoxes = boxes
+        self.standing = np.array([block is not None for block in self.blocks], dtype=bool).reshape(-1)
+
+    def move_paddles_fixed(self):
+        "Breakout.move_paddles for one tick, in units"
+        units = self.units
+        lx, ly, hx, hy = units.paddleBounds
+        for i, paddle in enumerate(self.paddles):
+            direction = self.paddleInput[i]
+            x = to_fixed(paddle._x) + round(max(-1., min(1., direction._x)) * units.paddleSpeedX)
+            y = to_fixed(paddle._y) + round(max(-1., min(1., direction._y)) * units.paddleSpeedY)
+            paddle.set(clamp(x, lx, hx) / ONE, clamp(y, ly, hy) / ONE)
+
+    def passive_speed_modification(self):
+        units = self.units
+        for velocity in self.ballVelocities:
+            velocity.set(from_fixed_speed(ease(to_fixed_speed(velocity._x), units.idealX, units.ease)),
+                from_fixed_speed(ease(to_fixed_speed(velocity._y), units.idealY, units.ease)))
+
+    def tick(self, ticks: int = 1):
+        "advance `ticks` whole ticks of 1/TICK_RATE s"
+        if not isinstance(ticks, int):
+            raise TypeError(f"{self.__class__.__qualname__} ticks a whole number of ticks, got {ticks!r}")
+        for _ in range(ticks):
+            self.move_paddles_fixed()
+            self.passive_speed_modification()
+            for i, ball in enumerate(self.balls):
+                if ball is not None:
+                    self.tick_ball(i, ball)
+
+    def tick_ball(self, i: int, ball):
+        units, events = self.units, self.events
+        w, h = units.ballW, units.ballH
+        x, y = to_fixed(ball._x), to_fixed(ball._y)
+        if y > units.lostY:
+            self.balls[i] = None
+            if events is not None:
+                events.add(BALL_LOST, i)
+            return
+        velocity = self.ballVelocities[i]
+        vx, vy = to_fixed_speed(velocity._x), to_fixed_speed(velocity._y)
+        x += vx
+        y += vy
+        for j, paddle in enumerate(self.paddles):
+            x0, y0 = to_fixed(paddle._x), to_fixed(paddle._y)
+            x1, y1 = x0 + units.paddleW, y0 + units.paddleH
+            if x <= x1 and x0 <= x + w and y <= y1 and y0 <= y + h:
+                push = self.paddleInput[j] * self.paddleMaxSpeed * self.paddleElasticity
+                vx, vy = reflect(((vx + to_fixed_speed(push._x)) * units.bumpX) >> FRACTION_BITS,
+                    ((vy + to_fixed_speed(push._y)) * units.bumpY) >> FRACTION_BITS, hit_side(x, y, w, h, x0, y0, x1, y1))
+                self.paddleHits += 1
+                if events is not None:
+                    events.add(PADDLE_HIT, i, j)
+        boxes = self.blockBoxes
+        for j in np.flatnonzero(self.standing & (boxes[:, 0] <= x + w) & (x <= boxes[:, 2])
+                & (boxes[:, 1] <= y + h) & (y <= boxes[:, 3])).tolist():
+            x0, y0, x1, y1 = boxes[j].tolist()
+            vx, vy = reflect((vx * units.bumpX) >> FRACTION_BITS, (vy * units.bumpY) >> FRACTION_BITS,
+                hit_side(x, y, w, h, x0, y0, x1, y1))
+            self.blockHits += 1
+            self.blocks[j] = None
+            self.standing[j] = False
+            if events is not None:
+                events.add(BLOCK_DESTROYED, i, j)
+        # walls, as Breakout.wall_collision
+        hits = []
+        if y < 0:
+            vy = abs(vy)
+            hits.append(TOP_WALL)
+        elif y > units.wallY:
+            vy = -abs(vy)
+            hits.append(BOTTOM_WALL)
+        if x < 0:
+            vx = abs(vx)
+            hits.append(LEFT_WALL)
+        elif x > units.wallX:
+            vx = -abs(vx)
+            hits.append(RIGHT_WALL)
+        self.wallHits += len(hits)
+        if events is not None:
+            for wall in hits:
+                events.add(WALL_HIT, i, wall)
+        ball.set(x / ONE, y / ONE)
+        velocity.set(from_fixed_speed(vx), from_fixed_speed(vy))
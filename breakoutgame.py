@@ -6,9 +6,12 @@ from random import randint
 
 from breakout import Breakout, log
 from element import Element
+from events import BLOCK_DESTROYED, EventBuffer
 from pyg import Screen, load_and_scale
 from pygcontext import PygContext
-from vector import V, Vector
+from replay import Recorder
+from simulation import DEFAULT_STEP, Simulation
+from vector import V, Vector, V_ZERO
 
 
 class Display(Screen):
@@ -57,12 +60,22 @@ class BreakoutGameContext(PygContext):
     blocks: list[Block]
     score: int
     dt: float = 0
+    # seconds per game tick, however fast frames arrive
+    step: float = DEFAULT_STEP
+    simulation: Simulation
+    # when set, every tick is recorded and saved here as a replay on exit
+    replayPath: str = None
+    recorder: Recorder = None
 
     def start(self):
         super().start()
         self.exitCode = 0
         self.last = time.time()
         self.breaker.create_game_normal()
+        if self.replayPath:
+            self.recorder = Recorder(self.breaker)
+        self.breaker.events = EventBuffer()
+        self.simulation = Simulation(self.recorder or self.breaker, self.step)
         self.background = BlackBackground(self.screen)
         self.balls = [Ball(self.screen, pos) for pos in self.breaker.balls]
         self.paddles = [Paddle(self.screen, self.breaker.paddles[i]) for i in range(1)]
@@ -75,7 +88,7 @@ class BreakoutGameContext(PygContext):
     def handle_input(self, dt: float):
         keys = self.screen.keys
         if all((i not in keys) for i in (119, 115, 97, 100)):
-            self.tend_paddle(0, V(0, 0), dt)
+            self.tend_paddle(0, V_ZERO, dt)
         else:
             x, y = 0, 0
             x += 100 in keys
@@ -88,22 +101,29 @@ class BreakoutGameContext(PygContext):
         ctime = time.time()
         dt = ctime - self.last
         self.last = ctime
-        self.breaker.tick(dt)
+        self.simulation.advance(dt)
         return dt
 
-    def handle_elements(self):
+    def __exit__(self, execls, exeins, tb):
+        super().__exit__(execls, exeins, tb)
+        if self.recorder is not None:
+            self.recorder.replay.save(self.replayPath)
+
+    def handle_elements(self, events: EventBuffer):
         for i, ball in enumerate(self.breaker.balls):
             self.balls[i].pos = ball
         for i, paddle in enumerate(self.breaker.paddles):
             self.paddles[i].pos = paddle
-        for i, block in enumerate(self.breaker.blocks):
-            self.blocks[i].pos = block
+        # blocks only ever change by being destroyed
+        for _, j in events.select(BLOCK_DESTROYED):
+            self.blocks[j].pos = None
         self.screen.changed = True
 
     def update(self):
         self.handle_input(self.dt)
         self.dt = self.handle_tick()
-        self.handle_elements()
+        # everything that happened over this frame's ticks
+        self.handle_elements(self.breaker.events.drain())
 
     def key_down(self, k: int):
         if k == 32:
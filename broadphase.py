@@ -0,0 +1,129 @@
+
+from __future__ import annotations
+
+from vector import Rect, Vector
+
+__all__ = ["SpatialHash", "SweepAndPrune"]
+
+class SpatialHash:
+    """
+    Uniform grid broadphase for a handful of static-per-tick boxes
+    (paddles) queried by many small movers (balls).
+
+    rebuild() files the index of every box under each grid cell it
+    covers, after growing the box up and left by `margin` (the mover's
+    size). A mover at top left corner (x, y) can then only overlap the
+    boxes filed under the single cell holding (x, y), so query_point()
+    is one dict lookup and hands back the stored list without copying.
+    Indices come back in ascending order.
+    """
+
+    cellSize: float
+    cells: dict[tuple[int, int], list[int]]
+
+    __slots__ = ["cellSize", "_inverse", "cells"]
+
+    # returned for empty cells; never mutated
+    _EMPTY: tuple[int, ...] = ()
+
+    def __init__(self, cellSize: float):
+        if not cellSize > 0:
+            raise ValueError(f"{self.__class__.__qualname__} cell size must be positive, got {cellSize}")
+        self.cellSize = cellSize
+        self._inverse = 1 / cellSize
+        self.cells = {}
+
+    def __repr__(self) -> str:
+        return f"SpatialHash({self.cellSize}, cells={len(self.cells)})"
+
+    def cell(self, x: float, y: float) -> tuple[int, int]:
+        "grid cell holding point x, y"
+        return (int((x * self._inverse) // 1), int((y * self._inverse) // 1))
+
+    def rebuild(self, rects: list[Rect], margin: Vector):
+        "refile every rect, grown up and left by `margin`"
+        cells = self.cells
+        cells.clear()
+        for index, rect in enumerate(rects):
+            lx, ly = self.cell(rect.x0 - margin._x, rect.y0 - margin._y)
+            hx, hy = self.cell(rect.x1, rect.y1)
+            for cx in range(lx, hx + 1):
+                for cy in range(ly, hy + 1):
+                    key = (cx, cy)
+                    if key in cells:
+                        cells[key].append(index)
+                    else:
+                        cells[key] = [index]
+
+    def query_point(self, x: float, y: float):
+        "indices of the rects a mover with top left corner x, y may overlap"
+        return self.cells.get((int((x * self._inverse) // 1), int((y * self._inverse) // 1)), self._EMPTY)
+
+    def query_rect(self, rect: Rect):
+        "query_point for the top left corner of `rect`"
+        return self.query_point(rect.x0, rect.y0)
+
+class SweepAndPrune:
+    """
+    Sort and sweep broadphase along x for many movers of one size
+    (ball against ball).
+
+    order holds the mover indices sorted by (x, index). It is kept from
+    call to call and re-sorted by insertion sort, which is close to
+    linear when movers have only shifted a little since the last call.
+    Ties break on index, so the order (and so the order pairs come back
+    in) depends only on the positions given, never on earlier calls.
+    """
+
+    order: list[int]
+
+    __slots__ = ["order"]
+
+    def __init__(self):
+        self.order = []
+
+    def __repr__(self) -> str:
+        return f"SweepAndPrune({len(self.order)} movers)"
+
+    def sort(self, xs: list[float]) -> list[int]:
+        "bring order up to date with xs and return it"
+        order = self.order
+        if len(order) != len(xs):
+            # sorted is stable, so equal xs stay in index order
+            order[:] = sorted(range(len(xs)), key=xs.__getitem__)
+            return order
+        for k in range(1, len(order)):
+            i = order[k]
+            x = xs[i]
+            m = k - 1
+            j = order[m]
+            if xs[j] < x or (xs[j] == x and j < i):
+                continue
+            while m >= 0:
+                j = order[m]
+                if xs[j] < x or (xs[j] == x and j < i):
+                    break
+                order[m + 1] = j
+                m -= 1
+            order[m + 1] = i
+        return order
+
+    def pairs(self, xs: list[float], ys: list[float], size: Vector) -> list[tuple[int, int]]:
+        """
+        Every pair i, j of movers of `size` with top left corners at xs, ys
+        whose boxes overlap (touching edges don't count), i before j in order.
+        """
+        order = self.sort(xs)
+        w, h = size._x, size._y
+        count = len(order)
+        found = []
+        for k, i in enumerate(order):
+            limit = xs[i] + w
+            y = ys[i]
+            for m in range(k + 1, count):
+                j = order[m]
+                if xs[j] >= limit:
+                    break
+                if -h < ys[j] - y < h:
+                    found.append((i, j))
+        return found
@@ -0,0 +1,111 @@
+
+from __future__ import annotations
+
+from math import inf
+
+__all__ = ["TOP", "BOTTOM", "LEFT", "RIGHT", "reflect", "hit_side", "sweep", "sweep_bounds"]
+
+# unit normals of a surface, pointing back toward whatever hit it.
+# y grows down the screen, so the top face of a box faces (0, -1)
+TOP = (0, -1)
+BOTTOM = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+
+def reflect(vx: float, vy: float, normal: tuple[int, int]) -> tuple[float, float]:
+    "velocity after bouncing off a surface with `normal`; the other component is kept"
+    nx, ny = normal
+    if nx:
+        vx = nx * abs(vx)
+    if ny:
+        vy = ny * abs(vy)
+    return vx, vy
+
+def hit_side(x: float, y: float, w: float, h: float,
+        x0: float, y0: float, x1: float, y1: float) -> tuple[int, int]:
+    """
+    The face of the static box x0, y0 -> x1, y1 that the box at top left
+    x, y of size w, h, which overlaps it, came in through: the one it is
+    least far past. Four subtractions and three comparisons.
+
+    Ties go to TOP over BOTTOM, LEFT over RIGHT and, as in
+    Pong.ball_collisions, to the top or bottom face over the sides.
+    """
+    # how far the mover reaches past each face
+    left = x + w - x0
+    right = x1 - x
+    top = y + h - y0
+    bottom = y1 - y
+    if left <= right:
+        depthX, faceX = left, LEFT
+    else:
+        depthX, faceX = right, RIGHT
+    if top <= bottom:
+        depthY, faceY = top, TOP
+    else:
+        depthY, faceY = bottom, BOTTOM
+    return faceX if depthX < depthY else faceY
+
+def sweep(x: float, y: float, dx: float, dy: float, w: float, h: float,
+        x0: float, y0: float, x1: float, y1: float) -> tuple[float, tuple[int, int]] | None:
+    """
+    Swept AABB: the box at top left x, y of size w, h moving by dx, dy
+    against the static box x0, y0 -> x1, y1.
+
+    Returns (t, normal) for the first touch, with t in [0, 1] a fraction
+    of the move and normal the face of the static box that was hit, or
+    None if the boxes don't touch during the move or already overlap
+    at its start. Edges touching counts, as for Rect.overlaps.
+    """
+    # grow the static box up and left by the mover's size and sweep the mover's corner through it
+    lx, hx = x0 - w, x1
+    ly, hy = y0 - h, y1
+    if dx > 0:
+        enterX, exitX = (lx - x) / dx, (hx - x) / dx
+    elif dx < 0:
+        enterX, exitX = (hx - x) / dx, (lx - x) / dx
+    elif lx <= x <= hx:
+        enterX, exitX = -inf, inf
+    else:
+        return None
+    if dy > 0:
+        enterY, exitY = (ly - y) / dy, (hy - y) / dy
+    elif dy < 0:
+        enterY, exitY = (hy - y) / dy, (ly - y) / dy
+    elif ly <= y <= hy:
+        enterY, exitY = -inf, inf
+    else:
+        return None
+    enter = max(enterX, enterY)
+    if enter < 0 or enter > 1 or enter > min(exitX, exitY):
+        return None
+    if enterX > enterY:
+        return enter, (LEFT if dx > 0 else RIGHT)
+    return enter, (TOP if dy > 0 else BOTTOM)
+
+def sweep_bounds(x: float, y: float, dx: float, dy: float,
+        lx: float, ly: float, hx: float, hy: float) -> tuple[float, tuple[int, int]] | None:
+    """
+    The point x, y moving by dx, dy inside the bounds lx, ly -> hx, hy
+    (for a box, the range its top left corner may take).
+
+    Returns (t, normal) for the first wall crossed, normal pointing back
+    into the bounds, or None if the move stays inside. A point already
+    outside a wall is left to the caller.
+    """
+    first, normal = inf, None
+    if dx < 0 and x >= lx and x + dx < lx:
+        first, normal = (lx - x) / dx, RIGHT
+    elif dx > 0 and x <= hx and x + dx > hx:
+        first, normal = (hx - x) / dx, LEFT
+    if dy < 0 and y >= ly and y + dy < ly:
+        t = (ly - y) / dy
+        if t < first:
+            first, normal = t, BOTTOM
+    elif dy > 0 and y <= hy and y + dy > hy:
+        t = (hy - y) / dy
+        if t < first:
+            first, normal = t, TOP
+    if normal is None:
+        return None
+    return first, normal
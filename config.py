@@ -0,0 +1,187 @@
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from dataclasses import dataclass, field
+from vector import V, Vector
+
+__all__ = ["PongConfig", "BreakoutConfig", "Setting"]
+
+_PAGE = V(1500, 1000)
+_BALL = V(6, 6)
+
+def derived():
+    "a field worked out by __post_init__ from the settings, not passed in"
+    return field(init=False, repr=False, compare=False)
+
+class _Config:
+    "what PongConfig and BreakoutConfig share: loading, and replace() that converts pairs to Vectors"
+
+    @classmethod
+    def load(cls, path: str):
+        "the default config with the settings in the JSON object at `path` changed; pairs are [x, y] lists"
+        with open(path) as file:
+            values = json.load(file)
+        if not isinstance(values, dict):
+            raise ValueError(f"{path} should hold a JSON object of settings, not {type(values).__qualname__}")
+        return cls().replace(**values)
+
+    def replace(self, **changes):
+        "a copy with `changes` made and everything derived worked out again"
+        settings = {f.name: f for f in dataclasses.fields(self) if f.init}
+        for name, value in changes.items():
+            if name not in settings:
+                raise ValueError(f"{self.__class__.__qualname__} has no setting {name!r}")
+            if isinstance(getattr(self, name), Vector) and not isinstance(value, Vector):
+                changes[name] = V(*value)
+        return dataclasses.replace(self, **changes)
+
+    def changes(self) -> dict[str, object]:
+        "the settings that differ from the defaults, as load() reads them: pairs are [x, y] lists"
+        default = type(self)()
+        changes = {}
+        for f in dataclasses.fields(self):
+            value = getattr(self, f.name)
+            if f.init and value != getattr(default, f.name):
+                changes[f.name] = [value._x, value._y] if isinstance(value, Vector) else value
+        return changes
+
+    def _derive(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+@dataclass(frozen=True)
+class PongConfig(_Config):
+    """
+    Every tuning constant of a Pong match, immutable, plus the bounds
+    and thresholds tick needs worked out once from them as plain floats
+    (and Vector pairs for the bound() calls). Games share a config
+    freely; change one with replace() or a Setting.
+    """
+
+    pageSize: Vector = _PAGE
+    scoreZoneOffset: Vector = V(10, 0)
+
+    paddleSize: Vector = V(16, 70)
+    paddleOffset: Vector = V(80, 0)
+    paddleMaxSpeed: Vector = V(400, 700)
+    paddleFriction: Vector = V(1, 1)
+    paddlePlayableSize: Vector = _PAGE.vy + (_PAGE.vx / 3)
+
+    ballSize: Vector = _BALL
+    ballIdealSpeed: Vector = V(200, 150)
+    ballReturnToIdealFactor: float = 0.0006
+    ballStartSpeed: Vector = V(150, 80)
+    ballSpeedLow: Vector = V(1, 1)
+    ballSpeedHigh: Vector = V(2, 2)
+    ballSpeedRNGScale: float = 0.5
+    ballStartLocation: Vector = (_PAGE + _BALL) / 2
+    ballBaseSpeed: Vector = V(140, 80)
+    ballBumpMultiplier: Vector = V(1.5, 1)
+
+    # swept collision: balls bounce at the moment they touch a paddle or wall
+    # instead of being tested only where a whole tick's move leaves them, so
+    # a large dt can't carry a fast ball through a paddle. Python engine only
+    continuousCollision: bool = False
+    # contacts resolved per ball per tick before the rest of its move is dropped
+    maxBounces: int = 4
+    # balls bounce off each other too, see Pong.ball_collisions
+    ballCollision: bool = False
+
+    # a ball whose rounded x is below scoreLow or above scoreHigh scores
+    scoreLow: float = derived()
+    scoreHigh: float = derived()
+    # furthest a ball's rounded top left corner may go before bouncing off a wall
+    wallX: float = derived()
+    wallY: float = derived()
+    ballW: float = derived()
+    ballH: float = derived()
+    # the exact range of a ball's top left corner, for swept collision
+    ballRangeX: float = derived()
+    ballRangeY: float = derived()
+    # lo, hi corners that a paddle starting in the left or right third is kept inside
+    paddleBoundsLeft: tuple[Vector, Vector] = derived()
+    paddleBoundsRight: tuple[Vector, Vector] = derived()
+    # cell of Pong.paddleHash: a paddle grown by a ball fits a 2x2 block of them
+    paddleCellSize: float = derived()
+
+    def __post_init__(self):
+        page, ball, paddle = self.pageSize, self.ballSize, self.paddleSize
+        self._derive(
+            scoreLow=self.scoreZoneOffset.x,
+            scoreHigh=page.x - self.scoreZoneOffset.x - ball.x,
+            wallX=page.x - ball.x,
+            wallY=page.y - ball.y,
+            ballW=ball._x,
+            ballH=ball._y,
+            ballRangeX=page._x - ball._x,
+            ballRangeY=page._y - ball._y,
+            paddleBoundsLeft=(self.scoreZoneOffset, page.vx / 3 + page.vy - paddle),
+            paddleBoundsRight=((page.vx / 3) * 2, page - self.scoreZoneOffset - paddle),
+            paddleCellSize=max(paddle.x + ball.x, paddle.y + ball.y))
+
+@dataclass(frozen=True)
+class BreakoutConfig(_Config):
+    "PongConfig for Breakout"
+
+    pageSize: Vector = _PAGE
+
+    paddleSize: Vector = V(140, 24)
+    paddleOffset: Vector = V(0, 20)
+    paddleMaxSpeed: Vector = V(900, 600)
+    paddleElasticity: Vector = V(1, 1)
+    paddlePlayableSize: Vector = (_PAGE.vy / 2)
+
+    ballSize: Vector = _BALL
+    ballSpeedLow: Vector = V(1, 1)
+    ballSpeedHigh: Vector = V(2, 2)
+    ballSpeedRNGScale: float = 0.5
+    ballIdealSpeed: Vector = V(100, 200)
+    ballReturnToIdealFactor: float = 0.001
+    ballStartSpeed: Vector = V(0, 100)
+    ballStartLocation: Vector = (_PAGE.vy / 4) + (_PAGE.vx / 2)
+    ballBaseSpeed: Vector = V(100, 100)
+    ballBumpMultiplier: Vector = V(1, 1)
+
+    blockSize: Vector = V(42, 32)
+
+    # a ball whose rounded y is below this is lost
+    lostY: float = derived()
+    wallX: float = derived()
+    wallY: float = derived()
+    ballW: float = derived()
+    ballH: float = derived()
+    # lo, hi corners that the paddle is kept inside
+    paddleBounds: tuple[Vector, Vector] = derived()
+
+    def __post_init__(self):
+        page, ball, paddle = self.pageSize, self.ballSize, self.paddleSize
+        self._derive(
+            lostY=page.y - self.paddleOffset.y,
+            wallX=page.x - ball.x,
+            wallY=page.y - ball.y,
+            ballW=ball._x,
+            ballH=ball._y,
+            paddleBounds=(page.vy - self.paddlePlayableSize, page - self.paddleOffset - paddle))
+
+class Setting:
+    """
+    A game class attribute that reads through to the game's .config, so
+    game.ballSize and Pong.ballSize keep working. Setting one on a game
+    gives that game a new config with the change made (derived values
+    included); other games sharing the old config keep it.
+    """
+
+    name: str
+
+    __slots__ = ["name"]
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, game, owner: type = None):
+        return getattr((owner if game is None else game).config, self.name)
+
+    def __set__(self, game, value):
+        game.config = game.config.replace(**{self.name: value})
@@ -0,0 +1,88 @@
+
+from __future__ import annotations
+
+from array import array
+
+__all__ = ["EventBuffer", "SCORED", "PADDLE_HIT", "WALL_HIT", "BALL_HIT", "BLOCK_DESTROYED", "BALL_LOST",
+    "TOP_WALL", "BOTTOM_WALL", "LEFT_WALL", "RIGHT_WALL"]
+
+# event kinds, each an (index of the ball, other) pair:
+SCORED = 1           # other: which score went up, 0 for score.x and 1 for score.y
+PADDLE_HIT = 2       # other: the paddle's index
+WALL_HIT = 3         # other: one of the walls below
+BALL_HIT = 4         # other: the other ball's index
+BLOCK_DESTROYED = 5  # other: the block's index
+BALL_LOST = 6        # other: 0
+
+# the walls a WALL_HIT can name
+TOP_WALL, BOTTOM_WALL, LEFT_WALL, RIGHT_WALL = range(4)
+
+class EventBuffer:
+    """
+    What happened while a game ticked, for consumers that would
+    otherwise diff its state every frame.
+
+    A game with an EventBuffer as .events appends one row per event as
+    it ticks: Pong and Breakout in the order things happen, the numpy
+    engines a stage at a time. The rows live in three parallel arrays
+    (kinds, balls, others), so appending allocates nothing per event
+    and a numpy engine can add a whole stage's worth with extend().
+    drain() hands back everything since the last drain as a buffer of
+    its own and starts an empty one, so one frame's worth can be passed
+    on to the renderer, the network and stats alike.
+    """
+
+    kinds: array
+    balls: array
+    others: array
+
+    __slots__ = ["kinds", "balls", "others"]
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.balls = array("q")
+        self.others = array("q")
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __iter__(self):
+        "(kind, ball, other) rows in the order they were added"
+        return zip(self.kinds, self.balls, self.others)
+
+    def __repr__(self) -> str:
+        return f"EventBuffer({len(self)} events)"
+
+    def add(self, kind: int, ball: int, other: int = 0):
+        self.kinds.append(kind)
+        self.balls.append(ball)
+        self.others.append(other)
+
+    def extend(self, kind: int, balls, others):
+        "one `kind` row per ball; `others` may be a single int for all of them. Takes lists or numpy int arrays"
+        count = len(balls)
+        if not count:
+            return
+        if isinstance(others, int):
+            others = [others] * count
+        self.kinds.extend(array("B", [kind]) * count)
+        for values, column in ((balls, self.balls), (others, self.others)):
+            if hasattr(values, "astype"):
+                column.frombytes(values.astype(column.typecode, copy=False).tobytes())
+            else:
+                column.extend(values)
+
+    def drain(self) -> EventBuffer:
+        "every event since the last drain, leaving this buffer empty"
+        drained = EventBuffer()
+        self.kinds, drained.kinds = drained.kinds, self.kinds
+        self.balls, drained.balls = drained.balls, self.balls
+        self.others, drained.others = drained.others, self.others
+        return drained
+
+    def count(self, kind: int) -> int:
+        return self.kinds.count(kind)
+
+    def select(self, kind: int) -> list[tuple[int, int]]:
+        "(ball, other) of each `kind` event, in order"
+        return [(ball, other) for k, ball, other in zip(self.kinds, self.balls, self.others) if k == kind]
@@ -0,0 +1,119 @@
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from config import BreakoutConfig, PongConfig
+from simulation import DEFAULT_STEP
+from vector import Vector
+
+__all__ = ["FRACTION_BITS", "ONE", "TICK_RATE", "to_fixed", "to_fixed_speed", "from_fixed", "from_fixed_speed",
+    "ease", "clamp", "PongUnits", "BreakoutUnits", "pong_units", "breakout_units"]
+
+# the fixed point engines keep positions in 1/ONE px and velocities in 1/ONE
+# px per tick. 16 bits of fraction keep Pong's gentle easing toward the ideal
+# speed from rounding away, and a 1500 px page is still under 2**27 units
+FRACTION_BITS = 16
+ONE = 1 << FRACTION_BITS
+# they advance in whole ticks of 1/TICK_RATE seconds
+TICK_RATE = round(1 / DEFAULT_STEP)
+
+def to_fixed(value: float) -> int:
+    "a length in px, or a fraction, as a whole number of 1/ONE units"
+    return round(value * ONE)
+
+def to_fixed_speed(value: float) -> int:
+    "a speed in px per second as a whole number of 1/ONE px per tick"
+    return round(value * ONE / TICK_RATE)
+
+def from_fixed(value):
+    "px from units; exact, as ONE is a power of two"
+    return value / ONE
+
+def from_fixed_speed(value):
+    "px per second from units per tick; exact while TICK_RATE is a small number times a power of two"
+    return value * TICK_RATE / ONE
+
+def ease(velocity: int, ideal: int, factor: int) -> int:
+    "Pong.passive_speed_modification for one component in units: the speed moves factor / ONE of the way to ideal"
+    speed = abs(velocity)
+    speed += ((ideal - speed) * factor) >> FRACTION_BITS
+    return speed if velocity >= 0 else -speed
+
+def clamp(value: int, low: int, high: int) -> int:
+    return low if value < low else high if value > high else value
+
+def _fixed_pair(vector: Vector) -> tuple[int, int]:
+    return to_fixed(vector._x), to_fixed(vector._y)
+
+def _fixed_bounds(bounds: tuple[Vector, Vector]) -> tuple[int, int, int, int]:
+    "lo, hi corners as lx, ly, hx, hy units"
+    return (*_fixed_pair(bounds[0]), *_fixed_pair(bounds[1]))
+
+@dataclass(frozen=True)
+class PongUnits:
+    "a PongConfig's constants in whole units, see pong_units"
+    ballW: int
+    ballH: int
+    paddleW: int
+    paddleH: int
+    wallX: int
+    wallY: int
+    scoreLow: int
+    scoreHigh: int
+    startX: int
+    startY: int
+    idealX: int
+    idealY: int
+    ease: int
+    bumpX: int
+    bumpY: int
+    paddleSpeedX: int
+    paddleSpeedY: int
+    paddleBoundsLeft: tuple[int, int, int, int]
+    paddleBoundsRight: tuple[int, int, int, int]
+
+@lru_cache(maxsize=16)
+def pong_units(config: PongConfig) -> PongUnits:
+    "`config` in units, worked out once per config"
+    return PongUnits(
+        *_fixed_pair(config.ballSize), *_fixed_pair(config.paddleSize),
+        to_fixed(config.wallX), to_fixed(config.wallY), to_fixed(config.scoreLow), to_fixed(config.scoreHigh),
+        *_fixed_pair(config.ballStartLocation),
+        to_fixed_speed(config.ballIdealSpeed._x), to_fixed_speed(config.ballIdealSpeed._y),
+        to_fixed(config.ballReturnToIdealFactor), *_fixed_pair(config.ballBumpMultiplier),
+        to_fixed_speed(config.paddleMaxSpeed._x), to_fixed_speed(config.paddleMaxSpeed._y),
+        _fixed_bounds(config.paddleBoundsLeft), _fixed_bounds(config.paddleBoundsRight))
+
+@dataclass(frozen=True)
+class BreakoutUnits:
+    "a BreakoutConfig's constants in whole units, see breakout_units"
+    ballW: int
+    ballH: int
+    paddleW: int
+    paddleH: int
+    blockW: int
+    blockH: int
+    wallX: int
+    wallY: int
+    lostY: int
+    idealX: int
+    idealY: int
+    ease: int
+    bumpX: int
+    bumpY: int
+    paddleSpeedX: int
+    paddleSpeedY: int
+    paddleBounds: tuple[int, int, int, int]
+
+@lru_cache(maxsize=16)
+def breakout_units(config: BreakoutConfig) -> BreakoutUnits:
+    "`config` in units, worked out once per config"
+    return BreakoutUnits(
+        *_fixed_pair(config.ballSize), *_fixed_pair(config.paddleSize), *_fixed_pair(config.blockSize),
+        to_fixed(config.wallX), to_fixed(config.wallY), to_fixed(config.lostY),
+        to_fixed_speed(config.ballIdealSpeed._x), to_fixed_speed(config.ballIdealSpeed._y),
+        to_fixed(config.ballReturnToIdealFactor), *_fixed_pair(config.ballBumpMultiplier),
+        to_fixed_speed(config.paddleMaxSpeed._x), to_fixed_speed(config.paddleMaxSpeed._y),
+        _fixed_bounds(config.paddleBounds))
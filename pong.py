@@ -4,13 +4,30 @@ from __future__ import annotations
 import os
 import sys
 import time
+from array import array
 from contextlib import suppress
 from functools import cached_property
-from math import atan, pi, tau
+from itertools import chain
+from math import inf
+from random import Random
 
 from pyserve import *
-from pyserve import call, create_log_target, initialise_log_manager
-from unsafe_vector import V, Vector, Angle, A
+from broadphase import SpatialHash, SweepAndPrune
+from collision import BOTTOM, LEFT, RIGHT, TOP, hit_side, reflect, sweep, sweep_bounds
+from config import PongConfig, Setting
+from events import (BALL_HIT, BOTTOM_WALL, LEFT_WALL, PADDLE_HIT, RIGHT_WALL, SCORED, TOP_WALL, WALL_HIT,
+    EventBuffer)
+from simulation import DEFAULT_STEP
+from snapshot import PONG, pack, restore_vectors, snapshot_vectors, unpack
+from terminal import Raster
+from pyserve import Network, call, create_log_target, initialise_log_manager
+from vector import MV, VA, MutableVector, PackedVectors, Rect, V, Vector, VectorArray
+from vector import V_NEG_ONE, V_ONE, V_UNIT_X, V_UNIT_Y, V_ZERO
+
+# numpy draws start speeds in batches when it is there, see random_ball_start_speeds
+np = None
+with suppress(ImportError):
+    import numpy as np
 
 # work out where the program is running to find texture files.
 ROUTE = "\\".join(sys.argv[0].split("\\")[:-1:]) + "\\"
@@ -40,161 +57,347 @@ PADDLE_POSITIONS = "PADDLES"
 BALL_VELOCITIES = "BALLSV"
 PADDLE_INPUTS = "PADDLESV"
 
+# msgpack ExtType codes; vector sequences go over the wire as packed float buffers
+PACKED_VECTORS_EXT = 1
+VECTOR_ARRAY_EXT = 2
+Network.register_ext(PACKED_VECTORS_EXT, PackedVectors, PackedVectors.tobytes, PackedVectors.frombytes)
+Network.register_ext(VECTOR_ARRAY_EXT, VectorArray, VectorArray.tobytes, VA.frombytes)
+
+# the wall a swept ball bounced off, from the normal collision.sweep_bounds reports
+WALL_OF_NORMAL = {BOTTOM: TOP_WALL, TOP: BOTTOM_WALL, RIGHT: LEFT_WALL, LEFT: RIGHT_WALL}
+
 class Pong:
 
+    # tuning constants and the bounds derived from them; every Setting
+    # below reads through to it
+    config: PongConfig = PongConfig()
+
     score: Vector = V(0, 0)
-    scoreZoneOffset: Vector = V(10, 0)
+    scoreZoneOffset: Vector = Setting()
     
     paddles: list[Vector]
+    paddleRects: list[Rect] = []
     balls: list[Vector]
 
     ballVelocities: list[Vector]
 
     paddleInput: list[Vector] = []
 
-    pageSize: Vector = V(1500, 1000)
+    pageSize: Vector = Setting()
 
-    paddleSize: Vector = V(16, 70)
-    paddleOffset: Vector = V(80, 0)
-    paddleMaxSpeed: Vector = V(400, 700)
-    paddleFriction: Vector = V(1, 1)
-    paddlePlayableSize: Vector = pageSize.vy + (pageSize.vx / 3)
+    paddleSize: Vector = Setting()
+    paddleOffset: Vector = Setting()
+    paddleMaxSpeed: Vector = Setting()
+    paddleFriction: Vector = Setting()
+    paddlePlayableSize: Vector = Setting()
     
-    ballSize: Vector = V(6, 6)
-    ballIdealSpeed: Vector = V(200, 150)
-    ballReturnToIdealFactor: float = 0.0006
-    ballStartSpeed: Vector = V(150, 80)
-    ballSpeedLow: Vector = V(1, 1)
-    ballSpeedHigh: Vector = V(2, 2)
-    ballSpeedRNGScale: float = 0.5
-    ballStartLocation: Vector = (pageSize + ballSize) / 2
-    ballBaseSpeed: Vector = V(140, 80)
-    ballBumpMultiplier: Vector = V(1.5, 1)
+    ballSize: Vector = Setting()
+    ballIdealSpeed: Vector = Setting()
+    ballReturnToIdealFactor: float = Setting()
+    ballStartSpeed: Vector = Setting()
+    ballSpeedLow: Vector = Setting()
+    ballSpeedHigh: Vector = Setting()
+    ballSpeedRNGScale: float = Setting()
+    ballStartLocation: Vector = Setting()
+    ballBaseSpeed: Vector = Setting()
+    ballBumpMultiplier: Vector = Setting()
+
+    continuousCollision: bool = Setting()
+    maxBounces: int = Setting()
+    ballCollision: bool = Setting()
+    paddleBoundsLeft: tuple[Vector, Vector] = Setting()
+    paddleBoundsRight: tuple[Vector, Vector] = Setting()
+
+    # contacts since the game was created, for stats and the match runner
+    paddleHits: int = 0
+    wallHits: int = 0
+    ballHits: int = 0
+    # when set, tick appends what happens to it (see events.py)
+    events: EventBuffer = None
+
+    seed: int
+    rng: Random
+
+    def __init__(self, seed: int = None, config: PongConfig = None):
+        # every random draw the game makes comes from rng, so a seed replays a match
+        self.seed = seed
+        self.rng = Random(seed)
+        if config is not None:
+            self.config = config
 
     def random_ball_start_speed(self) -> Vector:
-        return self.ballStartSpeed * Vector.from_random_sign() * Vector.from_random_square(self.ballSpeedLow, self.ballSpeedHigh) * self.ballSpeedRNGScale
+        return self.ballStartSpeed * Vector.from_random_sign(self.rng) * Vector.from_random_square(self.ballSpeedLow, self.ballSpeedHigh, self.rng) * self.ballSpeedRNGScale
+
+    def random_ball_start_speeds(self, count: int) -> VectorArray | list[MutableVector]:
+        """
+        random_ball_start_speed `count` times over, as one VectorArray
+        drawn by numpy, or a list of MutableVectors without numpy
+        """
+        # start * square * scale is uniform over the scaled box, so draw from that directly
+        scale = self.ballStartSpeed * self.ballSpeedRNGScale
+        lo, hi = self.ballSpeedLow * scale, self.ballSpeedHigh * scale
+        if np is None:
+            speeds = MV.from_random_squares(lo, hi, count, self.rng)
+            for speed, sign in zip(speeds, Vector.from_random_signs(count, self.rng)):
+                speed.imul(sign)
+            return speeds
+        # a generator seeded off rng: every engine draws the same speeds, and
+        # rng's state, which snapshots keep, still covers the draw
+        batch = np.random.default_rng(self.rng.getrandbits(64))
+        return VA.random_squares(lo, hi, count, batch) * VA.random_signs(count, batch)
 
     def move_paddles(self, dt: float):
+        step = self._scratch
+        config = self.config
+        left, right = config.paddleBoundsLeft, config.paddleBoundsRight
         for i, paddle in enumerate(self.paddles):
-            paddleInput = self.paddleInput[i].bind(V(-1, -1), V(1, 1))
-            if paddle.inside(self.scoreZoneOffset, self.pageSize.vx / 3 + self.pageSize.vy - self.paddleSize):
-                self.paddles[i] = (paddle + (self.paddleMaxSpeed * paddleInput * dt)).bind(self.scoreZoneOffset, self.pageSize.vx / 3 + self.pageSize.vy - self.paddleSize)
+            step.assign(self.paddleInput[i]).ibind(V_NEG_ONE, V_ONE).imul(config.paddleMaxSpeed).imul(dt)
+            if paddle.inside(*left):
+                paddle.iadd(step).ibind(*left)
+            else:
+                paddle.iadd(step).ibind(*right)
+
+    def score_updates(self, i: int, ball: MutableVector) -> MutableVector:
+        config = self.config
+        x = ball.x
+        if x < config.scoreLow or x > config.scoreHigh:
+            if x < config.scoreLow:
+                self.score = self.score + V_UNIT_X
+                if self.events is not None:
+                    self.events.add(SCORED, i, 0)
             else:
-                self.paddles[i] = (paddle + (self.paddleMaxSpeed * paddleInput * dt)).bind((self.pageSize.vx / 3) * 2, self.pageSize - self.scoreZoneOffset - self.paddleSize)
-
-    def score_updates(self, i: int, ball: Vector) -> Vector:
-        if (ball.x < self.scoreZoneOffset.x) or (ball.x > self.pageSize.x - self.scoreZoneOffset.x - self.ballSize.x):
-            if ball.x < self.scoreZoneOffset.x:
-                self.score = self.score + V(1, 0)
-            elif ball.x > (self.pageSize.x - self.scoreZoneOffset.x - self.ballSize.x):
-                self.score = self.score + V(0, 1)
-            self.balls[i] = self.ballStartLocation
-            self.ballVelocities[i] = self.random_ball_start_speed()
-            return self.balls[i]
+                self.score = self.score + V_UNIT_Y
+                if self.events is not None:
+                    self.events.add(SCORED, i, 1)
+            ball.assign(config.ballStartLocation)
+            self.ballVelocities[i].assign(self.random_ball_start_speed())
         return ball
 
     def passive_speed_modification(self):
-        for i, currentVelocity in enumerate(self.ballVelocities):
-            signs = currentVelocity.signs()
-            self.ballVelocities[i] = signs * abs(currentVelocity).approach(self.ballIdealSpeed, self.ballReturnToIdealFactor)
+        signs = self._scratch
+        ideal, factor = self.config.ballIdealSpeed, self.config.ballReturnToIdealFactor
+        for currentVelocity in self.ballVelocities:
+            signs.assign(currentVelocity).isigns()
+            currentVelocity.iabs().iapproach(ideal, factor).imul(signs)
 
     def paddle_collision(self, candidate: Vector, i: int, j: int, paddle: Vector):
-        paddleCentre = paddle + (self.paddleSize / 2)
-        candidateCentre = candidate + (self.ballSize / 2)
-        #angle = A(vector=(paddleCentre - candidateCentre)).radians
-        #full = A(degrees=360).radians
-        #half = A(degrees=180).radians
-        #theta = self.theta.radians
-        angle = Angle.fromvector(paddleCentre - candidateCentre).radians
-        full = tau
-        half = pi
-        theta = self.theta.radians
+        # the side the ball is least far into, see collision.hit_side
+        rect = self.paddleRects[j]
+        self.paddle_bounce(i, j, hit_side(candidate._x, candidate._y, self.config.ballW, self.config.ballH,
+            rect.x0, rect.y0, rect.x1, rect.y1))
+
+    def paddle_bounce(self, i: int, j: int, side: tuple[int, int]):
+        "ball i bounces off `side` of paddle j (see collision.TOP etc.)"
         #              <initial velocity>                          <paddle velocity>                           <scale up from collision>
         velocity = ((self.ballVelocities[i] + (self.paddleInput[j] * self.paddleMaxSpeed * self.paddleFriction)) * self.ballBumpMultiplier)
-        if angle <= theta and angle >= (full - theta):
-            # top of paddle
-            self.ballVelocities[i] = velocity.vx + -abs(velocity.vy)
-        elif angle >= theta and angle <= (half - theta):
-            # left side
-            self.ballVelocities[i] = -abs(velocity.vx) + velocity.vy
-        elif angle >= (half - theta) and angle <= (half + theta):
-            # bottom
-            self.ballVelocities[i] = velocity.vx + abs(velocity.vy)
-        else:
-            # right side
-            self.ballVelocities[i] = abs(velocity.vx) + velocity.vy
+        self.ballVelocities[i].set(*reflect(velocity._x, velocity._y, side))
+        self.paddleHits += 1
+        if self.events is not None:
+            self.events.add(PADDLE_HIT, i, j)
 
     def wall_collision(self, i: int, candidate: Vector):
         velocity = self.ballVelocities[i]
+        events = self.events
+        config = self.config
         # top collision
         if candidate.y < 0:
-            self.ballVelocities[i] = velocity.vx + abs(velocity.vy)
-        elif candidate.y > (self.pageSize.y - self.ballSize.y):
-            self.ballVelocities[i] = velocity.vx + -abs(velocity.vy)
+            velocity._y = abs(velocity._y)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, TOP_WALL)
+        elif candidate.y > config.wallY:
+            velocity._y = -abs(velocity._y)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, BOTTOM_WALL)
         # side collision
         if candidate.x < 0:
-            self.ballVelocities[i] = abs(velocity.vx) + velocity.vy
-        elif candidate.x > (self.pageSize.x - self.ballSize.x):
-            self.ballVelocities[i] = -abs(velocity.vx) + velocity.vy
+            velocity._x = abs(velocity._x)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, LEFT_WALL)
+        elif candidate.x > config.wallX:
+            velocity._x = -abs(velocity._x)
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, RIGHT_WALL)
+
+    def ball_collisions(self):
+        "bounce every pair of overlapping balls off each other along the axis they overlap least on"
+        balls, velocities = self.balls, self.ballVelocities
+        xs = [ball._x for ball in balls]
+        ys = [ball._y for ball in balls]
+        w, h = self.config.ballW, self.config.ballH
+        hits = 0
+        for i, j in self.ballSweep.pairs(xs, ys, self.config.ballSize):
+            a, b = velocities[i], velocities[j]
+            dx, dy = xs[j] - xs[i], ys[j] - ys[i]
+            # equal masses bouncing elastically swap velocities along the
+            # contact axis; balls already moving apart are left alone
+            if w - abs(dx) < h - abs(dy):
+                if (a._x - b._x) * dx > 0:
+                    a._x, b._x = b._x, a._x
+                else:
+                    continue
+            elif (a._y - b._y) * dy > 0:
+                a._y, b._y = b._y, a._y
+            else:
+                continue
+            hits += 1
+            if self.events is not None:
+                self.events.add(BALL_HIT, i, j)
+        self.ballHits += hits
+
+    def place_paddle_rects(self):
+        "refresh the collision box of every paddle from its position and refile them in paddleHash"
+        if len(self.paddleRects) != len(self.paddles):
+            self.paddleRects = [Rect(0, 0, 0, 0) for _ in self.paddles]
+        config = self.config
+        for rect, paddle in zip(self.paddleRects, self.paddles):
+            rect.place(paddle, config.paddleSize)
+        self.paddleHash.rebuild(self.paddleRects, config.ballSize)
+
+    def sweep_ball(self, i: int, ball: MutableVector, dt: float) -> bool:
+        "move ball i through dt, bouncing off paddles and walls at each contact; True if it hit a paddle"
+        velocity = self.ballVelocities[i]
+        config = self.config
+        w, h = config.ballW, config.ballH
+        hx, hy = config.ballRangeX, config.ballRangeY
+        hitPaddle = False
+        for _ in range(config.maxBounces):
+            dx, dy = velocity._x * dt, velocity._y * dt
+            first, side, paddle = inf, None, None
+            wall = sweep_bounds(ball._x, ball._y, dx, dy, 0, 0, hx, hy)
+            if wall is not None:
+                first, side = wall
+            for j, rect in enumerate(self.paddleRects):
+                hit = sweep(ball._x, ball._y, dx, dy, w, h, rect.x0, rect.y0, rect.x1, rect.y1)
+                if hit is not None and hit[0] < first:
+                    (first, side), paddle = hit, j
+            if side is None:
+                ball.iadd(velocity, dt)
+                break
+            # move to the contact, bounce, and carry on with what's left of dt
+            ball.iadd(velocity, dt * first)
+            dt -= dt * first
+            if paddle is None:
+                velocity.set(*reflect(velocity._x, velocity._y, side))
+                self.wallHits += 1
+                if self.events is not None:
+                    self.events.add(WALL_HIT, i, WALL_OF_NORMAL[side])
+            else:
+                self.paddle_bounce(i, paddle, side)
+                hitPaddle = True
+        return hitPaddle
+
+    def sweep_balls(self, dt: float):
+        "the ball loop of tick with continuousCollision"
+        ballRect = self._ballRect
+        ballSize = self.config.ballSize
+        for i, ball in enumerate(self.balls):
+            ball = self.score_updates(i, ball)
+            if not self.sweep_ball(i, ball, dt):
+                # a paddle moving onto a ball is caught at the end position as before
+                ballRect.place(ball, ballSize)
+                for j, rect in enumerate(self.paddleRects):
+                    if ballRect.overlaps(rect):
+                        self.paddle_collision(ball, i, j, self.paddles[j])
+            self.wall_collision(i, ball)
 
     def tick(self, dt: float, checkCollision: bool = True):
+        config = self.config
         # move paddles
         self.move_paddles(dt)
+        self.place_paddle_rects()
         self.passive_speed_modification()
+        if config.continuousCollision:
+            self.sweep_balls(dt)
+            if config.ballCollision:
+                self.ball_collisions()
+            return
+        ballRect = self._ballRect
+        ballSize = config.ballSize
+        paddleHash = self.paddleHash
         # ball movement
         for i, ball in enumerate(self.balls):
             # handle score
             ball = self.score_updates(i, ball)
-            candidate = ball + self.ballVelocities[i] * dt
-            # collision with paddle
-            for j, paddle in enumerate(self.paddles):
-                if any((
-                    candidate.inside(paddle, paddle + self.paddleSize),
-                    (candidate + self.ballSize.vx).inside(paddle, paddle + self.paddleSize),
-                    (candidate + self.ballSize.vy).inside(paddle, paddle + self.paddleSize),
-                    (candidate + self.ballSize).inside(paddle, paddle + self.paddleSize)
-                )):
+            # the ball is moved in place and becomes the collision candidate
+            candidate = ball.iadd(self.ballVelocities[i], dt)
+            ballRect.place(candidate, ballSize)
+            # collision with paddle, only for the paddles sharing the ball's grid cell
+            for j in paddleHash.query_point(candidate._x, candidate._y):
+                if ballRect.overlaps(self.paddleRects[j]):
                     # ball hits paddle
-                    self.paddle_collision(candidate, i, j, paddle)
+                    self.paddle_collision(candidate, i, j, self.paddles[j])
                     # note: paddle_collision does not move ball; paddle_collision changes velocity of ball
             # collision with walls
             self.wall_collision(i, candidate)
-            # set new position based on collision and existing velocity
-            self.balls[i] = candidate
+        if config.ballCollision:
+            self.ball_collisions()
+
+    def snapshot(self) -> bytes:
+        "the whole match (balls, paddles, inputs, score, counters and rng) as one buffer, see snapshot.py"
+        return pack(PONG, (), (int(self.score._x), int(self.score._y), self.paddleHits, self.wallHits, self.ballHits), self.rng,
+            (self.pack_balls(), snapshot_vectors(self.paddles), snapshot_vectors(self.paddleInput)))
+
+    def restore(self, data) -> Pong:
+        "put back a snapshot(), reusing the existing ball and paddle vectors where the counts match"
+        _, (x, y, self.paddleHits, self.wallHits, self.ballHits), (balls, paddles, inputs) = unpack(data, PONG, self.rng)
+        self.score = V(x, y)
+        self.unpack_balls(balls)
+        self.paddles = restore_vectors(paddles, getattr(self, "paddles", None), MV)
+        self.paddleInput = restore_vectors(inputs, self.paddleInput)
+        return self
+
+    def pack_balls(self) -> array:
+        "x, y, dx, dy per ball"
+        return array("d", chain.from_iterable((ball._x, ball._y, velocity._x, velocity._y)
+            for ball, velocity in zip(self.balls, self.ballVelocities)))
+
+    def unpack_balls(self, flat):
+        count = len(flat) // 4
+        if len(getattr(self, "balls", ())) != count or len(getattr(self, "ballVelocities", ())) != count:
+            self.balls = [MV(0, 0) for _ in range(count)]
+            self.ballVelocities = [MV(0, 0) for _ in range(count)]
+        for k, (ball, velocity) in enumerate(zip(self.balls, self.ballVelocities)):
+            ball.set(flat[4 * k], flat[4 * k + 1])
+            velocity.set(flat[4 * k + 2], flat[4 * k + 3])
 
     # ascii rasterisation
     def display(self, ascii: Vector = V(24, 24)):
-        scale = self.pageSize / ascii
-        world = [[" " for _ in range(ascii.x)] for _ in range(ascii.y)]
-        for ix in range(ascii.x):
-            for iy in range(ascii.y):
-                scan = V(ix, iy) * scale
-                for paddle in self.paddles:
-                    if scan.inside(paddle, paddle + self.paddleSize):
-                        world[iy][ix] = "P"
-                for ball in self.balls:
-                    if scan.inside(ball, ball + self.ballSize):
-                        world[iy][ix] = "B"
-        for line in world:
-            print("".join(line))
+        print(Raster(int(ascii.x), int(ascii.y)).draw(self))
+
+    @cached_property
+    def _scratch(self) -> MutableVector:
+        # reused by the tick helpers instead of allocating temporaries
+        return MV(0, 0)
+
+    @cached_property
+    def paddleHash(self) -> SpatialHash:
+        # broadphase over the paddles, see PongConfig.paddleCellSize
+        return SpatialHash(self.config.paddleCellSize)
+
+    @cached_property
+    def ballSweep(self) -> SweepAndPrune:
+        # broadphase between balls; keeps its sort order from tick to tick
+        return SweepAndPrune()
 
     @cached_property
-    def theta(self) -> float:
-        # for a rectangle where the top two points are p1, p2 and the origin is o
-        # theta is precisely half the angle described p1 <- o -> p2 (p1 o p2) 
-        # this is used to distinguish between which side of the paddle was hit
-        # by a ball
-        #return A(radians=(atan(self.paddleSize.x / self.paddleSize.y)))
-        return A(atan(self.paddleSize.x / self.paddleSize.y))
+    def _ballRect(self) -> Rect:
+        # collision box of whichever ball tick is currently moving
+        return Rect(0, 0, 0, 0)
 
     def add_two_paddles(self) -> Pong:
-        self.paddles = [(self.pageSize.vy / 2) + self.paddleOffset, self.pageSize.vx + (self.pageSize.vy / 2) - self.paddleOffset]
-        self.paddleInput = [V(0, 0), V(0, 0)]
-        return pong
+        self.paddles = [MV(*((self.pageSize.vy / 2) + self.paddleOffset)), MV(*(self.pageSize.vx + (self.pageSize.vy / 2) - self.paddleOffset))]
+        self.paddleInput = [V_ZERO, V_ZERO]
+        return self
 
     def add_balls(self, ballCount: int):
-        self.balls = [self.ballStartLocation] * ballCount
-        self.ballVelocities = [self.random_ball_start_speed() for _ in range(ballCount)]
+        x, y = self.ballStartLocation._x, self.ballStartLocation._y
+        self.balls = [MV(x, y) for _ in range(ballCount)]
+        speeds = self.random_ball_start_speeds(ballCount)
+        self.ballVelocities = speeds if np is None else speeds.to_vectors(MV)
    
     def create_game_normal(self):
         self.add_two_paddles()
@@ -204,9 +407,52 @@ class Pong:
         self.add_two_paddles()
         self.add_balls(ballCount)
 
+# engines selectable by name; the numpy one is imported on first use
+PYTHON_ENGINE = "python"
+NUMPY_ENGINE = "numpy"
+NUMBA_ENGINE = "numba"
+EVENT_ENGINE = "event"
+ENGINES = (PYTHON_ENGINE, NUMPY_ENGINE, NUMBA_ENGINE, EVENT_ENGINE)
+# engines whose tick honours continuousCollision; the others ignore it
+SWEPT_ENGINES = (PYTHON_ENGINE, EVENT_ENGINE)
+# the server's fixed tick for SWEPT_ENGINES; continuousCollision keeps steps
+# this long from tunnelling. Other engines tick at DEFAULT_STEP
+SERVER_STEP = 0.05
+
+def engine_class(name: str = PYTHON_ENGINE) -> type[Pong]:
+    if name == PYTHON_ENGINE:
+        return Pong
+    if name == NUMPY_ENGINE:
+        from pongnumpy import NumpyPong
+        return NumpyPong
+    if name == NUMBA_ENGINE:
+        from pongaccelerated import AcceleratedPong
+        return AcceleratedPong
+    if name == EVENT_ENGINE:
+        from pongevent import EventPong
+        return EventPong
+    raise ValueError(f"Unknown pong engine {name!r}, expected one of {', '.join(map(repr, ENGINES))}")
+
+def pack_vectors(vectors) -> PackedVectors:
+    if isinstance(vectors, VectorArray):
+        return PackedVectors.from_array(vectors)
+    return PackedVectors.from_vectors(vectors)
+
 class PongServer(Server):
+    engine: str = PYTHON_ENGINE
+    # seconds per tick, set by start()
+    step: float = SERVER_STEP
+
     def start(self):
-        self.ponger = Pong.create_game_normal()
+        self.ponger = engine_class(self.engine)()
+        if self.engine in SWEPT_ENGINES:
+            # the server ticks at a low rate, so large steps must not tunnel
+            self.ponger.continuousCollision = True
+            self.step = SERVER_STEP
+        else:
+            # engines that can't sweep tick in steps short enough not to tunnel
+            self.step = DEFAULT_STEP
+        self.ponger.create_game_normal()
 
     def handle_request(self, addr: Address, data: dict):
         paddleID, input_ = (None for _ in range(2))
@@ -214,22 +460,25 @@ class PongServer(Server):
             paddleID = data[PADDLE_ID]
         if INPUT in data:
             input_ = data[INPUT]
-        self.ponger.paddleInput[paddleID] = V(0, 1) * input_
+        self.ponger.paddleInput[paddleID] = V_UNIT_Y * input_
         self.clients[addr].send({
-            BALL_POSITIONS: [[*ball] for ball in self.ponger.balls],
-            PADDLE_POSITIONS: [[*paddle] for paddle in self.ponger.paddles],
-            BALL_VELOCITIES: [[*bvel] for bvel in self.ponger.ballVelocities],
-            PADDLE_INPUTS: [[*pvel] for pvel in self.ponger.paddleInput],
+            BALL_POSITIONS: pack_vectors(self.ponger.balls),
+            PADDLE_POSITIONS: pack_vectors(self.ponger.paddles),
+            BALL_VELOCITIES: pack_vectors(self.ponger.ballVelocities),
+            PADDLE_INPUTS: pack_vectors(self.ponger.paddleInput),
         })
 
-def unpack_vector_sequence(sequence: list[list[float]]) -> list[Vector]:
-    return [V(*item) for item in sequence]
+def unpack_vector_sequence(sequence: PackedVectors) -> list[MutableVector]:
+    return sequence.to_vectors(MV)
 
 class PongClient(Client):
+    engine: str = PYTHON_ENGINE
+
     def _start(self):
         self.i = 0
         self.updatetime = 0
-        self.ponger = Pong.create_game_normal()
+        self.ponger = engine_class(self.engine)()
+        self.ponger.create_game_normal()
         data = self.request({PADDLE_ID: 0, INPUT: 1})
         self.ponger.balls = unpack_vector_sequence(data[BALL_POSITIONS])
         self.delay = 0.1
@@ -245,8 +494,7 @@ class PongClient(Client):
         alteredBallsv = []
         for currentBall, targetBall, targetVelocity in zip(self.ponger.balls, balls, ballsv):
             delta = targetBall - currentBall
-            newV = targetVelocity + (delta * self.delay * self.interval)
-            alteredBallsv.append(newV)
+            alteredBallsv.append(targetVelocity.iadd(delta, self.delay * self.interval))
         if self.i < 4:
             self.ponger.balls = balls
         if self.i % 20 == 0:
@@ -272,17 +520,13 @@ class PongClient(Client):
         self.cthread = call(self.autoupdate)
         return self
 
+
 if __name__ == "__main__":
+    from simulation import Simulation
     s = PongServer(Address())
     s.start()
-    stime = time.time()
     with s.operate():
-        while True:
-            time.sleep(0.05)
-            ctime = time.time()
-            dt = ctime - stime
-            stime = ctime
-            s.ponger.tick(dt)
+        Simulation(s.ponger, s.step).run_realtime()
 
 LM.flush_all()
 
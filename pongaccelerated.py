@@ -1,53 +1,201 @@
 
 from __future__ import annotations
 
-from numba import njit, prange
 import numpy as np
+from numba import njit, prange
+
+from events import BOTTOM_WALL, LEFT_WALL, PADDLE_HIT, RIGHT_WALL, SCORED, TOP_WALL, WALL_HIT
+from pong import Pong
+from pongnumpy import NumpyPong, pair
+
+__all__ = ["AcceleratedPong", "prepare", "advance", "collide"]
+
+BALLX, BALLY = Pong.ballSize._x, Pong.ballSize._y
+PADDLEX, PADDLEY = Pong.paddleSize._x, Pong.paddleSize._y
+PAGEX, PAGEY = Pong.pageSize._x, Pong.pageSize._y
 
-class FakeBall: x: float; y: float; dx: float; dy: float
-class FakePaddle: x: float; y: float
+# the kernels take NumpyPong.state viewed as an (N, 4) float64 array,
+# one row of x, y, dx, dy per ball
+X, Y, DX, DY = range(4)
+# values prepare writes to `scored`
+STAYED, SCORED_LEFT, SCORED_RIGHT = 0, 1, 2
+# advance sets bit 1 << wall in `walls` for each wall a ball bounced off
+# (see events.py), and bit j % 64 of word j // 64 of the ball's row of
+# `paddles` for each paddle j it hit, so any number of paddles fit
+PADDLE_WORD = 64
 
-BALL = np.dtype([('x', np.float64),
-                 ('y', np.float64),
-                 ('dx', np.float64),
-                 ('dy', np.float64)])
+@njit(parallel=True, cache=True)
+def prepare(balls, scored, idealX, idealY, factor, zoneLow, zoneHigh, startX, startY):
+    "passive speed modification then scoring; scored balls go back to the start with their velocity left to the caller"
+    for i in prange(balls.shape[0]):
+        for axis in (DX, DY):
+            v = balls[i, axis]
+            sign = 1.0 if v >= -0.5 else -1.0
+            speed = abs(v)
+            ideal = idealX if axis == DX else idealY
+            balls[i, axis] = (speed + (ideal - speed) * factor) * sign
+        x = np.rint(balls[i, X])
+        if x < zoneLow:
+            scored[i] = SCORED_LEFT
+        elif x > zoneHigh:
+            scored[i] = SCORED_RIGHT
+        else:
+            scored[i] = STAYED
+            continue
+        balls[i, X] = startX
+        balls[i, Y] = startY
 
-PADDLE = np.dtype([('x', np.float64), ('y', np.float64)])
+@njit(parallel=True, cache=True)
+def advance(balls, walls, paddles, rects, pushes, bumpX, bumpY, ballW, ballH, limitX, limitY, dt):
+    "integration, then paddle collision against every paddle in order, then wall collision; returns (paddle hits, wall hits)"
+    paddleHits = 0
+    wallHits = 0
+    for i in prange(balls.shape[0]):
+        hit = 0
+        for word in range(paddles.shape[1]):
+            paddles[i, word] = 0
+        x = balls[i, X] + balls[i, DX] * dt
+        y = balls[i, Y] + balls[i, DY] * dt
+        balls[i, X] = x
+        balls[i, Y] = y
+        for j in range(rects.shape[0]):
+            if not (x <= rects[j, 2] and rects[j, 0] <= x + ballW and y <= rects[j, 3] and rects[j, 1] <= y + ballH):
+                continue
+            vx = (balls[i, DX] + pushes[j, 0]) * bumpX
+            vy = (balls[i, DY] + pushes[j, 1]) * bumpY
+            # collision.hit_side
+            left = x + ballW - rects[j, 0]
+            right = rects[j, 2] - x
+            top = y + ballH - rects[j, 1]
+            bottom = rects[j, 3] - y
+            if min(left, right) < min(top, bottom):
+                vx = -abs(vx) if left <= right else abs(vx)
+            else:
+                vy = -abs(vy) if top <= bottom else abs(vy)
+            balls[i, DX] = vx
+            balls[i, DY] = vy
+            paddleHits += 1
+            paddles[i, j // PADDLE_WORD] |= np.uint64(1) << np.uint64(j % PADDLE_WORD)
+        ry = np.rint(y)
+        if ry < 0:
+            balls[i, DY] = abs(balls[i, DY])
+            wallHits += 1
+            hit |= 1 << TOP_WALL
+        elif ry > limitY:
+            balls[i, DY] = -abs(balls[i, DY])
+            wallHits += 1
+            hit |= 1 << BOTTOM_WALL
+        rx = np.rint(x)
+        if rx < 0:
+            balls[i, DX] = abs(balls[i, DX])
+            wallHits += 1
+            hit |= 1 << LEFT_WALL
+        elif rx > limitX:
+            balls[i, DX] = -abs(balls[i, DX])
+            wallHits += 1
+            hit |= 1 << RIGHT_WALL
+        walls[i] = hit
+    return paddleHits, wallHits
 
-BALLX = 6
-BALLY = 6
-PADDLEX = 40
-PADDLEY = 100
+@njit(cache=True)
+def collide(balls, order, ballW, ballH):
+    """
+    Pong.ball_collisions: insertion sort `order` by (x, index), then sweep
+    it, resolving each overlapping pair in the order SweepAndPrune.pairs
+    lists them. Serial, as each bounce can change the next. Returns hits.
+    """
+    for k in range(1, order.shape[0]):
+        i = order[k]
+        x = balls[i, X]
+        m = k - 1
+        while m >= 0:
+            j = order[m]
+            if balls[j, X] < x or (balls[j, X] == x and j < i):
+                break
+            order[m + 1] = j
+            m -= 1
+        order[m + 1] = i
+    hits = 0
+    for k in range(order.shape[0]):
+        i = order[k]
+        limit = balls[i, X] + ballW
+        for m in range(k + 1, order.shape[0]):
+            j = order[m]
+            if balls[j, X] >= limit:
+                break
+            dx = balls[j, X] - balls[i, X]
+            dy = balls[j, Y] - balls[i, Y]
+            if not (-ballH < dy < ballH):
+                continue
+            if ballW - abs(dx) < ballH - abs(dy):
+                if (balls[i, DX] - balls[j, DX]) * dx > 0:
+                    balls[i, DX], balls[j, DX] = balls[j, DX], balls[i, DX]
+                    hits += 1
+            elif (balls[i, DY] - balls[j, DY]) * dy > 0:
+                balls[i, DY], balls[j, DY] = balls[j, DY], balls[i, DY]
+                hits += 1
+    return hits
 
-PAGEX = 1500
-PAGEY = 1000
+class AcceleratedPong(NumpyPong):
+    """
+    NumpyPong with the per-ball stages of tick compiled by numba and
+    run over the balls in parallel, for stress games of 1M balls.
 
-ballCount, paddleCount = 1_000_000, 2
+    Paddles and random start speeds stay in Python: prepare() marks the
+    balls that scored and restart() draws their new speeds in index
+    order, so a seeded AcceleratedPong follows a seeded Pong.
 
-@njit(parallel=True)
-def tick(balls: list[FakeBall], paddles: list[FakePaddle], dt: np.float64):
-    # all ball -> paddle / wall collision
-    for i in prange(ballCount):
-        # setup
-        record = balls[i]
-        x, y, dx, dy = record.x, record.y, record.dx, record.dy
-        # paddle collision
-        for j in prange(paddleCount):
-            precord = paddles[j]
-            px, py = precord.x, precord.y
-            wx, wy = px + PADDLEX, py + PADDLEY
-            
-        # wall collision
+    Nothing is compiled on import; the kernels compile on the first
+    tick (and are cached on disk after that).
 
-    return balls
+    Events come out a kind at a time rather than in the order they
+    happened, and collide() reports no BALL_HIT events.
+    """
 
-ballBuffer = np.zeros(ballCount * len(BALL)).reshape((ballCount, len(BALL))).astype(np.float64)
-balls = np.recarray(ballCount, dtype=BALL, buf=ballBuffer)
+    # collide()'s sort order, kept from tick to tick like Pong.ballSweep
+    ballOrder: np.ndarray = None
 
-paddleBuffer = np.zeros(paddleCount * len(PADDLE)).reshape((paddleCount, len(PADDLE))).astype(np.float64)
-paddles = np.recarray(paddleCount, dtype=PADDLE, buf=paddleBuffer)
+    def ball_collisions(self):
+        balls = self.state.view(np.float64).reshape(-1, 4)
+        if self.ballOrder is None or len(self.ballOrder) != len(balls):
+            self.ballOrder = np.argsort(balls[:, X], kind="stable")
+        self.ballHits += collide(balls, self.ballOrder, self.config.ballW, self.config.ballH)
 
-for i in range(1_000):
-    tick(balls, paddles, 0.1)
+    def report_hits(self, walls: np.ndarray, paddles: np.ndarray):
+        "turn the bits advance() set in `walls` and `paddles` into PADDLE_HIT and WALL_HIT events"
+        hit = np.flatnonzero(paddles.any(axis=1))
+        words = paddles[hit]
+        for j in range(len(self.paddles)):
+            bit = np.uint64(1) << np.uint64(j % PADDLE_WORD)
+            self.events.extend(PADDLE_HIT, hit[(words[:, j // PADDLE_WORD] & bit) != 0], j)
+        hit = np.flatnonzero(walls)
+        bits = walls[hit]
+        for wall in (TOP_WALL, BOTTOM_WALL, LEFT_WALL, RIGHT_WALL):
+            self.events.extend(WALL_HIT, hit[(bits & (1 << wall)) != 0], wall)
 
-print(balls[4].x)
\ No newline at end of file
+    def tick(self, dt: float, checkCollision: bool = True):
+        config = self.config
+        self.move_paddles(dt)
+        self.place_paddle_rects()
+        balls = self.state.view(np.float64).reshape(-1, 4)
+        scored = np.empty(len(balls), dtype=np.uint8)
+        prepare(balls, scored, config.ballIdealSpeed._x, config.ballIdealSpeed._y, config.ballReturnToIdealFactor,
+            config.scoreLow, config.scoreHigh, config.ballStartLocation._x, config.ballStartLocation._y)
+        restarted = np.flatnonzero(scored)
+        if restarted.size and self.events is not None:
+            self.events.extend(SCORED, restarted, scored[restarted] - SCORED_LEFT)
+        if restarted.size:
+            self.restart(restarted, int(np.count_nonzero(scored == SCORED_LEFT)), int(np.count_nonzero(scored == SCORED_RIGHT)))
+        rects = np.array([(rect.x0, rect.y0, rect.x1, rect.y1) for rect in self.paddleRects], dtype=np.float64).reshape(-1, 4)
+        pushes = np.array([pair(self.paddleInput[j] * self.paddleMaxSpeed * self.paddleFriction)
+            for j in range(len(self.paddles))]).reshape(-1, 2)
+        walls = np.empty(len(balls), dtype=np.uint8)
+        paddles = np.empty((len(balls), -(-len(self.paddles) // PADDLE_WORD)), dtype=np.uint64)
+        paddleHits, wallHits = advance(balls, walls, paddles, rects, pushes, config.ballBumpMultiplier._x, config.ballBumpMultiplier._y,
+            config.ballW, config.ballH, config.wallX, config.wallY, dt)
+        self.paddleHits += paddleHits
+        self.wallHits += wallHits
+        if self.events is not None and paddleHits + wallHits:
+            self.report_hits(walls, paddles)
+        if config.ballCollision:
+            self.ball_collisions()
@@ -5,11 +5,14 @@ import time
 from random import randint
 
 from element import Element
+from events import SCORED, EventBuffer
 import pongaccelerated as pong
+from pongaccelerated import AcceleratedPong
 from pyg import Screen, load_and_scale, load_texture, TEXTURE_ROUTES, LOG_ROUTES
 from pygcontext import PygContext
 from pygtext import Text
-from unsafe_vector import V, Vector
+from simulation import DEFAULT_STEP, Simulation
+from vector import V, Vector
 
 class Display(Screen):
     _size = [pong.PAGEX, pong.PAGEY]
@@ -18,17 +21,17 @@ class Display(Screen):
 class Ball(Element):
     def __init__(self, screen, pos: Vector):
         super().__init__(screen, pos)
-        self.texture = load_and_scale(f"{str(randint(0, 5))}.png", (pong.BALLX, pong.BALLY))
+        self.texture = load_and_scale(f"{str(randint(0, 5))}.png", V(pong.BALLX, pong.BALLY))
 
 class Paddle(Element):
     def __init__(self, screen, pos: Vector):
         super().__init__(screen, pos)
-        self.texture = load_and_scale("4.png", (pong.PADDLEX, pong.PADDLEY))
+        self.texture = load_and_scale("4.png", V(pong.PADDLEX, pong.PADDLEY))
 
 class BlackBackground(Element):
     def __init__(self, screen):
         super().__init__(screen, V(0, 0))
-        self.texture = load_and_scale("background.png", (pong.PAGEX, pong.PAGEY))
+        self.texture = load_and_scale("background.png", V(pong.PAGEX, pong.PAGEY))
 
 class Scoreboard(Text):
     fontSize = 32
@@ -41,20 +44,28 @@ class PongGameContext(PygContext):
     last: float
     ballCount: int = 800
     
+    ponger: AcceleratedPong
     background: BlackBackground
     balls: list[Ball]
     paddles: list[Paddle]
     score: Vector
     scoreboard: Scoreboard
     dt: float = 0
+    # seconds per game tick, however fast frames arrive
+    step: float = DEFAULT_STEP
+    simulation: Simulation
 
     def start(self):
         super().start()
         self.exitCode = 0
         self.last = time.time()
+        self.ponger = AcceleratedPong()
+        self.ponger.create_game_balls(self.ballCount)
+        self.ponger.events = EventBuffer()
+        self.simulation = Simulation(self.ponger, self.step)
         self.background = BlackBackground(self.screen)
-        self.balls = [Ball(self.screen, (rec.x, rec.y)) for rec in pong.balls]
-        self.paddles = [Paddle(self.screen, (rec.x, rec.y)) for rec in pong.paddles]
+        self.balls = [Ball(self.screen, pos) for pos in self.ponger.balls]
+        self.paddles = [Paddle(self.screen, pos) for pos in self.ponger.paddles]
         self.score = V(0, 0)
         self.scoreboard = Scoreboard(self.screen, self.ponger.pageSize.vx / 2 + self.ponger.pageSize.vy / 8)
         self.scoreboard.text = f"  {0}  :  {0}  "
@@ -98,19 +109,20 @@ class PongGameContext(PygContext):
             self.screen.done = True
             self.exitCode = 1
 
-    def handle_scoreboard(self):
-        if self.score != self.ponger.score:
-            s1, s2 = str(self.ponger.score.y), str(self.ponger.score.x)
-            s1, s2 = s1.rjust(4, " "), s2.ljust(4, " ")
-            self.scoreboard.text = f"  {s1}  :  {s2}  "
-            self.scoreboard.pos = (self.ponger.pageSize.vx / 2 + self.ponger.pageSize.vy / 8) - (self.scoreboard.size.vx / 2)
-            self.score = self.ponger.score
+    def handle_scoreboard(self, events: EventBuffer):
+        if not events.count(SCORED):
+            return
+        s1, s2 = str(self.ponger.score.y), str(self.ponger.score.x)
+        s1, s2 = s1.rjust(4, " "), s2.ljust(4, " ")
+        self.scoreboard.text = f"  {s1}  :  {s2}  "
+        self.scoreboard.pos = (self.ponger.pageSize.vx / 2 + self.ponger.pageSize.vy / 8) - (self.scoreboard.size.vx / 2)
+        self.score = self.ponger.score
 
     def handle_tick(self) -> float:
         ctime = time.time()
         dt = ctime - self.last
         self.last = ctime
-        self.ponger.tick(dt)
+        self.simulation.advance(dt)
         return dt
 
     def handle_elements(self):
@@ -122,8 +134,9 @@ class PongGameContext(PygContext):
 
     def update(self):
         self.handle_input(self.dt)
-        self.handle_scoreboard()
         self.dt = self.handle_tick()
+        # everything that happened over this frame's ticks
+        self.handle_scoreboard(self.ponger.events.drain())
         self.handle_elements()
 
 def main(d: bool = True):
@@ -3,10 +3,15 @@
 from __future__ import annotations
 
 from pong import *
+from simulation import Simulation
+from terminal import Raster, TerminalRenderer
 
 client = PongClient(Address())
 
 client._start()
+simulation = Simulation(client.ponger)
+raster = Raster(100, 30)
+renderer = TerminalRenderer()
 
 stime = time.time()
 
@@ -15,9 +20,9 @@ while True:
     i += 1
     dt = time.time() - stime
     stime = time.time()
-    client.ponger.tick(dt)
+    simulation.advance(dt)
     if i % 5 == 0:
-        client.ponger.display(V(100, 30))
+        renderer.render(raster.draw(client.ponger))
     elif i % 10 == 0:
         client.update()
 
@@ -0,0 +1,317 @@
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from math import inf
+
+import numpy as np
+
+from collision import hit_side, reflect, sweep
+from events import BOTTOM_WALL, LEFT_WALL, PADDLE_HIT, RIGHT_WALL, SCORED, TOP_WALL, WALL_HIT
+from pong import Pong
+from simulation import DEFAULT_STEP
+from vector import VA, V_UNIT_X, V_UNIT_Y, VectorArray
+
+__all__ = ["EventPong"]
+
+# what a queued event is for: a fresh look at the paddles at the end of the
+# horizon, coming near a paddle, a wall across or along, or a score line
+LOOK, NEAR, WALL_X, WALL_Y, SCORE = range(5)
+
+def leaving(c: float, dc: float, low: float, high: float) -> float:
+    "seconds until c, moving at dc, crosses low or high; 0 if already past one and moving away, inf if never"
+    if dc < 0:
+        return max((low - c) / dc, 0.)
+    if dc > 0:
+        return max((high - c) / dc, 0.)
+    return inf
+
+class EventPong(Pong):
+    """
+    Pong that only does work for a ball when something happens to it.
+
+    Between contacts a ball moves in a straight line, so each ball is
+    kept as an origin (where it was at time ts, and its velocity) and
+    the time of its next event: the next wall or score line it crosses,
+    worked out exactly, or the next time it has to look at the paddles
+    again. The events sit in one heap, and tick(dt) only handles those
+    that fall before the new time. Positions are worked out when asked
+    for (.balls, pack_balls), so a tick costs the events in it, not the
+    balls in the game.
+
+    Paddles answer to input from tick to tick, so no ball can know when
+    it will reach one. Instead a ball plans `horizon` seconds ahead
+    against each paddle's box grown by the furthest the paddle can move
+    in that time. A ball that can't reach any of them just looks again
+    at the end of the horizon (or when it enters one); a ball inside one
+    is near a paddle.
+
+    Every tick a near ball is swept against the paddles up to each of
+    its events and on to the end of the tick, as Pong sweeps with
+    continuousCollision, so a fast ball or a long step can't carry it
+    through a paddle. Walls and score lines
+    are exact events, so contacts don't depend on the step and
+    continuousCollision is always in effect.
+
+    Pong eases every ball's speed toward ballIdealSpeed every tick; here
+    a ball's speed is eased by the same amount (as for ticks of
+    `easeStep`) whenever its origin moves on, so speeds keep to Pong's
+    but paths bend at events rather than every tick. There are no
+    ball-ball collisions, so ballCollision is ignored.
+
+    Balls and paddles changed by hand (not through the .balls and
+    .ballVelocities setters) need a plan_all() before the next tick.
+    """
+
+    # seconds ahead a ball plans against the paddles; longer means fewer
+    # looks but more balls near a paddle
+    horizon: float = 0.25
+    easeStep: float = DEFAULT_STEP
+
+    time: float = 0.
+    # ball updates the last tick made: events handled and near balls tested
+    updates: int = 0
+
+    # each ball's origin: where it was at ts, and its velocity since
+    xs: array
+    ys: array
+    dxs: array
+    dys: array
+    ts: array
+    # (time, ball, version, kind) events; a ball's events from older plans
+    # than versions[ball] are skipped when they come up
+    queue: list[tuple[float, int, int, int]]
+    versions: list[int]
+    near: set[int]
+
+    def __init__(self, seed: int = None, config=None):
+        super().__init__(seed, config)
+        self._reset(array("d"), array("d"), array("d"), array("d"))
+
+    def positions(self) -> np.ndarray:
+        "an (N, 2) array of where every ball is now"
+        elapsed = self.time - np.frombuffer(self.ts)
+        return np.column_stack((np.frombuffer(self.xs) + np.frombuffer(self.dxs) * elapsed,
+            np.frombuffer(self.ys) + np.frombuffer(self.dys) * elapsed)).reshape(-1, 2)
+
+    @property
+    def balls(self) -> VectorArray:
+        return VA(self.positions())
+
+    @balls.setter
+    def balls(self, balls):
+        data = VA.from_vectors(balls)._data
+        dxs, dys = self.dxs, self.dys
+        if len(dxs) != len(data):
+            dxs, dys = array("d", bytes(8 * len(data))), array("d", bytes(8 * len(data)))
+        self._reset(array("d", data[:, 0].tobytes()), array("d", data[:, 1].tobytes()), dxs, dys)
+
+    @property
+    def ballVelocities(self) -> VectorArray:
+        return VA(np.column_stack((np.frombuffer(self.dxs), np.frombuffer(self.dys))).reshape(-1, 2))
+
+    @ballVelocities.setter
+    def ballVelocities(self, velocities):
+        data = VA.from_vectors(velocities)._data
+        positions = self.positions()
+        if len(positions) != len(data):
+            positions = np.zeros((len(data), 2))
+        self._reset(array("d", positions[:, 0].tobytes()), array("d", positions[:, 1].tobytes()),
+            array("d", data[:, 0].tobytes()), array("d", data[:, 1].tobytes()))
+
+    def add_balls(self, ballCount: int):
+        # Pong's draws, planned once rather than once per setter
+        start = self.ballStartLocation
+        speeds = VA.from_vectors(self.random_ball_start_speeds(ballCount))._data
+        self._reset(array("d", [start._x]) * ballCount, array("d", [start._y]) * ballCount,
+            array("d", speeds[:, 0].tobytes()), array("d", speeds[:, 1].tobytes()))
+
+    def pack_balls(self) -> np.ndarray:
+        return np.column_stack((self.positions(), np.frombuffer(self.dxs), np.frombuffer(self.dys))).ravel()
+
+    def unpack_balls(self, flat):
+        flat = np.asarray(flat, dtype=np.float64).reshape(-1, 4)
+        self._reset(*(array("d", flat[:, k].tobytes()) for k in range(4)))
+
+    def restore(self, data) -> EventPong:
+        super().restore(data)
+        # the paddles come back after the balls
+        self.plan_all()
+        return self
+
+    def _reset(self, xs: array, ys: array, dxs: array, dys: array):
+        self.xs, self.ys, self.dxs, self.dys = xs, ys, dxs, dys
+        self.ts = array("d", [self.time]) * len(xs)
+        self.plan_all()
+
+    def plan_all(self):
+        "drop every queued event and plan each ball afresh from where it is now"
+        self.queue = []
+        self.versions = [0] * len(self.xs)
+        self.near = set()
+        if getattr(self, "paddles", None) is not None:
+            self.place_paddle_rects()
+        for i in range(len(self.xs)):
+            self.rebase(i, self.time)
+            self.plan(i)
+
+    def rebase(self, i: int, now: float):
+        "move ball i's origin on to `now`, easing its speed as Pong's ticks would have meanwhile"
+        elapsed = now - self.ts[i]
+        if elapsed <= 0:
+            return
+        dx, dy = self.dxs[i], self.dys[i]
+        self.xs[i] += dx * elapsed
+        self.ys[i] += dy * elapsed
+        self.ts[i] = now
+        config = self.config
+        # ideal + (speed - ideal) * (1 - factor) ** ticks: Pong's per tick easing, ticks times over
+        keep = (1 - config.ballReturnToIdealFactor) ** (elapsed / self.easeStep)
+        ideal = config.ballIdealSpeed
+        # Vector.signs tests the rounded components: round(c) >= 0 exactly when c >= -0.5
+        self.dxs[i] = (ideal._x + (abs(dx) - ideal._x) * keep) * (1. if dx >= -0.5 else -1.)
+        self.dys[i] = (ideal._y + (abs(dy) - ideal._y) * keep) * (1. if dy >= -0.5 else -1.)
+
+    def reach(self) -> tuple[float, float]:
+        "how far a paddle can move in x and y within the horizon"
+        speed = self.config.paddleMaxSpeed
+        return speed._x * self.horizon, speed._y * self.horizon
+
+    def is_near(self, x: float, y: float) -> bool:
+        "True when a ball at x, y is inside some paddle's grown box"
+        reachX, reachY = self.reach()
+        w, h = self.config.ballW, self.config.ballH
+        return any(x <= rect.x1 + reachX and rect.x0 - reachX <= x + w and y <= rect.y1 + reachY and rect.y0 - reachY <= y + h
+            for rect in self.paddleRects)
+
+    def plan(self, i: int, near: bool = None):
+        "queue ball i's next event; its origin must be at the current time. `near` skips the test for it"
+        config = self.config
+        x, y, dx, dy, now = self.xs[i], self.ys[i], self.dxs[i], self.dys[i], self.ts[i]
+        if x < config.scoreLow or x > config.scoreHigh:
+            when, kind = 0., SCORE
+        else:
+            when, kind = leaving(x, dx, config.scoreLow, config.scoreHigh), SCORE
+            t = leaving(x, dx, 0., config.ballRangeX)
+            if t < when:
+                when, kind = t, WALL_X
+        t = leaving(y, dy, 0., config.ballRangeY)
+        if t < when:
+            when, kind = t, WALL_Y
+        if near is None:
+            near = self.is_near(x, y)
+        if near:
+            self.near.add(i)
+        else:
+            self.near.discard(i)
+            horizon = self.horizon
+            if horizon < when:
+                when, kind = horizon, LOOK
+            reachX, reachY = self.reach()
+            w, h = config.ballW, config.ballH
+            for rect in self.paddleRects:
+                contact = sweep(x, y, dx * horizon, dy * horizon, w, h,
+                    rect.x0 - reachX, rect.y0 - reachY, rect.x1 + reachX, rect.y1 + reachY)
+                if contact is not None and contact[0] * horizon < when:
+                    when, kind = contact[0] * horizon, NEAR
+        self.versions[i] += 1
+        if when < inf:
+            heapq.heappush(self.queue, (now + when, i, self.versions[i], kind))
+
+    def handle(self, i: int, kind: int):
+        "ball i has reached a score line or a wall"
+        config, events = self.config, self.events
+        if kind == SCORE:
+            right = self.xs[i] > (config.scoreLow + config.scoreHigh) / 2
+            self.score = self.score + (V_UNIT_Y if right else V_UNIT_X)
+            if events is not None:
+                events.add(SCORED, i, int(right))
+            self.xs[i], self.ys[i] = config.ballStartLocation._x, config.ballStartLocation._y
+            self.dxs[i], self.dys[i] = self.random_ball_start_speed()
+        elif kind == WALL_X:
+            right = self.xs[i] > config.ballRangeX / 2
+            self.dxs[i] = -abs(self.dxs[i]) if right else abs(self.dxs[i])
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, RIGHT_WALL if right else LEFT_WALL)
+        elif kind == WALL_Y:
+            bottom = self.ys[i] > config.ballRangeY / 2
+            self.dys[i] = -abs(self.dys[i]) if bottom else abs(self.dys[i])
+            self.wallHits += 1
+            if events is not None:
+                events.add(WALL_HIT, i, BOTTOM_WALL if bottom else TOP_WALL)
+
+    def paddle_bounce(self, i: int, j: int, side: tuple[int, int]):
+        config = self.config
+        push, bump = self.paddleInput[j], config.ballBumpMultiplier
+        vx = (self.dxs[i] + push._x * config.paddleMaxSpeed._x * config.paddleFriction._x) * bump._x
+        vy = (self.dys[i] + push._y * config.paddleMaxSpeed._y * config.paddleFriction._y) * bump._y
+        self.dxs[i], self.dys[i] = reflect(vx, vy, side)
+        self.paddleHits += 1
+        if self.events is not None:
+            self.events.add(PADDLE_HIT, i, j)
+
+    def sweep_paddles(self, i: int, start: float, end: float) -> bool:
+        "bounce ball i off each paddle it touches between start and end, up to maxBounces; True if it hit one"
+        config = self.config
+        w, h = config.ballW, config.ballH
+        hit = False
+        for _ in range(config.maxBounces):
+            elapsed, span = start - self.ts[i], end - start
+            x, y = self.xs[i] + self.dxs[i] * elapsed, self.ys[i] + self.dys[i] * elapsed
+            dx, dy = self.dxs[i] * span, self.dys[i] * span
+            first, side, paddle = inf, None, None
+            for j, rect in enumerate(self.paddleRects):
+                contact = sweep(x, y, dx, dy, w, h, rect.x0, rect.y0, rect.x1, rect.y1)
+                if contact is not None and contact[0] < first:
+                    (first, side), paddle = contact, j
+            if paddle is None:
+                break
+            # move to the contact, bounce, and sweep what's left of the tick
+            start += span * first
+            self.rebase(i, start)
+            self.paddle_bounce(i, paddle, side)
+            hit = True
+        return hit
+
+    def tick(self, dt: float, checkCollision: bool = True):
+        start, end = self.time, self.time + dt
+        self.move_paddles(dt)
+        self.place_paddle_rects()
+        queue, versions = self.queue, self.versions
+        updates = 0
+        while queue and queue[0][0] <= end:
+            when, i, version, kind = heapq.heappop(queue)
+            if version != versions[i]:
+                continue
+            updates += 1
+            # a near ball may meet a paddle on its way to the event, which then never happens
+            if i in self.near and self.sweep_paddles(i, max(self.ts[i], start), when):
+                self.plan(i)
+                continue
+            self.rebase(i, when)
+            self.handle(i, kind)
+            # a ball that has come to a grown box is near, even if rounding leaves it a hair outside
+            self.plan(i, True if kind == NEAR else None)
+        self.time = end
+        # balls near a paddle are swept against the paddles over this tick
+        w, h = self.config.ballW, self.config.ballH
+        for i in list(self.near):
+            updates += 1
+            hit = self.sweep_paddles(i, max(self.ts[i], start), end)
+            elapsed = end - self.ts[i]
+            x, y = self.xs[i] + self.dxs[i] * elapsed, self.ys[i] + self.dys[i] * elapsed
+            if not hit:
+                # a paddle moving onto a ball is caught where the tick leaves it, as in Pong.sweep_balls
+                for j, rect in enumerate(self.paddleRects):
+                    if x <= rect.x1 and rect.x0 <= x + w and y <= rect.y1 and rect.y0 <= y + h:
+                        if not hit:
+                            self.rebase(i, end)
+                            x, y = self.xs[i], self.ys[i]
+                            hit = True
+                        self.paddle_bounce(i, j, hit_side(x, y, w, h, rect.x0, rect.y0, rect.x1, rect.y1))
+            if hit or not self.is_near(x, y):
+                self.rebase(i, end)
+                self.plan(i)
+        self.updates = updates
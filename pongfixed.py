@@ -0,0 +1,166 @@
+
+from __future__ import annotations
+
+import numpy as np
+
+from events import BOTTOM_WALL, LEFT_WALL, PADDLE_HIT, RIGHT_WALL, SCORED, TOP_WALL, WALL_HIT
+from fixedpoint import FRACTION_BITS, ONE, TICK_RATE, PongUnits, clamp, pong_units, to_fixed, to_fixed_speed
+from pong import Pong
+from vector import VA, V, VectorArray
+
+__all__ = ["FixedPong"]
+
+class FixedPong(Pong):
+    """
+    Pong in whole numbers, for matches that have to come out the same
+    on every machine.
+
+    Ball positions are kept in 1/ONE px and velocities in 1/ONE px per
+    tick, as one (N, 4) int32 array .state of x, y, dx, dy rows, and
+    tick(ticks) advances a whole number of ticks of 1/TICK_RATE s. Every
+    stage is integer arithmetic over the whole array (int64 where
+    products could overflow), so no float rounding can differ between
+    machines, numpy builds or Python versions, and peers that agree on
+    the inputs agree on the game. Settings are turned into units once,
+    by fixedpoint.pong_units.
+
+    .balls, .ballVelocities and pack_balls give px and px per second as
+    the other engines do; every unit value is exact as a float, so
+    snapshot() and restore() lose nothing. Paddles stay MutableVectors,
+    always on a whole unit.
+
+    The stages follow Pong.tick, but rounding to units makes a
+    FixedPong its own game: it won't track a seeded Pong. There are no
+    ball-ball collisions or swept contacts.
+    """
+
+    state: np.ndarray
+
+    @property
+    def units(self) -> PongUnits:
+        return pong_units(self.config)
+
+    @property
+    def balls(self) -> VectorArray:
+        return VA(self.state[:, :2] / ONE)
+
+    @balls.setter
+    def balls(self, balls):
+        data = VA.from_vectors(balls)._data
+        self._resize(len(data))
+        self.state[:, :2] = np.rint(data * ONE)
+
+    @property
+    def ballVelocities(self) -> VectorArray:
+        return VA(self.state[:, 2:] * TICK_RATE / ONE)
+
+    @ballVelocities.setter
+    def ballVelocities(self, velocities):
+        data = VA.from_vectors(velocities)._data
+        self._resize(len(data))
+        self.state[:, 2:] = np.rint(data * ONE / TICK_RATE)
+
+    def _resize(self, ballCount: int):
+        if getattr(self, "state", None) is None or len(self.state) != ballCount:
+            self.state = np.zeros((ballCount, 4), dtype=np.int32)
+
+    def pack_balls(self) -> np.ndarray:
+        return np.column_stack((self.state[:, :2] / ONE, self.state[:, 2:] * TICK_RATE / ONE)).ravel()
+
+    def unpack_balls(self, flat):
+        flat = np.asarray(flat, dtype=np.float64).reshape(-1, 4)
+        self._resize(len(flat))
+        self.state[:, :2] = np.rint(flat[:, :2] * ONE)
+        self.state[:, 2:] = np.rint(flat[:, 2:] * ONE / TICK_RATE)
+
+    def add_balls(self, ballCount: int):
+        self._resize(ballCount)
+        self.state[:, 0], self.state[:, 1] = self.units.startX, self.units.startY
+        self.ballVelocities = self.random_ball_start_speeds(ballCount)
+
+    def start_speed(self) -> tuple[int, int]:
+        "random_ball_start_speed in units"
+        speed = self.random_ball_start_speed()
+        return to_fixed_speed(speed._x), to_fixed_speed(speed._y)
+
+    def move_paddles_fixed(self):
+        "Pong.move_paddles for one tick, in units"
+        units = self.units
+        for i, paddle in enumerate(self.paddles):
+            direction = self.paddleInput[i]
+            x, y = to_fixed(paddle._x), to_fixed(paddle._y)
+            lx, ly, hx, hy = units.paddleBoundsLeft
+            if not (lx <= x <= hx and ly <= y <= hy):
+                lx, ly, hx, hy = units.paddleBoundsRight
+            x += round(max(-1., min(1., direction._x)) * units.paddleSpeedX)
+            y += round(max(-1., min(1., direction._y)) * units.paddleSpeedY)
+            paddle.set(clamp(x, lx, hx) / ONE, clamp(y, ly, hy) / ONE)
+
+    def passive_speed_modification(self):
+        # fixedpoint.ease over every ball
+        units = self.units
+        velocity = self.state[:, 2:].astype(np.int64)
+        speed = np.abs(velocity)
+        speed += ((np.array((units.idealX, units.idealY)) - speed) * units.ease) >> FRACTION_BITS
+        self.state[:, 2:] = np.where(velocity >= 0, speed, -speed)
+
+    def score_updates_all(self):
+        units, state = self.units, self.state
+        left = state[:, 0] < units.scoreLow
+        right = state[:, 0] > units.scoreHigh
+        scored = np.flatnonzero(left | right)
+        if scored.size == 0:
+            return
+        state[scored, 0], state[scored, 1] = units.startX, units.startY
+        if self.events is not None:
+            self.events.extend(SCORED, scored, right[scored])
+        self.score = self.score + V(int(np.count_nonzero(left)), int(np.count_nonzero(right)))
+        # drawn one ball at a time in index order, as Pong does
+        state[scored, 2:] = [self.start_speed() for _ in scored]
+
+    def paddle_collision_all(self, j: int):
+        units, state = self.units, self.state
+        x0, y0 = to_fixed(self.paddles[j]._x), to_fixed(self.paddles[j]._y)
+        x1, y1 = x0 + units.paddleW, y0 + units.paddleH
+        x, y = state[:, 0].astype(np.int64), state[:, 1].astype(np.int64)
+        hit = np.flatnonzero((x <= x1) & (x0 <= x + units.ballW) & (y <= y1) & (y0 <= y + units.ballH))
+        if hit.size == 0:
+            return
+        self.paddleHits += int(hit.size)
+        if self.events is not None:
+            self.events.extend(PADDLE_HIT, hit, j)
+        push = self.paddleInput[j] * self.paddleMaxSpeed * self.paddleFriction
+        vx = ((state[hit, 2].astype(np.int64) + to_fixed_speed(push._x)) * units.bumpX) >> FRACTION_BITS
+        vy = ((state[hit, 3].astype(np.int64) + to_fixed_speed(push._y)) * units.bumpY) >> FRACTION_BITS
+        # collision.hit_side over every ball that hit
+        x, y = x[hit], y[hit]
+        left, right = x + units.ballW - x0, x1 - x
+        top, bottom = y + units.ballH - y0, y1 - y
+        sideX = np.minimum(left, right) < np.minimum(top, bottom)
+        state[hit, 2] = np.where(sideX, np.where(left <= right, -np.abs(vx), np.abs(vx)), vx)
+        state[hit, 3] = np.where(sideX, vy, np.where(top <= bottom, -np.abs(vy), np.abs(vy)))
+
+    def wall_collision_all(self):
+        units, state = self.units, self.state
+        for axis, limit, walls in ((1, units.wallY, (TOP_WALL, BOTTOM_WALL)), (0, units.wallX, (LEFT_WALL, RIGHT_WALL))):
+            c, v = state[:, axis], state[:, axis + 2]
+            low, high = c < 0, c > limit
+            self.wallHits += int(np.count_nonzero(low)) + int(np.count_nonzero(high))
+            if self.events is not None:
+                for hit, wall in zip((low, high), walls):
+                    self.events.extend(WALL_HIT, np.flatnonzero(hit), wall)
+            v[low] = np.abs(v[low])
+            v[high] = -np.abs(v[high])
+
+    def tick(self, ticks: int = 1, checkCollision: bool = True):
+        "advance `ticks` whole ticks of 1/TICK_RATE s"
+        if not isinstance(ticks, int):
+            raise TypeError(f"{self.__class__.__qualname__} ticks a whole number of ticks, got {ticks!r}")
+        for _ in range(ticks):
+            self.move_paddles_fixed()
+            self.passive_speed_modification()
+            self.score_updates_all()
+            self.state[:, :2] += self.state[:, 2:]
+            for j in range(len(self.paddles)):
+                self.paddle_collision_all(j)
+            self.wall_collision_all()
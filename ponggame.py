@@ -5,11 +5,16 @@ import time
 from random import randint
 
 from element import Element
-from pong import Pong
+from events import SCORED, EventBuffer
+from pong import PYTHON_ENGINE, Pong, engine_class
 from pyg import Screen, load_and_scale, load_texture, TEXTURE_ROUTES, LOG_ROUTES
 from pygcontext import PygContext
 from pygtext import Text
-from unsafe_vector import V, Vector
+from replay import Recorder
+from simulation import DEFAULT_STEP, Simulation
+from vector import V, Vector, V_UNIT_X, V_UNIT_Y, V_ZERO
+
+V_UP, V_DOWN, V_LEFT, V_RIGHT = -V_UNIT_Y, V_UNIT_Y, -V_UNIT_X, V_UNIT_X
 
 class Display(Screen):
     _size = Pong.pageSize
@@ -45,6 +50,8 @@ class PongGameContext(PygContext):
     BallType: type = Ball
     last: float
     ballCount: int = 800
+    # one of pong.ENGINES, see pong.engine_class
+    engine: str = PYTHON_ENGINE
     
     ponger: Pong = Pong()
     background: BlackBackground
@@ -53,16 +60,26 @@ class PongGameContext(PygContext):
     score: Vector
     scoreboard: Scoreboard
     dt: float = 0
+    # seconds per game tick, however fast frames arrive
+    step: float = DEFAULT_STEP
+    simulation: Simulation
+    # when set, every tick is recorded and saved here as a replay on exit
+    replayPath: str = None
+    recorder: Recorder = None
 
     def start(self):
         super().start()
         self.exitCode = 0
         self.last = time.time()
         self.ponger.create_game_balls(self.ballCount)
+        if self.replayPath:
+            self.recorder = Recorder(self.ponger)
+        self.ponger.events = EventBuffer()
+        self.simulation = Simulation(self.recorder or self.ponger, self.step)
         self.background = BlackBackground(self.screen)
         self.balls = [self.BallType(self.screen, pos) for pos in self.ponger.balls]
         self.paddles = [Paddle(self.screen, self.ponger.paddles[i]) for i in range(2)]
-        self.score = V(0, 0)
+        self.score = V_ZERO
         self.scoreboard = Scoreboard(self.screen, self.ponger.pageSize.vx / 2 + self.ponger.pageSize.vy / 8)
         self.scoreboard.text = f"  {0}  :  {0}  "
         self.scoreboard.pos = self.scoreboard.pos - (self.scoreboard.size.vx / 2)
@@ -85,48 +102,54 @@ class PongGameContext(PygContext):
     def handle_input(self, dt: float):
         keys = self.screen.keys
         if all((i not in keys) for i in (119, 115, 97, 100)):
-            self.tend_paddle(0, V(0, 0), dt)
+            self.tend_paddle(0, V_ZERO, dt)
         else:
             if 119 in keys: # w
-                self.tend_paddle(0, V(0, -1), dt)
+                self.tend_paddle(0, V_UP, dt)
             if 115 in keys: # s
-                self.tend_paddle(0, V(0, 1), dt)
+                self.tend_paddle(0, V_DOWN, dt)
             if 97 in keys:
-                self.tend_paddle(0, V(-1, 0), dt)
+                self.tend_paddle(0, V_LEFT, dt)
             if 100 in keys:
-                self.tend_paddle(0, V(1, 0), dt)
+                self.tend_paddle(0, V_RIGHT, dt)
         if all(i not in keys for i in (1073741906, 1073741905, 1073741904, 1073741903)):
-            self.tend_paddle(1, V(0, 0), dt)
+            self.tend_paddle(1, V_ZERO, dt)
         else:
             if 1073741906 in keys: # up arrow
-                self.tend_paddle(1, V(0, -1), dt)
+                self.tend_paddle(1, V_UP, dt)
             if 1073741905 in keys: # down arrow
-                self.tend_paddle(1, V(0, 1), dt)
+                self.tend_paddle(1, V_DOWN, dt)
             if 1073741904 in keys: # left arrow
-                self.tend_paddle(1, V(-1, 0), dt)
+                self.tend_paddle(1, V_LEFT, dt)
             if 1073741903 in keys: # right arrow
-                self.tend_paddle(1, V(1, 0), dt)
+                self.tend_paddle(1, V_RIGHT, dt)
 
     def key_down(self, k: int):
         if 32 in self.screen.keys:
             self.screen.done = True
             self.exitCode = 1
 
-    def handle_scoreboard(self):
-        if self.score != self.ponger.score:
-            s1, s2 = str(self.ponger.score.y), str(self.ponger.score.x)
-            s1, s2 = s1.rjust(4, " "), s2.ljust(4, " ")
-            self.scoreboard.text = f"  {s1}  :  {s2}  "
-            self.scoreboard.pos = (self.ponger.pageSize.vx / 2 + self.ponger.pageSize.vy / 8) - (self.scoreboard.size.vx / 2)
-            self.score = self.ponger.score
+    def handle_scoreboard(self, events: EventBuffer):
+        if not events.count(SCORED):
+            return
+        s1, s2 = str(self.ponger.score.y), str(self.ponger.score.x)
+        s1, s2 = s1.rjust(4, " "), s2.ljust(4, " ")
+        self.scoreboard.text = f"  {s1}  :  {s2}  "
+        self.scoreboard.pos = (self.ponger.pageSize.vx / 2 + self.ponger.pageSize.vy / 8) - (self.scoreboard.size.vx / 2)
+        self.score = self.ponger.score
 
     def handle_tick(self) -> float:
         ctime = time.time()
         dt = ctime - self.last
         self.last = ctime
-        self.ponger.tick(dt)
+        self.simulation.advance(dt)
         return dt
 
+    def __exit__(self, execls, exeins, tb):
+        super().__exit__(execls, exeins, tb)
+        if self.recorder is not None:
+            self.recorder.replay.save(self.replayPath)
+
     def handle_elements(self):
         for i, ball in enumerate(self.ponger.balls):
             self.balls[i].pos = ball
@@ -136,8 +159,9 @@ class PongGameContext(PygContext):
 
     def update(self):
         self.handle_input(self.dt)
-        self.handle_scoreboard()
         self.dt = self.handle_tick()
+        # everything that happened over this frame's ticks
+        self.handle_scoreboard(self.ponger.events.drain())
         self.handle_elements()
 
 def main(d: bool = True):
@@ -146,14 +170,14 @@ def main(d: bool = True):
     screen = Display()
     while True:
         ta = PongGameContext(screen)
-        ta.ponger = Pong()
+        ta.ponger = engine_class(ta.engine)()
         ta.game_pong()
         with ta:
             screen.run(2000, 2000)
         if ta.exitCode == 0:
             break
         tb = PongGameContext(screen)
-        tb.ponger = Pong()
+        tb.ponger = engine_class(tb.engine)()
         tb.game_pogn()
         with tb:
             screen.run(2000, 2000)
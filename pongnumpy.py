@@ -0,0 +1,173 @@
+
+from __future__ import annotations
+
+import numpy as np
+
+from events import BALL_HIT, BOTTOM_WALL, LEFT_WALL, PADDLE_HIT, RIGHT_WALL, SCORED, TOP_WALL, WALL_HIT
+from pong import Pong
+from vector import VA, V, Vector, VectorArray
+
+__all__ = ["NumpyPong", "BALL"]
+
+# one record per ball; pos and vel are (x, y) pairs so state["pos"] is an (N, 2) view
+BALL = np.dtype([("pos", np.float64, (2,)), ("vel", np.float64, (2,))])
+
+def pair(vector: Vector) -> np.ndarray:
+    return np.array((vector._x, vector._y), dtype=np.float64)
+
+class NumpyPong(Pong):
+    """
+    Pong with every per-ball stage of tick run as one numpy operation
+    over all the balls at once, for games of 100k+ balls.
+
+    Ball positions and velocities live in the structured array .state
+    (fields pos and vel). .balls and .ballVelocities hand back
+    VectorArray copies of those fields and accept any sequence of
+    Vectors. Paddles are few, so they stay MutableVectors moved by
+    Pong.move_paddles.
+
+    Stages follow Pong.tick step for step, including the order random
+    start speeds are drawn in, so a seeded NumpyPong tracks a seeded
+    Pong exactly.
+    """
+
+    state: np.ndarray
+
+    @property
+    def balls(self) -> VectorArray:
+        return VA(self.state["pos"])
+
+    @balls.setter
+    def balls(self, balls):
+        self._resize(len(balls))
+        self.state["pos"] = VA.from_vectors(balls)._data
+
+    @property
+    def ballVelocities(self) -> VectorArray:
+        return VA(self.state["vel"])
+
+    @ballVelocities.setter
+    def ballVelocities(self, velocities):
+        self._resize(len(velocities))
+        self.state["vel"] = VA.from_vectors(velocities)._data
+
+    def _resize(self, ballCount: int):
+        if getattr(self, "state", None) is None or len(self.state) != ballCount:
+            self.state = np.zeros(ballCount, dtype=BALL)
+
+    def pack_balls(self) -> np.ndarray:
+        # state rows are already x, y, dx, dy
+        return self.state.view(np.float64).ravel()
+
+    def unpack_balls(self, flat):
+        self._resize(len(flat) // 4)
+        self.state.view(np.float64).ravel()[:] = np.frombuffer(flat, dtype=np.float64)
+
+    def add_balls(self, ballCount: int):
+        self.state = np.zeros(ballCount, dtype=BALL)
+        self.state["pos"] = pair(self.ballStartLocation)
+        self.state["vel"] = self.random_ball_start_speeds(ballCount)._data
+
+    def passive_speed_modification(self):
+        vel = self.state["vel"]
+        # Vector.signs tests the rounded components: round(c) >= 0 exactly when c >= -0.5
+        signs = np.where(vel >= -0.5, 1.0, -1.0)
+        speed = np.abs(vel)
+        speed += (pair(self.ballIdealSpeed) - speed) * self.ballReturnToIdealFactor
+        np.multiply(speed, signs, out=vel)
+
+    def score_updates_all(self):
+        pos = self.state["pos"]
+        x = np.rint(pos[:, 0])
+        left = x < self.config.scoreLow
+        right = x > self.config.scoreHigh
+        scored = np.flatnonzero(left | right)
+        if scored.size == 0:
+            return
+        pos[scored] = pair(self.ballStartLocation)
+        if self.events is not None:
+            self.events.extend(SCORED, scored, right[scored])
+        self.restart(scored, int(np.count_nonzero(left)), int(np.count_nonzero(right)))
+
+    def restart(self, scored: np.ndarray, left: int, right: int):
+        "count the points and give the balls at indices `scored` new start speeds"
+        self.score = self.score + V(left, right)
+        # drawn one ball at a time in index order, as Pong does
+        self.state["vel"][scored] = [tuple(self.random_ball_start_speed()) for _ in scored]
+
+    def paddle_collision_all(self, j: int):
+        pos, vel = self.state["pos"], self.state["vel"]
+        rect = self.paddleRects[j]
+        bw, bh = self.config.ballW, self.config.ballH
+        hit = np.flatnonzero(
+            (pos[:, 0] <= rect.x1) & (rect.x0 <= pos[:, 0] + bw)
+            & (pos[:, 1] <= rect.y1) & (rect.y0 <= pos[:, 1] + bh))
+        if hit.size == 0:
+            return
+        self.paddleHits += int(hit.size)
+        if self.events is not None:
+            self.events.extend(PADDLE_HIT, hit, j)
+        velocity = (vel[hit] + pair(self.paddleInput[j] * self.paddleMaxSpeed * self.paddleFriction)) * pair(self.ballBumpMultiplier)
+        vx, vy = velocity[:, 0], velocity[:, 1]
+        # collision.hit_side over every ball that hit
+        x, y = pos[hit, 0], pos[hit, 1]
+        left, right = x + bw - rect.x0, rect.x1 - x
+        top, bottom = y + bh - rect.y0, rect.y1 - y
+        depthX, depthY = np.minimum(left, right), np.minimum(top, bottom)
+        sideX = depthX < depthY
+        vel[hit, 0] = np.where(sideX, np.where(left <= right, -np.abs(vx), np.abs(vx)), vx)
+        vel[hit, 1] = np.where(sideX, vy, np.where(top <= bottom, -np.abs(vy), np.abs(vy)))
+
+    def wall_collision_all(self):
+        pos, vel = self.state["pos"], self.state["vel"]
+        for axis, limit, walls in ((1, self.config.wallY, (TOP_WALL, BOTTOM_WALL)),
+                (0, self.config.wallX, (LEFT_WALL, RIGHT_WALL))):
+            c = np.rint(pos[:, axis])
+            v = vel[:, axis]
+            low, high = c < 0, c > limit
+            self.wallHits += int(np.count_nonzero(low)) + int(np.count_nonzero(high))
+            if self.events is not None:
+                for hit, wall in zip((low, high), walls):
+                    self.events.extend(WALL_HIT, np.flatnonzero(hit), wall)
+            v[low] = np.abs(v[low])
+            v[high] = -np.abs(v[high])
+
+    def ball_collisions(self):
+        # pairs must be resolved one after another in the order Pong uses, so
+        # this runs Pong's loop over plain lists and writes the velocities back
+        pos, vel = self.state["pos"], self.state["vel"]
+        xs, ys = pos[:, 0].tolist(), pos[:, 1].tolist()
+        pairs = self.ballSweep.pairs(xs, ys, self.ballSize)
+        if not pairs:
+            return
+        vxs, vys = vel[:, 0].tolist(), vel[:, 1].tolist()
+        w, h = self.config.ballW, self.config.ballH
+        for i, j in pairs:
+            dx, dy = xs[j] - xs[i], ys[j] - ys[i]
+            if w - abs(dx) < h - abs(dy):
+                if (vxs[i] - vxs[j]) * dx > 0:
+                    vxs[i], vxs[j] = vxs[j], vxs[i]
+                else:
+                    continue
+            elif (vys[i] - vys[j]) * dy > 0:
+                vys[i], vys[j] = vys[j], vys[i]
+            else:
+                continue
+            self.ballHits += 1
+            if self.events is not None:
+                self.events.add(BALL_HIT, i, j)
+        vel[:, 0] = vxs
+        vel[:, 1] = vys
+
+    def tick(self, dt: float, checkCollision: bool = True):
+        self.move_paddles(dt)
+        self.place_paddle_rects()
+        self.passive_speed_modification()
+        self.score_updates_all()
+        pos = self.state["pos"]
+        pos += self.state["vel"] * dt
+        for j in range(len(self.paddles)):
+            self.paddle_collision_all(j)
+        self.wall_collision_all()
+        if self.ballCollision:
+            self.ball_collisions()
@@ -15,7 +15,7 @@ from element import Element
 from pygcontext import PygContext
 from pyserve.lib.logdumps import *
 from render import Render
-from unsafe_vector import A, Angle, V, Vector
+from vector import A, Angle, AngleKey, DEGREE, V, Vector, VectorKey
 
 # event codes. VSCODE doesn't recognise pygame.<event_name> properly so they're relisted here.
 MMOTION, KDOWN, KUP, MBDOWN, MBUP, QUIT = 1024, 768, 769, 1025, 1026, 256
@@ -86,11 +86,25 @@ def load_texture(route: str, offset: Vector = V(0, 0)) -> Render:
         log(f"File not found: {route}")
         raise
 
+# the cached loaders below are keyed on VectorKey/AngleKey rather than the
+# Vector/Angle they're called with: scale snaps to 1/64 so the float noise of a
+# resize still hits the cache, rotation snaps to whole degrees, and each key's
+# hash is computed once instead of on every lookup
+SCALE_QUANTUM = 1 / 64
+ROTATION_QUANTUM = DEGREE
+
+def load_and_scale(route: str, scale: Vector, offset: Vector = V(0, 0)) -> Render:
+    return _load_and_scale(route, VectorKey.from_vector(scale, SCALE_QUANTUM), VectorKey.from_vector(offset))
+
+def load_and_scale_and_rotate(route: str, scale: Vector, rotation: Angle, offset: Vector = V(0, 0)) -> Render:
+    return _load_and_scale_and_rotate(route, VectorKey.from_vector(scale, SCALE_QUANTUM),
+        AngleKey.from_angle(rotation, ROTATION_QUANTUM), VectorKey.from_vector(offset))
+
 # a large amount of cache is allocated to scaling since lots of scaled draw calls
 # need to be made when the screen chages that are expensive even if most of the
 # objects on screen will have the exact same scale as they had previously
 @lru_cache(maxsize=128)
-def load_and_scale(route: str, scale: Vector, offset: Vector = V(0, 0)) -> Render:
+def _load_and_scale(route: str, scale: VectorKey, offset: VectorKey) -> Render:
     start = load_texture(route, offset).texture
     tSize = V(*start.get_size()) * scale
     clean = pygame.Surface(tSize, SRCALPHA)
@@ -101,9 +115,9 @@ def load_and_scale(route: str, scale: Vector, offset: Vector = V(0, 0)) -> Rende
 # expected that small textures are being rotated and only one at a time, increasing
 # the chance of cache hits and reducing the cost of each cached element
 @lru_cache(maxsize=512)
-def load_and_scale_and_rotate(route: str, scale: Vector, rotation: Angle, offset: Vector = V(0, 0)) -> Render:
-    start = load_and_scale(route, scale, offset).texture
-    return Render(pygame.transform.rotate(start, -rotation.angle), offset)
+def _load_and_scale_and_rotate(route: str, scale: VectorKey, rotation: AngleKey, offset: VectorKey) -> Render:
+    start = _load_and_scale(route, scale, offset).texture
+    return Render(pygame.transform.rotate(start, -rotation.degrees), offset)
 
 # mass loading not cached to reduce redundency
 def load_textures(routes: Sequence[str]) -> tuple[pygame.Surface]:
@@ -39,11 +39,45 @@ class Address:
         return astuple(self)
 
 class Network:
+    # msgpack ExtType registry, filled by register_ext
+    extEncoders: dict[type, tuple[int, Callable[[object], bytes]]] = {}
+    extDecoders: dict[int, Callable[[bytes], object]] = {}
+
+    @staticmethod
+    def register_ext(code: int, cls: type, encode: Callable[[object], bytes], decode: Callable[[bytes], object]):
+        "send instances of <cls> (and subclasses) as msgpack ExtType <code> holding <encode>(instance)"
+        "received ExtTypes with <code> are turned back into objects with <decode>(bytes)"
+        Network.extEncoders[cls] = (code, encode)
+        Network.extDecoders[code] = decode
+
+    @staticmethod
+    def _ext_default(obj: object) -> msgpack.ExtType:
+        for cls in type(obj).__mro__:
+            if cls in Network.extEncoders:
+                code, encode = Network.extEncoders[cls]
+                return msgpack.ExtType(code, encode(obj))
+        raise TypeError(f"can not serialise {obj.__class__.__qualname__} object with msgpack; see Network.register_ext")
+
+    @staticmethod
+    def _ext_hook(code: int, data: bytes) -> object:
+        if code in Network.extDecoders:
+            return Network.extDecoders[code](data)
+        return msgpack.ExtType(code, data)
+
+    @staticmethod
+    def msgdumps(data: dict) -> bytes:
+        "msgpack <data>, encoding registered ExtTypes"
+        return msgpack.dumps(data, default=Network._ext_default)
+
+    @staticmethod
+    def msgloads(raw: bytes) -> dict:
+        "unpack msgpack <raw>, decoding registered ExtTypes"
+        return msgpack.loads(raw, ext_hook=Network._ext_hook)
 
     @staticmethod
     def msgsend(socket: sockets.socket, data: dict):
         "serialises and sends <data> over <socket> using msgpack"
-        serialised = msgpack.dumps(data)
+        serialised = Network.msgdumps(data)
         packet = struct.pack(BYTE_COUNT_ENCODING, len(serialised)) + serialised
         socket.send(packet)
 
@@ -65,7 +99,7 @@ class Network:
             raw = socket.recv(length)
         else:
             return None
-        data = msgpack.loads(raw)
+        data = Network.msgloads(raw)
         return data
 
     @staticmethod
@@ -5,7 +5,18 @@ import random
 import time
 import unittest
 
-from lib import Server, Address, Queue, FixedQueue, Client
+from lib import Server, Address, Queue, FixedQueue, Client, Network
+
+class Pair:
+    def __init__(self, a: int, b: int):
+        self.a, self.b = a, b
+
+    def encode(self) -> bytes:
+        return bytes((self.a, self.b))
+
+    @staticmethod
+    def decode(data: bytes) -> Pair:
+        return Pair(*data)
 
 class PyReturn(Server):
     def handle_request(self, addr: Address, data: dict):
@@ -46,6 +57,18 @@ class QueueTests(unittest.TestCase):
         for i in range(3000, 5000):
             self.assertEqual(i, q.dequeue())
 
+class NetworkTests(unittest.TestCase):
+
+    def test_ext_type_round_trip(self):
+        Network.register_ext(42, Pair, Pair.encode, Pair.decode)
+        data = Network.msgloads(Network.msgdumps({"pairs": [Pair(1, 2), Pair(3, 4)], "n": 5}))
+        self.assertEqual([(pair.a, pair.b) for pair in data["pairs"]], [(1, 2), (3, 4)])
+        self.assertEqual(data["n"], 5)
+
+    def test_unregistered_type(self):
+        with self.assertRaises(TypeError):
+            Network.msgdumps({"x": object()})
+
 class FixedQueueTests(unittest.TestCase):
 
     def test_collision_error(self):
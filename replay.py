@@ -0,0 +1,256 @@
+"""
+Input recording and deterministic replay for Pong and Breakout.
+
+    python replay.py record pong -n 800 -t 5000 -o match.replay     record a headless match with scripted inputs
+    python replay.py play match.replay                              re-run it as fast as possible, checking checksums
+    python replay.py play match.replay -e numpy                     ...on another Pong engine
+    python replay.py info match.replay
+
+A replay holds the game's config changes (see config.py) and starting
+snapshot(), then each tick's dt and paddle inputs. Every `interval`
+ticks it also holds a crc32 of the game's snapshot() at that point.
+Every random draw comes from the game's own rng, which is inside the
+snapshot, so playing the inputs back from the start must reproduce
+every checksum exactly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import struct
+import sys
+import time
+import zlib
+from array import array
+from random import Random
+
+import snapshot
+from simulation import DEFAULT_STEP, build
+from vector import V
+
+MAGIC = b"RPLY"
+VERSION = 2
+# magic, version, game id, has seed, seed, checksum interval, paddles, ticks, snapshot length, config length
+HEADER = struct.Struct("<4sHHBxxxqIIIII")
+DEFAULT_INTERVAL = 60
+
+class ReplayError(ValueError):
+    "the bytes given to Replay.frombytes() aren't a replay"
+
+class DesyncError(RuntimeError):
+    "a replayed game's checksum differs from the recorded one"
+
+    def __init__(self, tick: int, expected: int, found: int):
+        super().__init__(f"replay desynced by tick {tick}: checksum {found:08x}, recorded {expected:08x}")
+        self.tick = tick
+        self.expected = expected
+        self.found = found
+
+def checksum(game) -> int:
+    return zlib.crc32(game.snapshot())
+
+class Replay:
+    """
+    A recorded match. config holds the settings the game had changed
+    from its defaults, as config.changes() gives them. steps holds one dt
+    per tick and inputs holds 2 * paddles floats per tick. checksums[k]
+    is taken after tick (k + 1) * interval.
+    """
+
+    game: int
+    seed: int
+    interval: int
+    paddles: int
+    config: dict[str, object]
+    start: bytes
+    steps: array
+    inputs: array
+    checksums: array
+
+    def __init__(self, start: bytes, seed: int = None, interval: int = DEFAULT_INTERVAL, paddles: int = 0,
+            config: dict[str, object] = None):
+        if interval < 1:
+            raise ValueError(f"{self.__class__.__qualname__} checksum interval must be at least 1, got {interval}")
+        self.game = snapshot.HEADER.unpack_from(start)[2]
+        self.seed = seed
+        self.interval = interval
+        self.paddles = paddles
+        self.config = config or {}
+        self.start = start
+        self.steps = array("d")
+        self.inputs = array("d")
+        self.checksums = array("I")
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __repr__(self) -> str:
+        return f"Replay(game={self.game}, seed={self.seed}, ticks={len(self)}, checksums={len(self.checksums)})"
+
+    def tobytes(self) -> bytes:
+        config = json.dumps(self.config, sort_keys=True).encode()
+        body = [config, self.start]
+        for values in (self.steps, self.inputs, self.checksums):
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            body.append(values.tobytes())
+        header = HEADER.pack(MAGIC, VERSION, self.game, self.seed is not None, self.seed or 0,
+            self.interval, self.paddles, len(self), len(self.start), len(config))
+        return header + zlib.compress(b"".join(body))
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> Replay:
+        try:
+            magic, version, game, hasSeed, seed, interval, paddles, ticks, startLength, configLength = HEADER.unpack_from(data)
+            body = zlib.decompress(memoryview(data)[HEADER.size:])
+        except (struct.error, zlib.error) as error:
+            raise ReplayError(f"unreadable replay: {error}") from None
+        if magic != MAGIC or version != VERSION:
+            raise ReplayError(f"not a version {VERSION} replay")
+        try:
+            config = json.loads(body[:configLength])
+        except ValueError as error:
+            raise ReplayError(f"unreadable replay config: {error}") from None
+        offset = configLength + startLength
+        replay = cls(body[configLength:offset], seed if hasSeed else None, interval, paddles, config)
+        for values, count in ((replay.steps, ticks), (replay.inputs, ticks * paddles * 2), (replay.checksums, ticks // interval)):
+            size = count * values.itemsize
+            values.frombytes(body[offset:offset + size])
+            if sys.byteorder == "big":
+                values.byteswap()
+            offset += size
+        if offset != len(body) or replay.game != game:
+            raise ReplayError(f"replay body doesn't match its header")
+        return replay
+
+    def save(self, path: str):
+        with open(path, "wb") as file:
+            file.write(self.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> Replay:
+        with open(path, "rb") as file:
+            return cls.frombytes(file.read())
+
+class Recorder:
+    """
+    Stands in for `game` wherever something calls game.tick(dt), e.g. as
+    the game of a Simulation, and records every tick into .replay.
+    """
+
+    def __init__(self, game, interval: int = DEFAULT_INTERVAL):
+        self.game = game
+        self.replay = Replay(game.snapshot(), getattr(game, "seed", None), interval, len(game.paddles), game.config.changes())
+
+    def tick(self, dt: float):
+        replay = self.replay
+        replay.steps.append(dt)
+        inputs = replay.inputs
+        for direction in self.game.paddleInput:
+            inputs.append(direction._x)
+            inputs.append(direction._y)
+        self.game.tick(dt)
+        if len(replay.steps) % replay.interval == 0:
+            replay.checksums.append(checksum(self.game))
+
+def configure(game, config: dict[str, object]):
+    "give `game` the default config with the recorded changes made"
+    game.config = type(game.config)().replace(**config)
+    return game
+
+def new_game(game: int, config: dict[str, object] = None):
+    "an empty game of the kind snapshot id `game` with `config` changes made, for a replay's start to be restored into"
+    if game == snapshot.PONG:
+        from pong import Pong
+        return configure(Pong(), config or {})
+    if game == snapshot.BREAKOUT:
+        from breakout import Breakout
+        return configure(Breakout(), config or {})
+    raise ReplayError(f"unknown game id {game}")
+
+def play(replay: Replay, game=None, check: bool = True):
+    """
+    Re-run `replay` headless, on `game` when given (any engine that can
+    restore the replay's snapshots) or a new game of the recorded kind,
+    either way with the recorded config.
+    Raises DesyncError at the first checksum that differs when `check`.
+    Returns the game as it stands after the last tick.
+    """
+    game = (new_game(replay.game, replay.config) if game is None else configure(game, replay.config)).restore(replay.start)
+    steps, inputs, checksums = replay.steps, replay.inputs, replay.checksums
+    interval, width = replay.interval, replay.paddles * 2
+    tick = game.tick
+    for t in range(len(steps)):
+        row = width * t
+        game.paddleInput = [V(inputs[row + 2 * j], inputs[row + 2 * j + 1]) for j in range(replay.paddles)]
+        tick(steps[t])
+        if check and (t + 1) % interval == 0:
+            found = checksum(game)
+            expected = checksums[(t + 1) // interval - 1]
+            if found != expected:
+                raise DesyncError(t + 1, expected, found)
+    return game
+
+def scripted_inputs(paddles: int, seed: int = None, hold: int = 30):
+    "an endless stream of paddle inputs, each paddle picking a new direction every `hold` ticks"
+    rng = Random(seed)
+    inputs = [V(0, 0)] * paddles
+    t = 0
+    while True:
+        if t % hold == 0:
+            inputs = [V(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(paddles)]
+        yield inputs
+        t += 1
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record and replay headless matches")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="record a headless match with scripted inputs")
+    record.add_argument("game", choices=("pong", "breakout"))
+    record.add_argument("-o", "--output", required=True)
+    record.add_argument("-n", "--balls", type=int, default=800, help="balls (pong only)")
+    record.add_argument("-t", "--ticks", type=int, default=5000)
+    record.add_argument("-s", "--step", type=float, default=DEFAULT_STEP, help="seconds per tick")
+    record.add_argument("-i", "--interval", type=int, default=DEFAULT_INTERVAL, help="ticks between checksums")
+    record.add_argument("--seed", type=int, default=0)
+    replay = commands.add_parser("play", help="re-run a replay, checking its checksums")
+    replay.add_argument("path")
+    replay.add_argument("-e", "--engine", help="pong engine, see pong.ENGINES")
+    info = commands.add_parser("info", help="describe a replay")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        game = build(args.game, args.balls, seed=args.seed)
+        recorder = Recorder(game, args.interval)
+        inputs = scripted_inputs(len(game.paddles), args.seed)
+        for _ in range(args.ticks):
+            game.paddleInput = next(inputs)
+            recorder.tick(args.step)
+        recorder.replay.save(args.output)
+        print(f"recorded {recorder.replay!r}")
+        return 0
+    loaded = Replay.load(args.path)
+    if args.command == "info":
+        print(f"{loaded!r}, {loaded.paddles} paddles, checksum every {loaded.interval} ticks, "
+            f"{sum(loaded.steps):.2f}s of play, config changes {loaded.config}")
+        return 0
+    game = None
+    if args.engine:
+        from pong import engine_class
+        game = engine_class(args.engine)()
+    start = time.perf_counter()
+    try:
+        play(loaded, game)
+    except DesyncError as error:
+        print(error, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"replayed {len(loaded)} ticks in {elapsed:.3f}s ({len(loaded) / elapsed:,.0f} ticks/s), "
+        f"{len(loaded.checksums)} checksums match")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Plays many independent headless matches in parallel, one per worker task.
+
+    python runner.py pong -m 1000 -t 2000                   1000 seeded Pong matches over every core
+    python runner.py pong -m 200 --set ballBumpMultiplier=1.2,1 --set ballSize=8,8
+    python runner.py pong -m 200 --config fast.json --set ballSize=8,8
+    python runner.py breakout -m 100 -t 20000 -w 4
+
+Each match builds its own game from a MatchSpec (game, seed, config
+overrides, tick budget), so nothing is shared between matches but the
+class defaults. Results stream back as matches finish.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import multiprocessing
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from simulation import DEFAULT_STEP, Simulation, build
+
+GAMES = ("pong", "breakout")
+
+@dataclass(frozen=True)
+class MatchSpec:
+    "everything needed to play one match; picklable so it can go to a worker"
+    game: str = "pong"
+    seed: int = None
+    ticks: int = 1000
+    step: float = DEFAULT_STEP
+    # pong only
+    balls: int = 1
+    engine: str = None
+    # setting name -> value, changed in the game's config before it is set up
+    overrides: dict[str, object] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class MatchResult:
+    index: int
+    spec: MatchSpec
+    # Pong: (left, right) points; Breakout: (blocks destroyed, 0)
+    score: tuple[int, int]
+    paddleHits: int
+    wallHits: int
+    blockHits: int
+    ticks: int
+    seconds: float
+
+    @property
+    def ticksPerSecond(self) -> float:
+        return self.ticks / self.seconds if self.seconds else float("inf")
+
+def apply_overrides(game, overrides: dict[str, object]):
+    "give `game` a config with the overrides made; pairs become Vectors where the default is one"
+    if overrides:
+        game.config = game.config.replace(**overrides)
+
+def play(index: int, spec: MatchSpec) -> MatchResult:
+    "play one match to its tick budget; runs in a worker process"
+    game = build(spec.game, spec.balls, spec.engine, spec.seed, lambda game: apply_overrides(game, spec.overrides))
+    ticks = 0
+    start = time.perf_counter()
+    if spec.game == "breakout":
+        # stop early once every ball is gone
+        while ticks < spec.ticks and any(ball is not None for ball in game.balls):
+            game.tick(spec.step)
+            ticks += 1
+    else:
+        Simulation(game, spec.step).run_headless(spec.ticks)
+        ticks = spec.ticks
+    seconds = time.perf_counter() - start
+    if spec.game == "breakout":
+        score = (sum(block is None for block in game.blocks), 0)
+    else:
+        score = (game.score.x, game.score.y)
+    return MatchResult(index, spec, score, game.paddleHits, game.wallHits, getattr(game, "blockHits", 0), ticks, seconds)
+
+def run_matches(specs: Iterable[MatchSpec], workers: int = None) -> Iterator[MatchResult]:
+    "play every spec across `workers` processes (all cores by default), yielding results as they finish"
+    # forked workers would inherit numba's thread pool half alive if this
+    # process has already run a numba engine, and hang at shutdown
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = [pool.submit(play, index, spec) for index, spec in enumerate(specs)]
+        for future in as_completed(futures):
+            yield future.result()
+
+class Tally:
+    "running totals over finished matches"
+
+    matches: int
+    points: list[int]
+    paddleHits: int
+    wallHits: int
+    blockHits: int
+    ticks: int
+    seconds: float
+
+    def __init__(self):
+        self.matches = 0
+        self.points = [0, 0]
+        self.paddleHits = self.wallHits = self.blockHits = self.ticks = 0
+        self.seconds = 0.
+
+    def add(self, result: MatchResult) -> Tally:
+        self.matches += 1
+        self.points[0] += result.score[0]
+        self.points[1] += result.score[1]
+        self.paddleHits += result.paddleHits
+        self.wallHits += result.wallHits
+        self.blockHits += result.blockHits
+        self.ticks += result.ticks
+        self.seconds += result.seconds
+        return self
+
+    def mean(self, total: float) -> float:
+        return total / self.matches if self.matches else 0.
+
+    def __str__(self) -> str:
+        return (f"{self.matches} matches: score {self.mean(self.points[0]):.2f} : {self.mean(self.points[1]):.2f}, "
+            f"paddle hits {self.mean(self.paddleHits):.1f}, wall hits {self.mean(self.wallHits):.1f}, "
+            f"block hits {self.mean(self.blockHits):.1f}, {self.ticks / self.seconds if self.seconds else 0:,.0f} ticks/s per worker")
+
+def parse_override(text: str) -> tuple[str, object]:
+    "`name=value` with value a Python literal; `1.2,1` is a pair"
+    name, _, value = text.partition("=")
+    if not name or not value:
+        raise argparse.ArgumentTypeError(f"expected name=value, got {text!r}")
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"{value!r} is not a Python literal") from None
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Play many headless matches in parallel")
+    parser.add_argument("game", choices=GAMES)
+    parser.add_argument("-m", "--matches", type=int, default=100)
+    parser.add_argument("-t", "--ticks", type=int, default=1000, help="tick budget per match")
+    parser.add_argument("-s", "--step", type=float, default=DEFAULT_STEP, help="seconds per tick")
+    parser.add_argument("-n", "--balls", type=int, default=1, help="balls per match (pong only)")
+    parser.add_argument("-e", "--engine", help="pong engine, see pong.ENGINES")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes, all cores by default")
+    parser.add_argument("--seed", type=int, default=0, help="match k is seeded with seed + k")
+    parser.add_argument("--config", metavar="FILE", help="JSON object of settings to change for every match, see config.py")
+    parser.add_argument("--set", dest="overrides", type=parse_override, action="append", default=[],
+        metavar="NAME=VALUE", help="override a game setting for every match, after --config")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only print the totals")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    if args.config is not None:
+        # passed on as overrides so the specs stay plain data for the workers
+        with open(args.config) as file:
+            overrides.update(json.load(file))
+    overrides.update(args.overrides)
+    specs = [MatchSpec(args.game, args.seed + k, args.ticks, args.step, args.balls, args.engine, overrides) for k in range(args.matches)]
+    tally = Tally()
+    start = time.perf_counter()
+    for result in run_matches(specs, args.workers):
+        tally.add(result)
+        if not args.quiet:
+            print(f"match {result.index:>5} seed {result.spec.seed}: score {result.score[0]} : {result.score[1]}, "
+                f"{result.paddleHits} paddle hits, {result.ticksPerSecond:,.0f} ticks/s")
+    print(tally)
+    print(f"wall time {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
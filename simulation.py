@@ -0,0 +1,159 @@
+"""
+Fixed timestep driver for the game engines (anything with tick(dt)).
+
+    python simulation.py pong -n 100000 -t 1000             headless: 1000 ticks as fast as possible
+    python simulation.py pong -e numpy -n 100000 -t 1000    ...on another engine (see pong.ENGINES)
+    python simulation.py pong -e event -n 100000 -t 1000    ...only doing work for balls when something happens to them
+    python simulation.py breakout -t 100000 -s 0.01         Breakout with a 10 ms step
+    python simulation.py pong -e numpy -n 5000 --watch      real time, drawn in the terminal
+    python simulation.py pong --config fast.json            settings from a JSON file, see config.py
+
+Nothing here imports pygame, so headless runs work on servers and in tests.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+
+DEFAULT_STEP = 1 / 144
+# at most this many ticks per advance(); past that the backlog is dropped
+# rather than letting a slow frame cause a slower one (the spiral of death)
+DEFAULT_MAX_SUBSTEPS = 8
+
+class Simulation:
+    """
+    Runs `game` in whole ticks of `step` seconds however time arrives.
+
+    advance() banks the real time elapsed since the last frame and ticks
+    the game once per step banked, carrying the remainder over, so the
+    game behaves the same at any frame rate. alpha is how far the
+    leftover time is into the next step, for renderers that interpolate.
+
+    run_headless() skips the clock altogether and ticks back to back.
+    """
+
+    game: object
+    step: float
+    maxSubsteps: int
+    accumulator: float
+    # ticks run and real seconds thrown away by the substep guard, in total
+    ticks: int
+    dropped: float
+
+    def __init__(self, game, step: float = DEFAULT_STEP, maxSubsteps: int = DEFAULT_MAX_SUBSTEPS):
+        if not step > 0:
+            raise ValueError(f"{self.__class__.__qualname__} step must be positive, got {step}")
+        if maxSubsteps < 1:
+            raise ValueError(f"{self.__class__.__qualname__} needs at least one substep, got {maxSubsteps}")
+        self.game = game
+        self.step = step
+        self.maxSubsteps = maxSubsteps
+        self.accumulator = 0.
+        self.ticks = 0
+        self.dropped = 0.
+
+    def __repr__(self) -> str:
+        return f"Simulation({self.game.__class__.__qualname__}, step={self.step}, ticks={self.ticks})"
+
+    def advance(self, elapsed: float) -> int:
+        "bank `elapsed` seconds and run every whole step now due; returns the ticks run"
+        self.accumulator += elapsed
+        step, tick = self.step, self.game.tick
+        count = 0
+        while self.accumulator >= step:
+            if count == self.maxSubsteps:
+                # keep the partial step so alpha stays meaningful
+                kept = self.accumulator % step
+                self.dropped += self.accumulator - kept
+                self.accumulator = kept
+                break
+            tick(step)
+            self.accumulator -= step
+            count += 1
+        self.ticks += count
+        return count
+
+    @property
+    def alpha(self) -> float:
+        return self.accumulator / self.step
+
+    @property
+    def simulatedTime(self) -> float:
+        "simulated seconds so far"
+        return self.ticks * self.step
+
+    def run_headless(self, ticks: int) -> float:
+        "run `ticks` steps back to back; returns ticks per real second"
+        step, tick = self.step, self.game.tick
+        start = time.perf_counter()
+        for _ in range(ticks):
+            tick(step)
+        elapsed = time.perf_counter() - start
+        self.ticks += ticks
+        return ticks / elapsed if elapsed else float("inf")
+
+    def run_realtime(self, seconds: float = None, until: Callable[[], bool] = None,
+            clock: Callable[[], float] = time.perf_counter, sleep: Callable[[float], None] = time.sleep):
+        "tick in step with `clock` for `seconds` (forever if None) or until `until()` is true"
+        start = last = clock()
+        while (seconds is None or last - start < seconds) and not (until and until()):
+            now = clock()
+            self.advance(now - last)
+            last = now
+            # sleep off whatever is left of the current step
+            sleep(max(0., self.step - self.accumulator))
+
+def build(game: str, balls: int, engine: str = None, seed: int = None, configure: Callable[[object], None] = None):
+    """
+    A new game set up to play. `configure` is called on it before the
+    set up, to change settings. Games are imported lazily so each game's
+    logs only appear when it's used.
+    """
+    if game == "pong":
+        from pong import PYTHON_ENGINE, engine_class
+        built = engine_class(engine or PYTHON_ENGINE)(seed)
+        if configure is not None:
+            configure(built)
+        built.create_game_balls(balls)
+        return built
+    if game == "breakout":
+        from breakout import Breakout
+        built = Breakout(seed)
+        if configure is not None:
+            configure(built)
+        built.create_game_normal()
+        return built
+    raise ValueError(f"Unknown game {game!r}, expected 'pong' or 'breakout'")
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a game headless at a fixed timestep")
+    parser.add_argument("game", choices=("pong", "breakout"))
+    parser.add_argument("-n", "--balls", type=int, default=800, help="balls (pong only)")
+    parser.add_argument("-t", "--ticks", type=int, default=1000)
+    parser.add_argument("-s", "--step", type=float, default=DEFAULT_STEP, help="seconds per tick")
+    parser.add_argument("-e", "--engine", help="pong engine, see pong.ENGINES")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--config", metavar="FILE", help="JSON object of settings to change, see config.py")
+    parser.add_argument("--watch", action="store_true", help="run in real time, drawing the game in the terminal")
+    parser.add_argument("--size", type=int, nargs=2, default=(100, 30), metavar=("COLUMNS", "ROWS"), help="terminal cells to --watch in")
+    args = parser.parse_args(argv)
+
+    configure = None
+    if args.config is not None:
+        def configure(game):
+            game.config = type(game.config).load(args.config)
+    simulation = Simulation(build(args.game, args.balls, args.engine, args.seed, configure), args.step)
+    if args.watch:
+        from terminal import watch
+        watch(simulation, *args.size, args.ticks)
+        return 0
+    rate = simulation.run_headless(args.ticks)
+    print(f"{args.ticks} ticks in {args.ticks / rate:.3f}s: {rate:,.1f} ticks/s, "
+        f"{rate * args.step:,.1f}x realtime, score {simulation.game.score}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
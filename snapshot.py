@@ -0,0 +1,121 @@
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from itertools import chain
+from math import isnan, nan
+from random import Random
+
+from vector import MV, V
+
+__all__ = ["PONG", "BREAKOUT", "SnapshotError", "pack", "unpack", "snapshot_vectors", "restore_vectors"]
+
+# Layout, all little endian and 8 byte aligned:
+#   HEADER       magic, version, game, then how many floats, ints and sections follow
+#   counts       one int64 per section: how many vectors it holds
+#   floats       float64 scalars (e.g. the score)
+#   ints         int64 scalars (e.g. hit counters)
+#   RNG          the Mersenne Twister state of the game's rng
+#   sections     float64 x, y pairs (balls, paddles ...); nan, nan stands for None
+MAGIC = b"SNAP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHHHxx")
+# 624 state words and the position, padding, then gauss_next (nan when unset)
+RNG = struct.Struct("<625I4xd")
+RNG_VERSION = 3
+
+# game ids, so a Pong snapshot can't be restored into a Breakout
+PONG = 1
+BREAKOUT = 2
+
+_NONE = (nan, nan)
+
+class SnapshotError(ValueError):
+    "the bytes given to restore() aren't a snapshot of this game"
+
+def snapshot_vectors(vectors) -> array:
+    "vectors as x, y float64 pairs, nan, nan for None"
+    return array("d", chain.from_iterable(_NONE if v is None else (v._x, v._y) for v in vectors))
+
+def restore_vectors(flat, into: list = None, cls: type = V) -> list:
+    """
+    The pairs of `flat` as a list of `cls` (None for nan rows). When
+    `into` is a list of the same length it is updated and returned
+    instead: MutableVectors are set in place, so anything holding them
+    sees the restored values, and equal immutable Vectors are kept.
+    """
+    count = len(flat) // 2
+    reuse = into is not None and len(into) == count
+    out = into if reuse else [None] * count
+    mutable = cls is MV
+    for k in range(count):
+        x, y = flat[2 * k], flat[2 * k + 1]
+        old = out[k]
+        if isnan(x):
+            out[k] = None
+        elif old is None or not reuse:
+            out[k] = cls(x, y)
+        elif mutable:
+            old.set(x, y)
+        elif old._x != x or old._y != y:
+            out[k] = cls(x, y)
+    return out
+
+def pack(game: int, floats, ints, rng: Random, sections) -> bytes:
+    "`sections` are contiguous buffers of float64 pairs: snapshot_vectors() arrays or numpy arrays"
+    _, words, gauss = rng.getstate()
+    scalars = struct.Struct(f"<{len(sections)}q{len(floats)}d{len(ints)}q")
+    offset = HEADER.size + scalars.size + RNG.size
+    # one buffer of the final size, each section copied into it once
+    data = bytearray(offset + 8 * sum(len(section) for section in sections))
+    HEADER.pack_into(data, 0, MAGIC, VERSION, game, len(floats), len(ints), len(sections))
+    scalars.pack_into(data, HEADER.size, *(len(section) // 2 for section in sections), *floats, *ints)
+    RNG.pack_into(data, HEADER.size + scalars.size, *words, nan if gauss is None else gauss)
+    for section in sections:
+        if sys.byteorder == "big":
+            section = array("d", section)
+            section.byteswap()
+        size = 8 * len(section)
+        data[offset:offset + size] = memoryview(section).cast("B")
+        offset += size
+    return bytes(data)
+
+def unpack(data, game: int, rng: Random) -> tuple[tuple[float, ...], tuple[int, ...], list]:
+    """
+    Check `data` is a snapshot of `game`, set `rng` to its state and
+    return (floats, ints, sections). Sections are float64 memoryviews
+    over `data` (copies on big endian machines).
+    """
+    view = memoryview(data)
+    try:
+        magic, version, found, floatCount, intCount, sectionCount = HEADER.unpack_from(view)
+    except struct.error:
+        raise SnapshotError(f"snapshot too short ({len(view)} bytes)") from None
+    if magic != MAGIC or version != VERSION:
+        raise SnapshotError(f"not a version {VERSION} snapshot")
+    if found != game:
+        raise SnapshotError(f"snapshot is of game {found}, expected {game}")
+    scalars = struct.Struct(f"<{sectionCount}q{floatCount}d{intCount}q")
+    try:
+        values = scalars.unpack_from(view, HEADER.size)
+        *words, gauss = RNG.unpack_from(view, HEADER.size + scalars.size)
+    except struct.error:
+        raise SnapshotError(f"snapshot too short ({len(view)} bytes)") from None
+    offset = HEADER.size + scalars.size + RNG.size
+    counts = values[:sectionCount]
+    floats = values[sectionCount:sectionCount + floatCount]
+    ints = values[sectionCount + floatCount:]
+    if offset + 16 * sum(counts) != len(view):
+        raise SnapshotError(f"snapshot is {len(view)} bytes, its header describes {offset + 16 * sum(counts)}")
+    rng.setstate((RNG_VERSION, tuple(words), None if isnan(gauss) else gauss))
+    sections = []
+    for count in counts:
+        section = view[offset:offset + 16 * count].cast("d")
+        if sys.byteorder == "big":
+            section = array("d", section)
+            section.byteswap()
+        sections.append(section)
+        offset += 16 * count
+    return floats, ints, sections
@@ -0,0 +1,177 @@
+
+from __future__ import annotations
+
+import sys
+import time
+from math import ceil, floor
+
+__all__ = ["Raster", "TerminalRenderer", "watch"]
+
+BLANK = ord(" ")
+BALL = ord("B")
+PADDLE = ord("P")
+BLOCK = ord("#")
+
+def ball_positions(game) -> tuple[list[float], list[float]]:
+    "xs, ys of every ball still in play"
+    if hasattr(game, "pack_balls"):
+        # Pong and its engines: x, y, dx, dy per ball in one flat buffer
+        flat = game.pack_balls()
+        return flat[0::4].tolist(), flat[1::4].tolist()
+    balls = [ball for ball in game.balls if ball is not None]
+    return [ball._x for ball in balls], [ball._y for ball in balls]
+
+class Raster:
+    """
+    A width x height grid of characters a game's page is drawn onto.
+
+    draw() scatters each entity into the grid: it marks every cell the
+    entity's box overlaps, so a frame costs one step per entity (plus
+    the cells big ones cover) however big the grid is. Blocks go down
+    first, then paddles, then balls on top.
+
+    .rows: list[bytearray], one per line
+    """
+
+    width: int
+    height: int
+    rows: list[bytearray]
+
+    __slots__ = ["width", "height", "rows", "_blank"]
+
+    def __init__(self, width: int, height: int):
+        if width < 1 or height < 1:
+            raise ValueError(f"{self.__class__.__qualname__} needs at least one cell, got {width}x{height}")
+        self.width, self.height = width, height
+        self._blank = bytes([BLANK]) * width
+        self.rows = [bytearray(self._blank) for _ in range(height)]
+
+    def __repr__(self) -> str:
+        return f"Raster({self.width}, {self.height})"
+
+    def __str__(self) -> str:
+        return "\n".join(row.decode("ascii") for row in self.rows)
+
+    def clear(self):
+        for row in self.rows:
+            row[:] = self._blank
+
+    def fill(self, x0: float, y0: float, x1: float, y1: float, char: int):
+        "mark every cell overlapping the box x0, y0 to x1, y1, given in cells"
+        cx0, cy0 = max(floor(x0), 0), max(floor(y0), 0)
+        cx1, cy1 = min(ceil(x1), self.width), min(ceil(y1), self.height)
+        if cx0 >= cx1:
+            return
+        run = bytes([char]) * (cx1 - cx0)
+        for cy in range(cy0, cy1):
+            self.rows[cy][cx0:cx1] = run
+
+    def scatter(self, xs: list[float], ys: list[float], w: float, h: float, char: int):
+        "fill() for many boxes of one size, with the common case of a box inside one cell done inline"
+        rows, width, height = self.rows, self.width, self.height
+        for x, y in zip(xs, ys):
+            cx, cy = floor(x), floor(y)
+            if cx + 1 >= x + w and cy + 1 >= y + h and 0 <= cx < width and 0 <= cy < height:
+                rows[cy][cx] = char
+            else:
+                self.fill(x, y, x + w, y + h, char)
+
+    def draw(self, game) -> Raster:
+        "clear, then scatter `game`'s blocks, paddles and balls in, scaled from its pageSize"
+        self.clear()
+        sx, sy = self.width / game.pageSize._x, self.height / game.pageSize._y
+        blocks = getattr(game, "blocks", ())
+        if blocks:
+            bw, bh = game.blockSize._x * sx, game.blockSize._y * sy
+            for block in blocks:
+                if block is not None:
+                    self.fill(block._x * sx, block._y * sy, block._x * sx + bw, block._y * sy + bh, BLOCK)
+        pw, ph = game.paddleSize._x * sx, game.paddleSize._y * sy
+        for paddle in game.paddles:
+            self.fill(paddle._x * sx, paddle._y * sy, paddle._x * sx + pw, paddle._y * sy + ph, PADDLE)
+        xs, ys = ball_positions(game)
+        self.scatter([x * sx for x in xs], [y * sy for y in ys], game.ballSize._x * sx, game.ballSize._y * sy, BALL)
+        return self
+
+class TerminalRenderer:
+    """
+    Shows Rasters on an ANSI terminal, writing only what changed.
+
+    The first frame (and any frame of a new size) clears the screen and
+    is written whole. After that each row is compared with the last
+    frame's, and each run of changed cells goes out as a cursor move
+    (ESC [ row ; column H) followed by the new characters, so a still
+    frame costs nothing and a busy one costs about the cells that moved.
+    """
+
+    stream: object
+    previous: list[bytes]
+    # unchanged stretches shorter than this are resent: cheaper than another cursor move
+    gap: int = 8
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.previous = None
+
+    def __enter__(self) -> TerminalRenderer:
+        return self
+
+    def __exit__(self, *earg):
+        self.close()
+
+    def render(self, raster: Raster) -> int:
+        "bring the terminal up to date with `raster`; returns the characters written"
+        rows, previous = raster.rows, self.previous
+        out = []
+        if previous is None or len(previous) != len(rows) or len(previous[0]) != len(rows[0]):
+            # hide the cursor and clear the screen
+            out.append("\x1b[?25l\x1b[2J")
+            for y, row in enumerate(rows):
+                out.append(f"\x1b[{y + 1};1H{row.decode('ascii')}")
+        else:
+            gap = self.gap
+            for y, (row, old) in enumerate(zip(rows, previous)):
+                if row == old:
+                    continue
+                start = end = None
+                for x, (new, was) in enumerate(zip(row, old)):
+                    if new == was:
+                        continue
+                    if start is not None and x - end > gap:
+                        out.append(f"\x1b[{y + 1};{start + 1}H{row[start:end].decode('ascii')}")
+                        start = None
+                    if start is None:
+                        start = x
+                    end = x + 1
+                out.append(f"\x1b[{y + 1};{start + 1}H{row[start:end].decode('ascii')}")
+        self.previous = [bytes(row) for row in rows]
+        if not out:
+            return 0
+        text = "".join(out)
+        self.stream.write(text)
+        self.stream.flush()
+        return len(text)
+
+    def close(self):
+        "put the cursor back, below the last frame"
+        if self.previous is not None:
+            self.stream.write(f"\x1b[{len(self.previous) + 1};1H\x1b[?25h")
+            self.stream.flush()
+        self.previous = None
+
+def watch(simulation, width: int = 100, height: int = 30, ticks: int = None, frameRate: float = 30):
+    """
+    Run `simulation` in real time, drawing its game to the terminal
+    `frameRate` times a second until it has run `ticks` ticks (forever
+    if None). For watching headless games, e.g. over SSH.
+    """
+    raster = Raster(width, height)
+    frame = 1 / frameRate
+    last = time.perf_counter()
+    with TerminalRenderer() as renderer:
+        while ticks is None or simulation.ticks < ticks:
+            now = time.perf_counter()
+            simulation.advance(now - last)
+            last = now
+            renderer.render(raster.draw(simulation.game))
+            time.sleep(max(0., frame - (time.perf_counter() - now)))
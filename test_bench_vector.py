@@ -0,0 +1,49 @@
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+import bench_vector
+
+class BenchTests(unittest.TestCase):
+
+    def test_every_suite_covers_every_operation(self):
+        for name, suite in bench_vector.suites().items():
+            self.assertEqual(set(suite), set(bench_vector.OPERATIONS), name)
+            for op, (func, weight) in suite.items():
+                func()
+                self.assertGreaterEqual(weight, 1)
+
+    def test_run_filters_and_measures(self):
+        results = bench_vector.run(seconds=0.001, repeat=1, only="fast.add")
+        self.assertEqual(list(results), ["fast.add"])
+        self.assertGreater(results["fast.add"], 0)
+
+    def test_compare(self):
+        baseline = {"fast.add": 100., "fast.mul": 100., "gone.op": 1.}
+        results = {"fast.add": 85., "fast.mul": 95., "new.op": 1.}
+        regressions = bench_vector.compare(baseline, results, tolerance=10)
+        self.assertEqual([key for key, *_ in regressions], ["fast.add"])
+        self.assertAlmostEqual(regressions[0][3], -15)
+        self.assertEqual(bench_vector.compare(baseline, results, tolerance=20), [])
+
+    def test_baseline_mode_exit_code(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "baseline.json")
+            args = ["-s", "0.001", "-r", "1", "-k", "tuple.add"]
+            self.assertEqual(bench_vector.main(args + ["-o", path]), 0)
+            with open(path) as file:
+                saved = json.load(file)
+            self.assertIn("meta", saved)
+            # pretend the baseline was a hundred times faster
+            saved["results"]["tuple.add"] *= 100
+            with open(path, "w") as file:
+                json.dump(saved, file)
+            self.assertEqual(bench_vector.main(args + ["-b", path]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
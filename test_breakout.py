@@ -0,0 +1,51 @@
+
+from __future__ import annotations
+
+import unittest
+
+from breakout import Breakout
+from test_pong import ALLOCATION_ALLOWANCE, DT, TICKS, measure_tick_allocation
+from vector import V
+
+class BreakoutTests(unittest.TestCase):
+
+    def setUp(self):
+        self.breakout = Breakout(seed=1)
+        self.breakout.create_game_normal()
+
+    def test_tick_allocates_nothing_per_ball(self):
+        self.breakout.paddleInput = [V(1, 0)]
+        for _ in range(5):
+            self.breakout.tick(DT)
+        retained, peak = measure_tick_allocation(self.breakout, TICKS)
+        self.assertLess(retained, ALLOCATION_ALLOWANCE)
+        self.assertLess(peak, ALLOCATION_ALLOWANCE)
+
+    def test_ball_destroyed_at_bottom(self):
+        self.breakout.balls[0].set(100, self.breakout.pageSize._y)
+        self.breakout.tick(DT)
+        self.assertIsNone(self.breakout.balls[0])
+
+    def test_block_sides(self):
+        # a block well away from the paddle, on its own
+        j = 50
+        block = self.breakout.blocks[j]
+        self.breakout.blocks = [b if k == j else None for k, b in enumerate(self.breakout.blocks)]
+        ball, velocity = self.breakout.balls[0], self.breakout.ballVelocities[0]
+        # into the left side: the ball's move overlaps the block by 1 across and 16 down
+        ball.set(block.x - 6.5, block.y + 10)
+        velocity.set(90, 0)
+        self.breakout.tick(DT)
+        self.assertIsNone(self.breakout.blocks[j])
+        self.assertLess(velocity.x, 0)
+        # into the underside, just inside the block's left edge
+        self.breakout.blocks[j] = block
+        ball.set(block.x - 2, block.y + self.breakout.blockSize.y + 0.5)
+        velocity.set(10, -90)
+        self.breakout.tick(DT)
+        self.assertIsNone(self.breakout.blocks[j])
+        self.assertGreater(velocity.y, 0)
+        self.assertGreater(velocity.x, 0)
+
+if __name__ == "__main__":
+    unittest.main()
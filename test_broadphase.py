@@ -0,0 +1,91 @@
+
+from __future__ import annotations
+
+import unittest
+from random import Random
+
+from broadphase import SpatialHash, SweepAndPrune
+from vector import Rect, V
+
+class SpatialHashTests(unittest.TestCase):
+
+    def setUp(self):
+        rng = Random(2)
+        self.size = V(6, 6)
+        self.rects = [Rect.from_vectors(V(rng.uniform(-200, 1500), rng.uniform(-200, 1000)), V(16, 70)) for _ in range(64)]
+        self.balls = [Rect.from_vectors(V(rng.uniform(-250, 1550), rng.uniform(-250, 1050)), self.size) for _ in range(20000)]
+
+    def test_finds_every_overlap(self):
+        for cellSize in (10, 76, 300, 5000):
+            grid = SpatialHash(cellSize)
+            grid.rebuild(self.rects, self.size)
+            for ball in self.balls:
+                found = [j for j in grid.query_rect(ball) if ball.overlaps(self.rects[j])]
+                expected = [j for j, rect in enumerate(self.rects) if ball.overlaps(rect)]
+                self.assertEqual(found, expected)
+
+    def test_edges_are_inclusive(self):
+        grid = SpatialHash(8)
+        paddle = Rect(16, 16, 32, 86)
+        grid.rebuild([paddle], self.size)
+        # corners touching the paddle from outside, as Rect.overlaps counts them
+        for x, y in ((10, 10), (32, 86), (10, 86), (32, 10)):
+            self.assertEqual(list(grid.query_point(x, y)), [0])
+        self.assertEqual(list(grid.query_point(0, 0)), [])
+
+    def test_candidates_are_few(self):
+        grid = SpatialHash(76)
+        grid.rebuild(self.rects, self.size)
+        average = sum(len(grid.query_rect(ball)) for ball in self.balls) / len(self.balls)
+        self.assertLess(average, 4)
+
+    def test_rebuild_forgets_old_positions(self):
+        grid = SpatialHash(50)
+        grid.rebuild([Rect(0, 0, 10, 10)], self.size)
+        grid.rebuild([Rect(500, 500, 510, 510)], self.size)
+        self.assertEqual(list(grid.query_point(5, 5)), [])
+        self.assertEqual(list(grid.query_point(505, 505)), [0])
+
+    def test_invalid_cell_size(self):
+        with self.assertRaises(ValueError):
+            SpatialHash(0)
+
+class SweepAndPruneTests(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = Random(5)
+        self.size = V(6, 6)
+        self.xs = [self.rng.uniform(0, 400) for _ in range(2000)]
+        self.ys = [self.rng.uniform(0, 300) for _ in range(2000)]
+
+    def brute_force(self) -> set[frozenset[int]]:
+        w, h = self.size
+        return {frozenset((i, j)) for i in range(len(self.xs)) for j in range(i + 1, len(self.xs))
+            if abs(self.xs[i] - self.xs[j]) < w and abs(self.ys[i] - self.ys[j]) < h}
+
+    def test_finds_every_overlap_as_movers_move(self):
+        sweep = SweepAndPrune()
+        for _ in range(4):
+            pairs = sweep.pairs(self.xs, self.ys, self.size)
+            self.assertEqual(len(pairs), len(set(map(frozenset, pairs))))
+            self.assertEqual(set(map(frozenset, pairs)), self.brute_force())
+            self.xs = [x + self.rng.uniform(-3, 3) for x in self.xs]
+            self.ys = [y + self.rng.uniform(-3, 3) for y in self.ys]
+
+    def test_order_depends_only_on_positions(self):
+        sweep = SweepAndPrune()
+        sweep.sort(self.xs)
+        # shuffle the movers far, with plenty of exact ties
+        self.xs = [float(self.rng.randrange(20)) for _ in self.xs]
+        coherent = list(sweep.sort(self.xs))
+        self.assertEqual(coherent, SweepAndPrune().sort(self.xs))
+        self.assertEqual(coherent, sorted(range(len(self.xs)), key=lambda i: (self.xs[i], i)))
+
+    def test_touching_is_not_overlapping(self):
+        sweep = SweepAndPrune()
+        self.assertEqual(sweep.pairs([0, 6, 3], [0, 0, 6], self.size), [])
+        self.assertEqual(sweep.pairs([0, 5.5, 3], [0, 0, 6], self.size), [(0, 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
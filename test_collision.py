@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import unittest
+
+from collision import BOTTOM, LEFT, RIGHT, TOP, hit_side, reflect, sweep, sweep_bounds
+
+# a 10x10 box at the origin
+BOX = (0, 0, 10, 10)
+
+class SweepTests(unittest.TestCase):
+
+    def test_faces(self):
+        self.assertEqual(sweep(-20, 0, 20, 0, 4, 4, *BOX), (0.8, LEFT))
+        self.assertEqual(sweep(20, 0, -20, 0, 4, 4, *BOX), (0.5, RIGHT))
+        self.assertEqual(sweep(0, -20, 0, 20, 4, 4, *BOX), (0.8, TOP))
+        self.assertEqual(sweep(0, 20, 0, -20, 4, 4, *BOX), (0.5, BOTTOM))
+
+    def test_passing_through(self):
+        # a move many times the box size still finds the contact
+        self.assertEqual(sweep(-1000, 3, 2000, 0, 4, 4, *BOX), (0.498, LEFT))
+
+    def test_misses(self):
+        self.assertIsNone(sweep(-20, 20, 40, 0, 4, 4, *BOX))
+        self.assertIsNone(sweep(-20, 0, 10, 0, 4, 4, *BOX))
+        self.assertIsNone(sweep(-20, 0, -10, 0, 4, 4, *BOX))
+        self.assertIsNone(sweep(-20, 0, 0, 0, 4, 4, *BOX))
+
+    def test_touching_counts(self):
+        self.assertEqual(sweep(-20, 0, 16, 0, 4, 4, *BOX), (1, LEFT))
+        self.assertEqual(sweep(-4, 0, 5, 0, 4, 4, *BOX), (0, LEFT))
+
+    def test_overlapping_at_start(self):
+        self.assertIsNone(sweep(2, 2, 5, 0, 4, 4, *BOX))
+
+    def test_diagonal_takes_later_axis(self):
+        t, side = sweep(-14, -20, 20, 20, 4, 4, *BOX)
+        self.assertEqual((t, side), (0.8, TOP))
+
+class BoundsTests(unittest.TestCase):
+
+    def test_walls(self):
+        self.assertEqual(sweep_bounds(5, 50, -10, 0, 0, 0, 100, 100), (0.5, RIGHT))
+        self.assertEqual(sweep_bounds(95, 50, 10, 0, 0, 0, 100, 100), (0.5, LEFT))
+        self.assertEqual(sweep_bounds(50, 5, 0, -10, 0, 0, 100, 100), (0.5, BOTTOM))
+        self.assertEqual(sweep_bounds(50, 95, 0, 10, 0, 0, 100, 100), (0.5, TOP))
+
+    def test_corner_takes_first(self):
+        self.assertEqual(sweep_bounds(5, 2, -10, -10, 0, 0, 100, 100), (0.2, BOTTOM))
+
+    def test_inside_and_outside(self):
+        self.assertIsNone(sweep_bounds(50, 50, 10, 10, 0, 0, 100, 100))
+        self.assertIsNone(sweep_bounds(-5, 50, -10, 0, 0, 0, 100, 100))
+
+class HitSideTests(unittest.TestCase):
+
+    def test_faces(self):
+        self.assertEqual(hit_side(-3, 3, 4, 4, *BOX), LEFT)
+        self.assertEqual(hit_side(9, 3, 4, 4, *BOX), RIGHT)
+        self.assertEqual(hit_side(3, -3, 4, 4, *BOX), TOP)
+        self.assertEqual(hit_side(3, 9, 4, 4, *BOX), BOTTOM)
+
+    def test_touching(self):
+        # edges touching is an overlap of depth 0
+        self.assertEqual(hit_side(-4, 3, 4, 4, *BOX), LEFT)
+        self.assertEqual(hit_side(3, 10, 4, 4, *BOX), BOTTOM)
+
+    def test_corners(self):
+        # the shallower axis wins, whatever the box's aspect
+        self.assertEqual(hit_side(-3, -1, 4, 4, 0, 0, 100, 10), LEFT)
+        self.assertEqual(hit_side(-1, -3, 4, 4, 0, 0, 10, 100), TOP)
+        self.assertEqual(hit_side(99.5, 8, 4, 4, 0, 0, 100, 10), RIGHT)
+
+    def test_ties(self):
+        # equal depth on both axes goes to the top or bottom face
+        self.assertEqual(hit_side(-2, -2, 4, 4, *BOX), TOP)
+        self.assertEqual(hit_side(8, 8, 4, 4, *BOX), BOTTOM)
+        # centred in the box: top over bottom, left over right
+        self.assertEqual(hit_side(3, 3, 4, 4, *BOX), TOP)
+        self.assertEqual(hit_side(3, 0, 4, 10, *BOX), LEFT)
+
+    def test_mover_bigger_than_box(self):
+        # the box pokes 2 into the mover's top edge or its left edge
+        self.assertEqual(hit_side(-10, 8, 30, 30, *BOX), BOTTOM)
+        self.assertEqual(hit_side(8, -10, 30, 30, *BOX), RIGHT)
+
+class ReflectTests(unittest.TestCase):
+
+    def test_reflect(self):
+        self.assertEqual(reflect(3, 4, TOP), (3, -4))
+        self.assertEqual(reflect(3, -4, BOTTOM), (3, 4))
+        self.assertEqual(reflect(3, 4, LEFT), (-3, 4))
+        self.assertEqual(reflect(-3, 4, RIGHT), (3, 4))
+        self.assertEqual(reflect(-3, 4, LEFT), (-3, 4))
+
+if __name__ == "__main__":
+    unittest.main()
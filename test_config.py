@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import tempfile
+import unittest
+
+from breakout import Breakout
+from config import BreakoutConfig, PongConfig
+from pong import Pong
+from pongaccelerated import AcceleratedPong
+from pongnumpy import NumpyPong
+from vector import V
+
+DT = 1 / 60
+
+class PongConfigTests(unittest.TestCase):
+
+    def test_derived(self):
+        config = PongConfig()
+        self.assertEqual(config.scoreLow, 10)
+        self.assertEqual(config.scoreHigh, 1500 - 10 - 6)
+        self.assertEqual((config.wallX, config.wallY), (1494, 994))
+        self.assertEqual((config.ballRangeX, config.ballRangeY), (1494., 994.))
+        self.assertEqual(config.paddleBoundsRight, (V(1000, 0), V(1500 - 10 - 16, 1000 - 70)))
+
+    def test_replace_works_derived_out_again(self):
+        config = PongConfig().replace(ballSize=(10, 10), pageSize=V(800, 600))
+        self.assertEqual(config.ballSize, V(10, 10))
+        self.assertEqual((config.wallX, config.wallY), (790, 590))
+        self.assertEqual(PongConfig().wallX, 1494)
+
+    def test_immutable(self):
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            PongConfig().ballSize = V(1, 1)
+
+    def test_unknown_setting(self):
+        with self.assertRaises(ValueError):
+            PongConfig().replace(ballColour=3)
+        with self.assertRaises(ValueError):
+            PongConfig().replace(wallX=3)
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "config.json")
+            with open(path, "w") as file:
+                json.dump({"ballIdealSpeed": [20, 15], "ballCollision": True}, file)
+            config = PongConfig.load(path)
+            self.assertEqual(config, PongConfig(ballIdealSpeed=V(20, 15), ballCollision=True))
+            with open(path, "w") as file:
+                json.dump([1, 2], file)
+            with self.assertRaises(ValueError):
+                PongConfig.load(path)
+
+    def test_changes(self):
+        self.assertEqual(PongConfig().changes(), {})
+        config = PongConfig().replace(ballSize=(8, 8), maxBounces=2)
+        self.assertEqual(config.changes(), {"ballSize": [8, 8], "maxBounces": 2})
+        self.assertEqual(PongConfig().replace(**json.loads(json.dumps(config.changes()))), config)
+
+class SettingTests(unittest.TestCase):
+
+    def test_class_reads_defaults(self):
+        self.assertEqual(Pong.ballSize, PongConfig().ballSize)
+        self.assertEqual(Breakout.paddleSize, BreakoutConfig().paddleSize)
+
+    def test_set_on_a_game_does_not_leak(self):
+        pong, other = Pong(), Pong()
+        pong.ballSize = (10, 10)
+        self.assertEqual(pong.ballSize, V(10, 10))
+        self.assertEqual(pong.config.wallX, 1490)
+        self.assertEqual(other.ballSize, V(6, 6))
+        self.assertIs(Pong.config, other.config)
+
+    def test_two_configs_in_one_process(self):
+        # the same seed under different configs, each engine agreeing with Pong's
+        slow = PongConfig(ballIdealSpeed=V(20, 15), paddleSize=V(30, 120))
+        for config in (PongConfig(), slow):
+            played = []
+            for cls in (Pong, NumpyPong, AcceleratedPong):
+                pong = cls(seed=4, config=config)
+                pong.create_game_balls(50)
+                for tick in range(300):
+                    pong.paddleInput = [V(0, 1), V(0, -1)] if tick % 100 < 50 else [V(0, -1), V(0, 1)]
+                    pong.tick(DT)
+                played.append((pong.score, pong.paddleHits, pong.wallHits, bytes(pong.pack_balls())))
+            self.assertEqual(played[1], played[0])
+            self.assertEqual(played[2], played[0])
+
+    def test_breakout(self):
+        breakout = Breakout(seed=2, config=BreakoutConfig(paddleSize=V(300, 24)))
+        breakout.create_game_normal()
+        self.assertEqual(breakout.paddleBounds[1], V(1500 - 300, 1000 - 20 - 24))
+        for _ in range(600):
+            breakout.tick(DT)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from breakout import Breakout
+from events import (BALL_HIT, BALL_LOST, BLOCK_DESTROYED, LEFT_WALL, PADDLE_HIT, SCORED, TOP_WALL, WALL_HIT,
+    EventBuffer)
+from pong import Pong
+from pongaccelerated import AcceleratedPong
+from pongnumpy import NumpyPong
+from vector import MV, V
+
+DT = 1 / 60
+
+def inputs(tick: int) -> list[V]:
+    direction = V(0, ((tick // 50) % 3) - 1)
+    return [direction, -direction]
+
+class EventBufferTests(unittest.TestCase):
+
+    def test_add_and_drain(self):
+        events = EventBuffer()
+        events.add(SCORED, 3, 1)
+        events.add(WALL_HIT, 4, TOP_WALL)
+        drained = events.drain()
+        self.assertEqual(len(events), 0)
+        self.assertEqual(list(drained), [(SCORED, 3, 1), (WALL_HIT, 4, TOP_WALL)])
+        events.add(BALL_LOST, 0)
+        self.assertEqual(list(events.drain()), [(BALL_LOST, 0, 0)])
+        self.assertEqual(len(drained), 2)
+
+    def test_extend(self):
+        events = EventBuffer()
+        events.extend(PADDLE_HIT, [1, 2], 0)
+        events.extend(WALL_HIT, np.array([5, 6]), np.array([LEFT_WALL, TOP_WALL]))
+        events.extend(SCORED, np.array([7]), np.array([True]))
+        events.extend(SCORED, [], 0)
+        self.assertEqual(list(events), [(PADDLE_HIT, 1, 0), (PADDLE_HIT, 2, 0),
+            (WALL_HIT, 5, LEFT_WALL), (WALL_HIT, 6, TOP_WALL), (SCORED, 7, 1)])
+        self.assertEqual(events.count(PADDLE_HIT), 2)
+        self.assertEqual(events.select(WALL_HIT), [(5, LEFT_WALL), (6, TOP_WALL)])
+
+class PongEventTests(unittest.TestCase):
+
+    def play(self, cls: type, ticks: int = 900) -> list[Counter]:
+        "each tick's events of a seeded game, as multisets"
+        pong = cls(seed=3)
+        pong.ballCollision = True
+        pong.create_game_balls(300)
+        pong.events = EventBuffer()
+        played = []
+        for tick in range(ticks):
+            pong.paddleInput = inputs(tick)
+            pong.tick(DT)
+            played.append(Counter(pong.events.drain()))
+        kinds = Counter()
+        for events in played:
+            for (kind, _, _), count in events.items():
+                kinds[kind] += count
+        self.assertEqual(kinds[PADDLE_HIT], pong.paddleHits)
+        self.assertEqual(kinds[WALL_HIT], pong.wallHits)
+        self.assertEqual(kinds[SCORED], pong.score.x + pong.score.y)
+        return played
+
+    def test_counts_match(self):
+        ticks = self.play(Pong)
+        kinds = Counter(kind for t in ticks for kind, _, _ in t.elements())
+        self.assertGreater(kinds[PADDLE_HIT], 0)
+        self.assertGreater(kinds[SCORED], 0)
+        self.assertGreater(kinds[BALL_HIT], 0)
+
+    def test_engines_agree(self):
+        python = self.play(Pong)
+        self.assertEqual(self.play(NumpyPong), python)
+        # collide() doesn't report ball hits
+        accelerated = self.play(AcceleratedPong)
+        self.assertEqual(accelerated, [Counter({k: n for k, n in t.items() if k[0] != BALL_HIT}) for t in python])
+
+    def test_many_paddles(self):
+        # more paddles than fit one 64 bit word of hit flags
+        played = []
+        for cls in (Pong, AcceleratedPong):
+            pong = cls(seed=5)
+            pong.create_game_balls(2000)
+            # two overlapping columns of 36, one each side of the start
+            pong.paddles = [MV(x, y) for x in (400, 1060) for y in range(0, 931, 26)]
+            pong.paddleInput = [V(0, 0)] * len(pong.paddles)
+            pong.events = EventBuffer()
+            for _ in range(180):
+                pong.tick(DT)
+            played.append((Counter(pong.events), pong.paddleHits))
+        (python, hits), (accelerated, _) = played
+        self.assertEqual(accelerated, python)
+        self.assertGreater(len({j for kind, _, j in python if kind == PADDLE_HIT and j >= 64}), 0)
+        self.assertEqual(sum(n for (kind, _, _), n in python.items() if kind == PADDLE_HIT), hits)
+
+    def test_off_by_default(self):
+        pong = Pong(seed=3)
+        pong.create_game_balls(10)
+        pong.tick(DT)
+        self.assertIsNone(pong.events)
+
+    def test_swept_walls(self):
+        pong = Pong(seed=1)
+        pong.continuousCollision = True
+        pong.create_game_balls(1)
+        pong.events = EventBuffer()
+        pong.balls[0].set(700, 20)
+        pong.ballVelocities[0].set(0, -1000)
+        pong.tick(0.1)
+        self.assertEqual(list(pong.events), [(WALL_HIT, 0, TOP_WALL)])
+
+class BreakoutEventTests(unittest.TestCase):
+
+    def test_blocks_and_lost_balls(self):
+        breakout = Breakout(seed=2)
+        breakout.create_game_normal()
+        breakout.ballVelocities[0].imul(4)
+        breakout.events = EventBuffer()
+        drained = EventBuffer()
+        for _ in range(3000):
+            breakout.tick(DT)
+            for row in breakout.events.drain():
+                drained.add(*row)
+        destroyed = [j for _, j in drained.select(BLOCK_DESTROYED)]
+        self.assertGreater(len(destroyed), 0)
+        self.assertEqual(sorted(destroyed), [j for j, block in enumerate(breakout.blocks) if block is None])
+        self.assertEqual(drained.count(BALL_LOST), sum(ball is None for ball in breakout.balls))
+        self.assertEqual(drained.count(PADDLE_HIT), breakout.paddleHits)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+
+from breakoutfixed import FixedBreakout
+from config import PongConfig
+from events import BLOCK_DESTROYED, PADDLE_HIT, SCORED, WALL_HIT, EventBuffer
+from fixedpoint import ONE, TICK_RATE, ease, from_fixed, from_fixed_speed, pong_units, to_fixed, to_fixed_speed
+from pongfixed import FixedPong
+from vector import V
+
+def inputs(tick: int) -> list[V]:
+    direction = V(0, ((tick // 50) % 3) - 1)
+    return [direction, -direction]
+
+def follow(game: FixedBreakout):
+    "steer the paddle under the ball"
+    offset = game.balls[0]._x - (game.paddles[0]._x + game.paddleSize._x / 2)
+    game.paddleInput = [V(max(-1., min(1., offset / 20)), 0)]
+
+class UnitTests(unittest.TestCase):
+
+    def test_round_trip(self):
+        for value in (0, 1, -1, 12345, -(1 << 26)):
+            self.assertEqual(to_fixed(from_fixed(value)), value)
+            self.assertEqual(to_fixed_speed(from_fixed_speed(value)), value)
+        self.assertEqual(to_fixed(1.5), 3 * ONE // 2)
+        self.assertEqual(from_fixed_speed(ONE), TICK_RATE)
+
+    def test_ease(self):
+        self.assertEqual(ease(100, 200, ONE // 2), 150)
+        self.assertEqual(ease(-100, 200, ONE // 2), -150)
+        self.assertEqual(ease(300, 200, ONE // 2), 250)
+        self.assertEqual(ease(200, 200, ONE // 4), 200)
+        self.assertEqual(ease(-100, 200, 0), -100)
+
+    def test_units_cached(self):
+        self.assertIs(pong_units(PongConfig()), pong_units(PongConfig()))
+        self.assertEqual(pong_units(PongConfig(ballSize=V(10, 20))).ballH, 20 * ONE)
+
+class FixedPongTests(unittest.TestCase):
+
+    def play(self, game: FixedPong, ticks: int, start: int = 0) -> FixedPong:
+        for tick in range(start, start + ticks):
+            game.paddleInput = inputs(tick)
+            game.tick(1)
+        return game
+
+    def test_deterministic(self):
+        played = []
+        for _ in range(2):
+            pong = FixedPong(seed=5)
+            pong.create_game_balls(300)
+            played.append(self.play(pong, TICK_RATE * 6))
+        first, second = played
+        self.assertEqual(first.state.dtype, np.int32)
+        self.assertTrue(np.array_equal(first.state, second.state))
+        self.assertEqual(first.score, second.score)
+        self.assertGreater(first.paddleHits, 0)
+
+    def test_whole_ticks(self):
+        pong = FixedPong(seed=1)
+        pong.create_game_balls(3)
+        with self.assertRaises(TypeError):
+            pong.tick(1 / TICK_RATE)
+        pong.tick(3)
+
+    def test_events(self):
+        pong = FixedPong(seed=6)
+        pong.create_game_balls(200)
+        pong.events = EventBuffer()
+        self.play(pong, TICK_RATE * 6)
+        self.assertEqual(pong.events.count(PADDLE_HIT), pong.paddleHits)
+        self.assertEqual(pong.events.count(WALL_HIT), pong.wallHits)
+        self.assertEqual(pong.events.count(SCORED), pong.score.x + pong.score.y)
+
+    def test_snapshot_round_trip(self):
+        pong = FixedPong(seed=7)
+        pong.create_game_balls(100)
+        self.play(pong, 300)
+        data = pong.snapshot()
+        copy, again = FixedPong().restore(data), FixedPong().restore(data)
+        self.assertTrue(np.array_equal(copy.state, pong.state))
+        for game in (pong, copy, again):
+            self.play(game, 300, 300)
+        self.assertEqual(copy.score, pong.score)
+        self.assertTrue(np.array_equal(copy.state, pong.state))
+        self.assertTrue(np.array_equal(again.state, pong.state))
+
+class FixedBreakoutTests(unittest.TestCase):
+
+    def play(self, game: FixedBreakout, ticks: int) -> FixedBreakout:
+        for _ in range(ticks):
+            if game.balls[0] is None:
+                break
+            follow(game)
+            game.tick(1)
+        return game
+
+    def new_game(self, seed: int) -> FixedBreakout:
+        game = FixedBreakout(seed=seed)
+        game.create_game_normal()
+        game.ballVelocities[0].imul(3)
+        return game
+
+    def test_deterministic(self):
+        first, second = (self.play(self.new_game(2), TICK_RATE * 30) for _ in range(2))
+        self.assertEqual(first.balls, second.balls)
+        self.assertEqual(first.ballVelocities, second.ballVelocities)
+        self.assertEqual((first.blockHits, first.paddleHits), (second.blockHits, second.paddleHits))
+        self.assertGreater(first.blockHits, 0)
+        self.assertGreater(first.paddleHits, 0)
+
+    def test_blocks(self):
+        game = self.new_game(2)
+        game.events = EventBuffer()
+        self.play(game, TICK_RATE * 30)
+        self.assertEqual(game.events.count(BLOCK_DESTROYED), game.blockHits)
+        self.assertEqual(game.events.count(PADDLE_HIT), game.paddleHits)
+        self.assertEqual(game.standing.tolist(), [block is not None for block in game.blocks])
+        self.assertEqual(int(np.count_nonzero(~game.standing)), game.blockHits)
+
+    def test_snapshot_round_trip(self):
+        game = self.play(self.new_game(3), TICK_RATE * 10)
+        copy = FixedBreakout().restore(game.snapshot())
+        self.assertEqual(copy.balls, game.balls)
+        self.assertEqual(copy.ballVelocities, game.ballVelocities)
+        self.assertTrue(np.array_equal(copy.standing, game.standing))
+        for played in (game, copy):
+            self.play(played, TICK_RATE * 10)
+        self.assertEqual(copy.balls, game.balls)
+        self.assertEqual(copy.blockHits, game.blockHits)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+
+from __future__ import annotations
+
+import tracemalloc
+import unittest
+
+from pong import ENGINES, SERVER_STEP, SWEPT_ENGINES, Pong, PongServer, unpack_vector_sequence
+from pyserve import Network
+from simulation import DEFAULT_STEP, Simulation
+from vector import MutableVector, PackedVectors, V, VectorArray
+
+BALL_COUNT = 800
+TICKS = 50
+DT = 1 / 144
+# bytes of traced memory a whole batch of ticks may briefly hold; a single
+# Vector per ball per tick would need hundreds of kilobytes
+ALLOCATION_ALLOWANCE = 4096
+
+def measure_tick_allocation(game, ticks: int) -> tuple[int, int]:
+    "returns (retained, peak) bytes allocated over `ticks` calls to game.tick"
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(ticks):
+            game.tick(DT)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current - start, peak - start
+
+class PongTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pong = Pong(seed=1)
+        self.pong.create_game_balls(BALL_COUNT)
+
+    def test_state_is_mutable_and_unshared(self):
+        self.assertTrue(all(isinstance(ball, MutableVector) for ball in self.pong.balls))
+        self.assertEqual(len({id(ball) for ball in self.pong.balls}), BALL_COUNT)
+        self.assertEqual(self.pong.balls[0], self.pong.ballStartLocation)
+
+    def test_tick_allocates_nothing_per_ball(self):
+        self.pong.paddleInput = [V(0, 1), V(0, -1)]
+        # warm up lazily created helpers
+        for _ in range(5):
+            self.pong.tick(DT)
+        retained, peak = measure_tick_allocation(self.pong, TICKS)
+        self.assertLess(retained, ALLOCATION_ALLOWANCE)
+        self.assertLess(peak, ALLOCATION_ALLOWANCE)
+
+    def test_seed_reproduces_game(self):
+        other = Pong(seed=1)
+        other.create_game_balls(BALL_COUNT)
+        self.assertEqual(self.pong.ballVelocities, other.ballVelocities)
+        for _ in range(200):
+            self.pong.tick(DT)
+            other.tick(DT)
+        self.assertEqual(self.pong.balls, other.balls)
+        self.assertEqual(self.pong.score, other.score)
+
+    def test_batched_start_speeds_in_range(self):
+        pong = Pong(seed=4)
+        lo = pong.ballStartSpeed * pong.ballSpeedLow * pong.ballSpeedRNGScale
+        hi = pong.ballStartSpeed * pong.ballSpeedHigh * pong.ballSpeedRNGScale
+        speeds = pong.random_ball_start_speeds(5000)
+        self.assertTrue(all(abs(speed).inside(lo, hi) for speed in speeds))
+        self.assertEqual({speed.signs() for speed in map(V.from_vector, speeds)}, {V(1, 1), V(1, -1), V(-1, 1), V(-1, -1)})
+
+    def test_state_round_trips_over_msgpack(self):
+        message = {"BALLS": PackedVectors.from_vectors(self.pong.balls), "ARRAY": VectorArray.from_vectors(self.pong.balls)}
+        data = Network.msgloads(Network.msgdumps(message))
+        balls = unpack_vector_sequence(data["BALLS"])
+        self.assertEqual(balls, self.pong.balls)
+        self.assertTrue(all(isinstance(ball, MutableVector) for ball in balls))
+        self.assertEqual(data["ARRAY"].to_vectors(), self.pong.balls)
+
+    def test_paddles_stay_in_bounds(self):
+        self.pong.paddleInput = [V(-1, -1), V(1, 1)]
+        for _ in range(2000):
+            self.pong.tick(DT)
+        left, right = self.pong.paddles
+        self.assertTrue(left.inside(*self.pong.paddleBoundsLeft))
+        self.assertTrue(right.inside(*self.pong.paddleBoundsRight))
+
+    def test_paddle_sides(self):
+        pong = Pong(seed=1)
+        pong.create_game_balls(1)
+        paddle, ball, velocity = pong.paddles[0], pong.balls[0], pong.ballVelocities[0]
+        # onto the top end, just in from the paddle's face
+        ball.set(paddle.x + 13, paddle.y - 6.5)
+        velocity.set(-30, 144)
+        pong.tick(DT)
+        self.assertEqual(pong.paddleHits, 1)
+        self.assertLess(velocity.y, 0)
+        self.assertLess(velocity.x, 0)
+        # into the face, level with the top end
+        ball.set(paddle.x + pong.paddleSize.x + 1, paddle.y - 3)
+        velocity.set(-288, 0)
+        pong.tick(DT)
+        self.assertEqual(pong.paddleHits, 2)
+        self.assertGreater(velocity.x, 0)
+
+class ContinuousCollisionTests(unittest.TestCase):
+
+    def fire(self, continuous: bool, dt: float = 0.1) -> Pong:
+        "one ball fired left at the left paddle fast enough to cross it in one step"
+        pong = Pong(seed=1)
+        pong.continuousCollision = continuous
+        pong.create_game_balls(1)
+        paddle = pong.paddles[0]
+        pong.balls[0].set(paddle.x + 220, paddle.y + 30)
+        pong.ballVelocities[0].set(-3000, 0)
+        pong.tick(dt)
+        return pong
+
+    def test_discrete_tunnels(self):
+        pong = self.fire(False)
+        self.assertLess(pong.balls[0].x, pong.paddles[0].x)
+        self.assertLess(pong.ballVelocities[0].x, 0)
+
+    def test_swept_bounces_off_paddle(self):
+        pong = self.fire(True)
+        ball, paddle = pong.balls[0], pong.paddles[0]
+        self.assertGreater(ball.x, paddle.x + pong.paddleSize.x)
+        self.assertGreater(pong.ballVelocities[0].x, 0)
+        # the rest of the step after the contact is spent moving away at the bumped speed
+        self.assertGreater(ball.x, paddle.x + pong.paddleSize.x + 100)
+
+    def test_swept_bounces_off_walls(self):
+        pong = Pong(seed=1)
+        pong.continuousCollision = True
+        pong.create_game_balls(1)
+        pong.balls[0].set(700, 20)
+        pong.ballVelocities[0].set(0, -1000)
+        pong.tick(0.1)
+        self.assertGreaterEqual(pong.balls[0].y, 0)
+        self.assertGreater(pong.ballVelocities[0].y, 0)
+
+    def test_small_steps_match_discrete(self):
+        swept = Pong(seed=1)
+        swept.continuousCollision = True
+        swept.create_game_balls(BALL_COUNT)
+        discrete = Pong(seed=1)
+        discrete.create_game_balls(BALL_COUNT)
+        for _ in range(300):
+            swept.tick(DT)
+            discrete.tick(DT)
+        # bounces land a fraction of a step apart, but the games stay alike
+        self.assertEqual(swept.score, discrete.score)
+
+    def test_server_engines_do_not_tunnel(self):
+        for engine in ENGINES:
+            with self.subTest(engine):
+                # start() without binding a socket
+                server = PongServer.__new__(PongServer)
+                server.engine = engine
+                server.start()
+                pong = server.ponger
+                self.assertEqual(pong.continuousCollision, engine in SWEPT_ENGINES)
+                self.assertEqual(server.step, SERVER_STEP if engine in SWEPT_ENGINES else DEFAULT_STEP)
+                # as fire(): fast enough to cross the paddle in one SERVER_STEP
+                paddle = pong.paddles[0]
+                pong.balls = [MutableVector(paddle.x + 220, paddle.y + 30)]
+                pong.ballVelocities = [MutableVector(-3000, 0)]
+                Simulation(pong, server.step).run_headless(round(0.1 / server.step))
+                self.assertEqual(pong.paddleHits, 1)
+                self.assertEqual(pong.score, V(0, 0))
+
+class BallCollisionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pong = Pong(seed=1)
+        self.pong.ballCollision = True
+        self.pong.create_game_balls(2)
+
+    def place(self, *rows: tuple[float, float, float, float]):
+        for ball, velocity, (x, y, dx, dy) in zip(self.pong.balls, self.pong.ballVelocities, rows):
+            ball.set(x, y)
+            velocity.set(dx, dy)
+
+    def test_head_on_swaps_velocities(self):
+        self.place((700, 500, 100, 10), (705, 501, -50, 20))
+        self.pong.ball_collisions()
+        self.assertEqual(self.pong.ballVelocities, [V(-50, 10), V(100, 20)])
+        self.assertEqual(self.pong.ballHits, 1)
+
+    def test_bounce_along_least_overlap(self):
+        self.place((700, 500, 0, 100), (701, 504, 0, -100))
+        self.pong.ball_collisions()
+        self.assertEqual(self.pong.ballVelocities, [V(0, -100), V(0, 100)])
+
+    def test_separating_balls_pass(self):
+        self.place((700, 500, -100, 0), (705, 500, 100, 0))
+        self.pong.ball_collisions()
+        self.assertEqual(self.pong.ballVelocities, [V(-100, 0), V(100, 0)])
+        self.assertEqual(self.pong.ballHits, 0)
+
+    def test_off_by_default(self):
+        pong = Pong(seed=1)
+        pong.create_game_balls(2)
+        pong.balls[0].set(700, 500)
+        pong.balls[1].set(710, 500)
+        pong.ballVelocities[0].set(100, 0)
+        pong.ballVelocities[1].set(-100, 0)
+        for _ in range(20):
+            pong.tick(DT)
+        self.assertEqual(pong.ballHits, 0)
+        self.assertGreater(pong.ballVelocities[0].x, 0)
+
+    def test_momentum_is_kept(self):
+        pong = Pong(seed=2)
+        pong.ballCollision = True
+        pong.create_game_balls(BALL_COUNT)
+        for ball in pong.balls:
+            ball.set(pong.rng.uniform(0, 300), pong.rng.uniform(0, 200))
+        before = sum(v._x for v in pong.ballVelocities), sum(v._y for v in pong.ballVelocities)
+        pong.ball_collisions()
+        after = sum(v._x for v in pong.ballVelocities), sum(v._y for v in pong.ballVelocities)
+        self.assertGreater(pong.ballHits, 0)
+        self.assertAlmostEqual(after[0], before[0])
+        self.assertAlmostEqual(after[1], before[1])
+
+if __name__ == "__main__":
+    unittest.main()
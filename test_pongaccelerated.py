@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from pong import NUMBA_ENGINE, Pong, engine_class
+from pongaccelerated import AcceleratedPong
+from vector import V
+
+BALL_COUNT = 300
+TICKS = 1500
+DT = 1 / 60
+# the kernels use the same float operations in the same order as Pong, so
+# this only leaves room for libm differences between numba and CPython
+TOLERANCE = 1e-6
+
+def inputs(tick: int):
+    "paddles sweep up, stop, then sweep down, in opposite directions"
+    direction = V(0, ((tick // 50) % 3) - 1)
+    return [direction, -direction]
+
+def rows(vectors) -> np.ndarray:
+    return np.array([(vector._x, vector._y) for vector in vectors])
+
+class AcceleratedPongTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pong = Pong(seed=3)
+        self.pong.create_game_balls(BALL_COUNT)
+        self.accelerated = AcceleratedPong(seed=3)
+        self.accelerated.create_game_balls(BALL_COUNT)
+
+    def test_trajectories_match(self):
+        for tick in range(TICKS):
+            self.pong.paddleInput = self.accelerated.paddleInput = inputs(tick)
+            self.pong.tick(DT)
+            self.accelerated.tick(DT)
+            np.testing.assert_allclose(self.accelerated.state["pos"], rows(self.pong.balls), atol=TOLERANCE, err_msg=f"positions at tick {tick}")
+            np.testing.assert_allclose(self.accelerated.state["vel"], rows(self.pong.ballVelocities), atol=TOLERANCE, err_msg=f"velocities at tick {tick}")
+        self.assertEqual(self.accelerated.score, self.pong.score)
+        self.assertEqual((self.accelerated.paddleHits, self.accelerated.wallHits), (self.pong.paddleHits, self.pong.wallHits))
+        self.assertGreater(self.accelerated.score.x + self.accelerated.score.y, 0)
+
+    def test_ball_collisions_match(self):
+        for ball in self.pong.balls:
+            ball.set(self.pong.rng.uniform(0, 300), self.pong.rng.uniform(0, 200))
+        self.accelerated.restore(self.pong.snapshot())
+        self.pong.ballCollision = self.accelerated.ballCollision = True
+        for tick in range(300):
+            self.pong.paddleInput = self.accelerated.paddleInput = inputs(tick)
+            self.pong.tick(DT)
+            self.accelerated.tick(DT)
+        np.testing.assert_allclose(self.accelerated.state["pos"], rows(self.pong.balls), atol=TOLERANCE)
+        np.testing.assert_allclose(self.accelerated.state["vel"], rows(self.pong.ballVelocities), atol=TOLERANCE)
+        self.assertEqual(self.accelerated.ballHits, self.pong.ballHits)
+        self.assertGreater(self.accelerated.ballHits, 0)
+
+    def test_engine_class(self):
+        self.assertIs(engine_class(NUMBA_ENGINE), AcceleratedPong)
+
+    def test_import_does_no_work(self):
+        # importing must neither tick a game nor compile the kernels
+        code = "import pongaccelerated as p; print(len(p.prepare.signatures), len(p.advance.signatures))"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+        self.assertEqual(out[-2:], ["0", "0"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import unittest
+
+from config import PongConfig
+from events import PADDLE_HIT, SCORED, TOP_WALL, WALL_HIT, EventBuffer
+from pong import EVENT_ENGINE, Pong, engine_class
+from pongevent import EventPong
+from vector import V
+
+DT = 1 / 144
+
+def inputs(tick: int) -> list[V]:
+    direction = V(0, ((tick // 50) % 3) - 1)
+    return [direction, -direction]
+
+class EventPongTests(unittest.TestCase):
+
+    def one_ball(self, position: V, velocity: V, config: PongConfig = None) -> EventPong:
+        # no easing toward ballIdealSpeed, so paths are exactly straight
+        pong = EventPong(seed=1, config=config or PongConfig(ballReturnToIdealFactor=0.))
+        pong.create_game_balls(1)
+        pong.events = EventBuffer()
+        pong.balls = [position]
+        pong.ballVelocities = [velocity]
+        return pong
+
+    def test_wall_contact_is_exact(self):
+        pong = self.one_ball(V(700, 20), V(0, -100))
+        for _ in range(5):
+            pong.tick(0.1)
+        self.assertEqual(list(pong.events), [(WALL_HIT, 0, TOP_WALL)])
+        self.assertAlmostEqual(pong.balls[0]._y, 30)
+        self.assertEqual(pong.ballVelocities[0], V(0, 100))
+
+    def test_scoring(self):
+        pong = self.one_ball(V(30, 500), V(-100, 0))
+        pong.tick(0.25)
+        self.assertEqual(pong.score, V(1, 0))
+        self.assertEqual(list(pong.events), [(SCORED, 0, 0)])
+        self.assertLess(abs(pong.balls[0]._x - pong.ballStartLocation._x), 10)
+
+    def test_paddle_bounce(self):
+        pong = self.one_ball(V(0, 0), V(0, 0))
+        paddle = pong.paddles[0]
+        pong.balls = [paddle + V(60, 30)]
+        pong.ballVelocities = [V(-300, 0)]
+        for _ in range(int(0.3 / DT)):
+            pong.tick(DT)
+        self.assertEqual(pong.events.count(PADDLE_HIT), 1)
+        self.assertGreater(pong.ballVelocities[0]._x, 0)
+
+    def test_fast_ball_cannot_tunnel(self):
+        # as ContinuousCollisionTests.fire: fast enough to cross the paddle in one step
+        pong = self.one_ball(V(0, 0), V(0, 0))
+        paddle = pong.paddles[0]
+        pong.balls = [paddle + V(220, 30)]
+        pong.ballVelocities = [V(-3000, 0)]
+        pong.tick(0.1)
+        self.assertEqual(pong.paddleHits, 1)
+        self.assertEqual(pong.score, V(0, 0))
+        self.assertGreater(pong.ballVelocities[0]._x, 0)
+        self.assertGreater(pong.balls[0]._x, paddle._x + pong.paddleSize._x)
+
+    def test_idle_balls_cost_nothing(self):
+        pong = EventPong(seed=2)
+        pong.create_game_balls(2000)
+        for _ in range(144):
+            pong.tick(DT)
+        updates = 0
+        for _ in range(144):
+            pong.tick(DT)
+            updates += pong.updates
+        self.assertLess(updates / 144, 2000 / 10)
+
+    def test_tracks_pong(self):
+        played = []
+        for cls in (Pong, EventPong):
+            pong = cls(seed=3)
+            pong.create_game_balls(200)
+            for tick in range(144 * 8):
+                pong.paddleInput = inputs(tick)
+                pong.tick(DT)
+            played.append(pong)
+        python, event = played
+        scored = python.score.x + python.score.y
+        self.assertAlmostEqual(event.score.x + event.score.y, scored, delta=scored * 0.2)
+        self.assertAlmostEqual(event.wallHits, python.wallHits, delta=python.wallHits * 0.2)
+        self.assertGreater(event.paddleHits, 0)
+
+    def test_snapshot_round_trip(self):
+        pong = engine_class(EVENT_ENGINE)(seed=4)
+        pong.create_game_balls(100)
+        for tick in range(300):
+            pong.paddleInput = inputs(tick)
+            pong.tick(DT)
+        data = pong.snapshot()
+        copy, again = EventPong().restore(data), EventPong().restore(data)
+        self.assertEqual(bytes(copy.pack_balls()), bytes(pong.pack_balls()))
+        for game in (copy, again):
+            for tick in range(300):
+                game.paddleInput = inputs(tick)
+                game.tick(DT)
+        self.assertEqual(again.score, copy.score)
+        self.assertEqual(bytes(again.pack_balls()), bytes(copy.pack_balls()))
+
+if __name__ == "__main__":
+    unittest.main()
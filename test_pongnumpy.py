@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+import unittest
+
+import numpy as np
+
+from pong import NUMPY_ENGINE, PYTHON_ENGINE, Pong, engine_class, pack_vectors
+from pongnumpy import NumpyPong
+from vector import PackedVectors, V, VectorArray
+
+BALL_COUNT = 300
+TICKS = 1500
+DT = 1 / 60
+
+def inputs(tick: int) -> list[V]:
+    "paddles sweep up, stop, then sweep down, in opposite directions"
+    direction = V(0, ((tick // 50) % 3) - 1)
+    return [direction, -direction]
+
+def rows(vectors) -> np.ndarray:
+    return np.array([(vector._x, vector._y) for vector in vectors])
+
+class NumpyPongTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pong = Pong(seed=3)
+        self.pong.create_game_balls(BALL_COUNT)
+        self.numpy = NumpyPong(seed=3)
+        self.numpy.create_game_balls(BALL_COUNT)
+
+    def assertSameGame(self, tick: int = None):
+        np.testing.assert_array_equal(rows(self.pong.balls), self.numpy.state["pos"], f"positions at tick {tick}")
+        np.testing.assert_array_equal(rows(self.pong.ballVelocities), self.numpy.state["vel"], f"velocities at tick {tick}")
+        np.testing.assert_array_equal(rows(self.pong.paddles), rows(self.numpy.paddles), f"paddles at tick {tick}")
+        self.assertEqual(self.pong.score, self.numpy.score, f"score at tick {tick}")
+        self.assertEqual((self.pong.paddleHits, self.pong.wallHits), (self.numpy.paddleHits, self.numpy.wallHits), f"hits at tick {tick}")
+
+    def test_start_matches(self):
+        self.assertSameGame()
+
+    def test_large_start(self):
+        # 100k balls start from one batched draw, the same one Pong makes
+        pong, numpy = Pong(seed=8), NumpyPong(seed=8)
+        pong.add_two_paddles()
+        numpy.add_two_paddles()
+        start = time.perf_counter()
+        numpy.add_balls(100_000)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        pong.add_balls(100_000)
+        np.testing.assert_array_equal(rows(pong.ballVelocities), numpy.state["vel"])
+        self.assertEqual(pong.rng.getstate(), numpy.rng.getstate())
+
+    def test_ticks_match(self):
+        for tick in range(TICKS):
+            self.pong.paddleInput = self.numpy.paddleInput = inputs(tick)
+            self.pong.tick(DT)
+            self.numpy.tick(DT)
+            self.assertSameGame(tick)
+        # the run has to exercise scoring and paddle hits to mean anything
+        self.assertGreater(self.numpy.score.x + self.numpy.score.y, 0)
+
+    def test_balls_round_trip(self):
+        balls = [V(1, 2), V(3, 4), V(5, 6)]
+        self.numpy.balls = balls
+        self.assertIsInstance(self.numpy.balls, VectorArray)
+        self.assertEqual(list(self.numpy.balls), balls)
+        self.assertEqual(len(self.numpy.state), 3)
+
+    def test_balls_are_copies(self):
+        balls = self.numpy.balls
+        balls._data[:] = -1
+        self.assertFalse((self.numpy.state["pos"] == -1).any())
+
+    def test_engine_class(self):
+        self.assertIs(engine_class(PYTHON_ENGINE), Pong)
+        self.assertIs(engine_class(NUMPY_ENGINE), NumpyPong)
+        with self.assertRaises(ValueError):
+            engine_class("fortran")
+
+    def test_pack_vectors(self):
+        self.assertEqual(pack_vectors(self.numpy.balls), PackedVectors.from_vectors(self.pong.balls))
+
+    def test_ball_collisions_match(self):
+        # spread the balls out so they run into each other all game
+        for ball in self.pong.balls:
+            ball.set(self.pong.rng.uniform(0, 300), self.pong.rng.uniform(0, 200))
+        self.numpy.restore(self.pong.snapshot())
+        self.pong.ballCollision = self.numpy.ballCollision = True
+        for tick in range(300):
+            self.pong.paddleInput = self.numpy.paddleInput = inputs(tick)
+            self.pong.tick(DT)
+            self.numpy.tick(DT)
+        self.assertSameGame()
+        self.assertEqual(self.numpy.ballHits, self.pong.ballHits)
+        self.assertGreater(self.numpy.ballHits, 0)
+
+if __name__ == "__main__":
+    unittest.main()
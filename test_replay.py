@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from breakout import Breakout
+from pong import Pong
+from pongnumpy import NumpyPong
+from replay import DesyncError, Recorder, Replay, ReplayError, checksum, play, scripted_inputs
+from vector import V
+
+BALL_COUNT = 50
+DT = 1 / 64
+
+def record(game, ticks: int, interval: int = 16) -> Replay:
+    recorder = Recorder(game, interval)
+    inputs = scripted_inputs(len(game.paddles), 3)
+    for tick in range(ticks):
+        game.paddleInput = next(inputs)
+        # a varying dt, as frames would give
+        recorder.tick(DT * (1 + tick % 3))
+    return recorder.replay
+
+class ReplayTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pong = Pong(seed=4)
+        self.pong.create_game_balls(BALL_COUNT)
+        self.replay = record(self.pong, 400)
+
+    def test_layout(self):
+        self.assertEqual(len(self.replay), 400)
+        self.assertEqual(len(self.replay.inputs), 400 * 2 * 2)
+        self.assertEqual(len(self.replay.checksums), 400 // 16)
+        self.assertEqual(self.replay.seed, 4)
+
+    def test_play_matches_the_recording(self):
+        game = play(self.replay)
+        self.assertEqual(game.snapshot(), self.pong.snapshot())
+        self.assertEqual(checksum(game), self.replay.checksums[-1])
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "match.replay")
+            self.replay.save(path)
+            loaded = Replay.load(path)
+        for name in ("game", "seed", "interval", "paddles", "config", "start", "steps", "inputs", "checksums"):
+            self.assertEqual(getattr(loaded, name), getattr(self.replay, name), name)
+        self.assertEqual(play(loaded).snapshot(), self.pong.snapshot())
+
+    def test_other_engine(self):
+        game = play(self.replay, NumpyPong())
+        self.assertEqual(game.snapshot(), self.pong.snapshot())
+
+    def test_desync(self):
+        self.replay.inputs[2 * 2 * 100] = -self.replay.inputs[2 * 2 * 100] or 1
+        with self.assertRaises(DesyncError) as caught:
+            play(self.replay)
+        self.assertGreater(caught.exception.tick, 100)
+        self.assertEqual(caught.exception.tick % 16, 0)
+        play(self.replay, check=False)
+
+    def test_rejects(self):
+        data = self.replay.tobytes()
+        with self.assertRaises(ReplayError):
+            Replay.frombytes(data[:10])
+        with self.assertRaises(ReplayError):
+            Replay.frombytes(b"JUNK" + data[4:])
+        with self.assertRaises(ReplayError):
+            Replay.frombytes(data[:-4])
+
+    def test_config(self):
+        # as ponggame.game_pogn plays
+        pong = Pong(seed=5)
+        pong.ballSize = V(64, 64)
+        pong.create_game_balls(BALL_COUNT)
+        replay = Replay.frombytes(record(pong, 400).tobytes())
+        self.assertEqual(replay.config, {"ballSize": [64, 64]})
+        self.assertEqual(play(replay).snapshot(), pong.snapshot())
+        self.assertEqual(play(replay, NumpyPong()).config, pong.config)
+
+    def test_breakout(self):
+        breakout = Breakout(seed=2)
+        breakout.create_game_normal()
+        breakout.ballVelocities[0].imul(4)
+        replay = record(breakout, 600)
+        self.assertEqual(play(replay).snapshot(), breakout.snapshot())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import argparse
+import unittest
+
+from pong import NUMBA_ENGINE, engine_class
+from runner import MatchSpec, Tally, parse_override, play, run_matches
+from vector import V
+
+class RunnerTests(unittest.TestCase):
+
+    def test_play_is_reproducible(self):
+        spec = MatchSpec("pong", seed=5, ticks=600, step=1 / 30, balls=20)
+        first, second = play(0, spec), play(1, spec)
+        self.assertEqual(first.score, second.score)
+        self.assertEqual(first.paddleHits, second.paddleHits)
+        self.assertEqual(first.ticks, 600)
+        self.assertGreater(sum(first.score), 0)
+
+    def test_overrides(self):
+        plain = play(0, MatchSpec("pong", seed=5, ticks=600, step=1 / 30, balls=20))
+        slow = play(0, MatchSpec("pong", seed=5, ticks=600, step=1 / 30, balls=20, overrides={"ballIdealSpeed": (20, 15), "ballStartSpeed": V(15, 8)}))
+        self.assertLess(sum(slow.score), sum(plain.score))
+        with self.assertRaises(ValueError):
+            play(0, MatchSpec("pong", overrides={"ballColour": 3}))
+
+    def test_breakout_stops_when_balls_are_gone(self):
+        result = play(0, MatchSpec("breakout", seed=1, ticks=1_000_000, step=1 / 30))
+        self.assertLess(result.ticks, 1_000_000)
+
+    def test_run_matches_in_parallel(self):
+        specs = [MatchSpec("pong", seed=k, ticks=200, balls=5) for k in range(6)]
+        results = list(run_matches(specs, workers=2))
+        self.assertEqual(sorted(result.index for result in results), list(range(6)))
+        for result in results:
+            self.assertEqual(result.score, play(result.index, specs[result.index]).score)
+        tally = Tally()
+        for result in results:
+            tally.add(result)
+        self.assertEqual(tally.matches, 6)
+        self.assertEqual(tally.ticks, 1200)
+
+    def test_run_matches_after_numba(self):
+        # numba's thread pool is running here before the workers start
+        pong = engine_class(NUMBA_ENGINE)(seed=1)
+        pong.create_game_balls(10)
+        pong.tick(1 / 144)
+        specs = [MatchSpec("pong", seed=k, ticks=50, balls=5, engine=NUMBA_ENGINE) for k in range(2)]
+        results = list(run_matches(specs, workers=2))
+        self.assertEqual(sorted(result.index for result in results), [0, 1])
+
+    def test_parse_override(self):
+        self.assertEqual(parse_override("ballSize=8,8"), ("ballSize", (8, 8)))
+        self.assertEqual(parse_override("ballReturnToIdealFactor=0.01"), ("ballReturnToIdealFactor", 0.01))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_override("ballSize")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_override("ballSize=big")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import unittest
+
+from pong import Pong
+from simulation import Simulation, main
+
+class Recorder:
+    "a game that only remembers the steps it was ticked with"
+
+    def __init__(self):
+        self.steps = []
+
+    def tick(self, dt: float):
+        self.steps.append(dt)
+
+class SimulationTests(unittest.TestCase):
+
+    def test_fixed_steps(self):
+        recorder = Recorder()
+        simulation = Simulation(recorder, step=0.25)
+        self.assertEqual(simulation.advance(0.1), 0)
+        self.assertEqual(simulation.advance(0.2), 1)
+        self.assertEqual(simulation.advance(0.5), 2)
+        self.assertEqual(recorder.steps, [0.25, 0.25, 0.25])
+        self.assertAlmostEqual(simulation.alpha, 0.2)
+        self.assertEqual(simulation.simulatedTime, 0.75)
+
+    def test_substep_guard_drops_backlog(self):
+        recorder = Recorder()
+        simulation = Simulation(recorder, step=0.25, maxSubsteps=3)
+        self.assertEqual(simulation.advance(10.125), 3)
+        self.assertEqual(simulation.accumulator, 0.125)
+        self.assertEqual(simulation.dropped, 9.25)
+        self.assertEqual(simulation.advance(0.125), 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Simulation(Recorder(), step=0)
+        with self.assertRaises(ValueError):
+            Simulation(Recorder(), maxSubsteps=0)
+
+    def test_frame_rate_independent(self):
+        games = [Pong(seed=2), Pong(seed=2)]
+        for game in games:
+            game.create_game_balls(50)
+        smooth, choppy = (Simulation(game, step=1 / 128) for game in games)
+        for _ in range(512):
+            smooth.advance(1 / 256)
+        for _ in range(32):
+            choppy.advance(1 / 16)
+        self.assertEqual(smooth.ticks, choppy.ticks)
+        self.assertEqual(games[0].balls, games[1].balls)
+
+    def test_headless(self):
+        recorder = Recorder()
+        simulation = Simulation(recorder, step=0.5)
+        self.assertGreater(simulation.run_headless(1000), 0)
+        self.assertEqual(len(recorder.steps), 1000)
+        self.assertEqual(simulation.simulatedTime, 500)
+
+    def test_realtime_with_fake_clock(self):
+        now = [0.]
+        def sleep(seconds):
+            now[0] += seconds
+        recorder = Recorder()
+        # binary fractions, so the fake clock lands exactly on each step
+        simulation = Simulation(recorder, step=0.125)
+        simulation.run_realtime(1.0, clock=lambda: now[0], sleep=sleep)
+        self.assertEqual(len(recorder.steps), 8)
+
+    def test_command_line_without_pygame(self):
+        code = "import sys, simulation; simulation.main(['pong', '-n', '10', '-t', '20']); simulation.main(['breakout', '-t', '20']); print('pygame' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertIn("20 ticks", out)
+        self.assertEqual(out.split()[-1], "False")
+
+if __name__ == "__main__":
+    unittest.main()
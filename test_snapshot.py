@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import unittest
+
+from breakout import Breakout
+from pong import Pong
+from pongnumpy import NumpyPong
+from snapshot import SnapshotError, restore_vectors, snapshot_vectors
+from vector import MV, V
+
+BALL_COUNT = 200
+DT = 1 / 60
+
+def rows(vectors) -> list[tuple[float, float]]:
+    return [(vector._x, vector._y) for vector in vectors]
+
+def pong_state(game: Pong) -> tuple:
+    return (rows(game.balls), rows(game.ballVelocities), rows(game.paddles), game.score, game.paddleHits, game.wallHits)
+
+def play(game, ticks: int, direction: int = 1):
+    for tick in range(ticks):
+        game.paddleInput = [V(0, direction * (((tick // 30) % 3) - 1)) for _ in game.paddles]
+        game.tick(DT)
+
+class PongSnapshotTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pong = Pong(seed=6)
+        self.pong.create_game_balls(BALL_COUNT)
+        play(self.pong, 300)
+
+    def test_rewind(self):
+        data = self.pong.snapshot()
+        balls = list(self.pong.balls)
+        play(self.pong, 400)
+        after = pong_state(self.pong)
+        self.pong.restore(data)
+        # the same ball objects come back, holding the old values
+        self.assertEqual(list(map(id, self.pong.balls)), list(map(id, balls)))
+        play(self.pong, 400)
+        self.assertEqual(pong_state(self.pong), after)
+
+    def test_hand_off(self):
+        data = self.pong.snapshot()
+        other = Pong().restore(data)
+        play(self.pong, 400)
+        play(other, 400)
+        self.assertEqual(pong_state(other), pong_state(self.pong))
+
+    def test_hand_off_between_engines(self):
+        numpy = NumpyPong().restore(self.pong.snapshot())
+        play(self.pong, 400)
+        play(numpy, 400)
+        self.assertEqual(pong_state(numpy), pong_state(self.pong))
+        self.assertEqual(numpy.snapshot(), self.pong.snapshot())
+
+    def test_size(self):
+        data = self.pong.snapshot()
+        # four float64 per ball on top of a fixed header and rng state
+        empty = Pong(seed=6)
+        empty.create_game_balls(0)
+        self.assertEqual(len(data) - len(empty.snapshot()), 32 * BALL_COUNT)
+
+    def test_rejects(self):
+        data = self.pong.snapshot()
+        with self.assertRaises(SnapshotError):
+            Breakout().restore(data)
+        with self.assertRaises(SnapshotError):
+            self.pong.restore(data[:-8])
+        with self.assertRaises(SnapshotError):
+            self.pong.restore(data[:10])
+        with self.assertRaises(SnapshotError):
+            self.pong.restore(b"JUNK" + data[4:])
+
+class BreakoutSnapshotTests(unittest.TestCase):
+
+    def test_rewind_and_hand_off(self):
+        breakout = Breakout(seed=2)
+        breakout.create_game_normal()
+        breakout.ballVelocities[0].imul(4)
+        play(breakout, 600)
+        data = breakout.snapshot()
+        play(breakout, 900)
+        blocks = [block is None for block in breakout.blocks]
+        other = Breakout().restore(data)
+        breakout.restore(data)
+        for game in (breakout, other):
+            play(game, 900)
+            self.assertEqual([block is None for block in game.blocks], blocks)
+        self.assertEqual(other.snapshot(), breakout.snapshot())
+        self.assertGreater(breakout.blockHits, 0)
+
+class VectorPackingTests(unittest.TestCase):
+
+    def test_none_round_trips(self):
+        vectors = [V(1, 2), None, V(3, 4)]
+        self.assertEqual(restore_vectors(snapshot_vectors(vectors)), vectors)
+
+    def test_reuse(self):
+        into = [MV(0, 0), MV(0, 0)]
+        first = into[0]
+        out = restore_vectors(snapshot_vectors([V(5, 6), V(7, 8)]), into, MV)
+        self.assertIs(out, into)
+        self.assertIs(out[0], first)
+        self.assertEqual(out, [V(5, 6), V(7, 8)])
+        kept = [V(1, 1)]
+        self.assertIs(restore_vectors(snapshot_vectors([V(1, 1)]), kept)[0], kept[0])
+
+if __name__ == "__main__":
+    unittest.main()
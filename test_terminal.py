@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from breakout import Breakout
+from pong import Pong
+from pongnumpy import NumpyPong
+from terminal import Raster, TerminalRenderer
+from vector import V
+
+class RasterTests(unittest.TestCase):
+
+    def setUp(self):
+        # 100 x 50 cells over the 1500 x 1000 page: 15 x 20 units per cell
+        self.pong = Pong(seed=1)
+        self.pong.create_game_balls(3)
+        self.raster = Raster(100, 50)
+
+    def cells(self, char: str) -> set[tuple[int, int]]:
+        return {(x, y) for y, row in enumerate(str(self.raster).split("\n")) for x, c in enumerate(row) if c == char}
+
+    def test_balls_land_in_their_cells(self):
+        self.pong.balls[0].set(30, 40)
+        # straddles the border between columns 3 and 4
+        self.pong.balls[1].set(57, 40)
+        # partly off the page
+        self.pong.balls[2].set(-3, 997)
+        self.raster.draw(self.pong)
+        self.assertEqual(self.cells("B"), {(2, 2), (3, 2), (4, 2), (0, 49)})
+
+    def test_paddles_are_covered_and_balls_drawn_over_them(self):
+        # 16 x 70 units from (90, 500): columns 6 to 7, rows 25 to 28
+        self.pong.paddles[0].set(90, 500)
+        self.pong.balls[0].set(95, 505)
+        self.raster.draw(self.pong)
+        left = {(x, y) for x, y in self.cells("P") if x < 50}
+        self.assertEqual(left, {(x, y) for x in (6, 7) for y in range(25, 29)} - {(6, 25)})
+        self.assertIn((6, 25), self.cells("B"))
+
+    def test_redraw_clears(self):
+        self.pong.balls[0].set(30, 40)
+        self.raster.draw(self.pong)
+        self.pong.balls[0].set(300, 400)
+        self.raster.draw(self.pong)
+        self.assertNotIn((2, 2), self.cells("B"))
+
+    def test_numpy_engine(self):
+        numpy = NumpyPong().restore(self.pong.snapshot())
+        self.assertEqual(str(Raster(100, 50).draw(numpy)), str(self.raster.draw(self.pong)))
+
+    def test_breakout(self):
+        breakout = Breakout(seed=1)
+        breakout.create_game_normal()
+        breakout.blocks[0] = None
+        breakout.balls[0] = None
+        text = str(self.raster.draw(breakout))
+        self.assertIn("#", text)
+        self.assertIn("P", text)
+        self.assertNotIn("B", text)
+
+    def test_display(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.pong.display(V(40, 12))
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 12)
+        self.assertEqual({len(line) for line in lines}, {40})
+
+    def test_needs_cells(self):
+        with self.assertRaises(ValueError):
+            Raster(0, 10)
+
+class TerminalRendererTests(unittest.TestCase):
+
+    def setUp(self):
+        self.out = io.StringIO()
+        self.renderer = TerminalRenderer(self.out)
+        self.raster = Raster(40, 10)
+
+    def written(self) -> str:
+        text = self.out.getvalue()
+        self.out.seek(0)
+        self.out.truncate()
+        return text
+
+    def test_first_frame_is_whole(self):
+        self.raster.fill(1, 1, 2, 2, ord("B"))
+        self.renderer.render(self.raster)
+        text = self.written()
+        self.assertIn("\x1b[2J", text)
+        self.assertEqual(text.count("H"), 10)
+
+    def test_only_changes_are_written(self):
+        self.renderer.render(self.raster)
+        self.written()
+        self.assertEqual(self.renderer.render(self.raster), 0)
+        self.assertEqual(self.written(), "")
+        self.raster.rows[3][5] = ord("B")
+        self.raster.rows[7][30] = ord("P")
+        self.renderer.render(self.raster)
+        self.assertEqual(self.written(), "\x1b[4;6HB\x1b[8;31HP")
+
+    def test_close_runs_merge(self):
+        self.renderer.render(self.raster)
+        self.written()
+        self.raster.rows[0][2] = self.raster.rows[0][5] = self.raster.rows[0][30] = ord("B")
+        self.renderer.render(self.raster)
+        self.assertEqual(self.written(), "\x1b[1;3HB  B\x1b[1;31HB")
+
+    def test_resize_redraws(self):
+        self.renderer.render(self.raster)
+        self.written()
+        self.renderer.render(Raster(20, 10))
+        self.assertIn("\x1b[2J", self.written())
+
+    def test_close_shows_cursor(self):
+        with self.renderer:
+            self.renderer.render(self.raster)
+        self.assertTrue(self.written().endswith("\x1b[11;1H\x1b[?25h"))
+
+if __name__ == "__main__":
+    unittest.main()
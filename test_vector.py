@@ -1,16 +1,57 @@
 
 from __future__ import annotations
-from math import tau
 
+import os
+import subprocess
+import sys
+import tracemalloc
 import unittest
-from random import randint
+from functools import cached_property, lru_cache
+from math import cos, hypot, pi, sin, tau
+from random import Random, randint
 
-from vector import A, Angle, V, Vector
+import numpy as np
+
+import vector
+from vector import CheckedAngle as Angle, CheckedMutableVector as MV, CheckedVector as Vector
+from vector import CheckedVectorArray as VectorArray, FastMutableVector, FastVector, Rect, V_NEG_ONE, V_ONE, V_ZERO
+
+A = Angle
+V = Vector
+VA = VectorArray
 
 LOW, HIGH = -1000000, 1000000
 
 VEC_DIV_VEC_FAILED = "vector div vector test failed"
 
+INSTANCES = 20000
+
+class DictVector:
+    "layout Vector had before it was slotted: components and caches in a __dict__"
+    def __init__(self, x, y):
+        self._x = x
+        self._y = y
+
+    @cached_property
+    def length(self) -> float:
+        return hypot(self._x, self._y)
+
+def bytes_per_instance(cls, cacheLength: bool = False) -> float:
+    "average traced memory of one cls(x, y), sharing the component floats"
+    x, y = 3.5, 4.5
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        instances = [cls(x, y) for _ in range(INSTANCES)]
+        if cacheLength:
+            for instance in instances:
+                instance.length
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # the list holding the instances costs one pointer each
+    return (current - start) / INSTANCES - 8
+
 class VectorTests(unittest.TestCase):
 
     def test_transitive_addition_subtraction_multiplication(self):
@@ -131,6 +172,18 @@ class VectorTests(unittest.TestCase):
         self.assertAlmostEqual(s.x, 0, -3)
         self.assertAlmostEqual(s.y, 0, -3)
 
+    def test_random_batches(self):
+        signs = Vector.from_random_signs(48000, Random(5))
+        self.assertEqual(len(signs), 48000)
+        self.assertTrue(all(vec._x in (-1, 1) and vec._y in (-1, 1) for vec in signs))
+        self.assertAlmostEqual(sum(vec.x for vec in signs), 0, -3)
+        squares = Vector.from_random_squares(V(-4, -2), V(4, 2), 48000, Random(5))
+        self.assertTrue(all(vec.inside(V(-4, -2), V(4, 2)) for vec in squares))
+        # one seed always yields the same batch
+        self.assertEqual(signs, Vector.from_random_signs(48000, Random(5)))
+        self.assertEqual(squares, Vector.from_random_squares(V(-4, -2), V(4, 2), 48000, Random(5)))
+        self.assertIsInstance(MV.from_random_signs(1)[0], MV)
+
     def test_normalise(self):
         for _ in range(48000):
             x, y = randint(LOW, HIGH) / 21, randint(LOW, HIGH) / 82
@@ -163,6 +216,362 @@ class AngleTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.assertEqual(A(degrees=0), V(0, 0))
 
+class MemoryTests(unittest.TestCase):
+    "for both vector families, checked and fast"
+
+    FAMILIES = ((Vector, MV), (FastVector, FastMutableVector))
+
+    def test_slotted(self):
+        for vector, mutable in self.FAMILIES:
+            with self.subTest(vector.__name__):
+                self.assertFalse(hasattr(vector(1, 2), "__dict__"))
+                self.assertFalse(hasattr(mutable(1, 2), "__dict__"))
+
+    def test_bytes_per_instance(self):
+        # measured on CPython 3.11.7:
+        #                    bare    .length cached
+        #   DictVector       89 B    176 B
+        #   Vector           64 B     88 B (64 + the cached float)
+        old, oldCached = bytes_per_instance(DictVector), bytes_per_instance(DictVector, True)
+        for vector, _ in self.FAMILIES:
+            with self.subTest(vector.__name__):
+                new, newCached = bytes_per_instance(vector), bytes_per_instance(vector, True)
+                self.assertLess(new, old, f"slotted Vector {new:.0f} B vs __dict__ Vector {old:.0f} B")
+                self.assertLess(newCached * 1.5, oldCached, f"with .length cached: {newCached:.0f} B vs {oldCached:.0f} B")
+
+    def test_lazy_cache(self):
+        for vector, _ in self.FAMILIES:
+            with self.subTest(vector.__name__):
+                vec = vector(3, 4)
+                self.assertEqual(vec.length, 5)
+                self.assertIs(vec.normal, vec.normal)
+                self.assertAlmostEqual(vec.normal.length, 1)
+
+    def test_interned_constants(self):
+        for vector, _ in self.FAMILIES:
+            with self.subTest(vector.__name__):
+                self.assertEqual(V_ZERO, vector(0, 0))
+                self.assertEqual(V_ONE, vector(1, 1))
+                self.assertEqual(V_NEG_ONE, vector(-1, -1))
+
+class MutableVectorTests(unittest.TestCase):
+
+    def test_in_place_matches_operators(self):
+        for _ in range(4800):
+            x, y = randint(LOW, HIGH) / 21, randint(LOW, HIGH) / 61
+            z, w = randint(LOW, HIGH) / 7, randint(LOW, HIGH) / 3
+            vec, other = V(x, y), V(z, w)
+            mvec = MV(x, y)
+            self.assertIs(mvec.iadd(other), mvec)
+            self.assertEqual(mvec, vec + other)
+            self.assertEqual(mvec.assign(vec).isub(other), vec - other)
+            self.assertEqual(mvec.assign(vec).imul(other), vec * other)
+            self.assertEqual(mvec.assign(vec).imul(3), vec * 3)
+            self.assertEqual(mvec.assign(vec).iadd(other, 0.5), vec + other * 0.5)
+            self.assertEqual(mvec.assign(vec).ibind(V(-1, -1), V(1, 1)), vec.bind(V(-1, -1), V(1, 1)))
+            self.assertEqual(mvec.assign(vec).iapproach(other, 0.25), vec.approach(other, 0.25))
+            self.assertEqual(mvec.assign(vec).isigns(), vec.signs())
+            self.assertEqual(mvec.assign(vec).iabs(), abs(vec))
+            self.assertEqual(mvec.assign(vec).inside(V(LOW, 0), V(HIGH, HIGH)), vec.inside(V(LOW, 0), V(HIGH, HIGH)))
+
+    def test_sign_rounding_edge(self):
+        for x in (-0.5, -0.51, -0.49, 0, 0.5):
+            self.assertEqual(MV(x, x).isigns(), V(x, x).signs())
+
+    def test_length_not_stale(self):
+        vec = MV(3, 4)
+        self.assertEqual(vec.length, 5)
+        vec.imul(2)
+        self.assertEqual(vec.length, 10)
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            hash(MV(0, 0))
+
+def corners_inside(pos: Vector, size: Vector, lo: Vector, loSize: Vector) -> bool:
+    "the four `corner.inside()` test the engines used before Rect"
+    return any((
+        pos.inside(lo, lo + loSize),
+        (pos + size.vx).inside(lo, lo + loSize),
+        (pos + size.vy).inside(lo, lo + loSize),
+        (pos + size).inside(lo, lo + loSize),
+    ))
+
+class RectTests(unittest.TestCase):
+
+    def test_overlaps_matches_corner_test(self):
+        # a box no larger than the other overlaps exactly when one of its corners is inside
+        paddle, paddleSize, ballSize = V(100, 100), V(16, 70), V(6, 6)
+        paddleRect = Rect.from_vectors(paddle, paddleSize)
+        ballRect = Rect(0, 0, 0, 0)
+        for _ in range(24000):
+            ball = V(randint(80, 130) + randint(0, 3) / 4, randint(80, 180) + randint(0, 3) / 4)
+            ballRect.place(ball, ballSize)
+            self.assertEqual(ballRect.overlaps(paddleRect), corners_inside(ball, ballSize, paddle, paddleSize))
+            self.assertEqual(paddleRect.overlaps(ballRect), ballRect.overlaps(paddleRect))
+
+    def test_overlaps_large_box(self):
+        # no corner of the big box is inside the thin one but they still overlap
+        big, thin = Rect(0, 0, 64, 64), Rect(20, -10, 36, 80)
+        self.assertTrue(big.overlaps(thin))
+        self.assertFalse(corners_inside(V(0, 0), V(64, 64), V(20, -10), V(16, 90)))
+
+    def test_edges_inclusive(self):
+        self.assertTrue(Rect(0, 0, 10, 10).overlaps(Rect(10, 10, 20, 20)))
+        self.assertFalse(Rect(0, 0, 10, 10).overlaps(Rect(10.5, 0, 20, 10)))
+        self.assertTrue(Rect(0, 0, 10, 10).contains(V(10, 0)))
+        self.assertFalse(Rect(0, 0, 10, 10).contains(V(10, -0.1)))
+
+    def test_intersection(self):
+        self.assertEqual(Rect(0, 0, 10, 10).intersection(Rect(5, -5, 20, 8)), Rect(5, 0, 10, 8))
+        self.assertIsNone(Rect(0, 0, 10, 10).intersection(Rect(11, 0, 20, 10)))
+
+    def test_penetration(self):
+        # ball just inside the left edge of a paddle gets pushed back left
+        self.assertEqual(Rect(98, 120, 104, 126).penetration(Rect(100, 100, 116, 170)), (-4, -26))
+        # and from just under the bottom edge gets pushed down
+        self.assertEqual(Rect(105, 168, 111, 174).penetration(Rect(100, 100, 116, 170)), (11, 2))
+        self.assertEqual(Rect(0, 0, 1, 1).penetration(Rect(5, 5, 6, 6)), (0, 0))
+
+    def test_place_move(self):
+        rect = Rect.from_vectors(V(1, 2), V(3, 4))
+        self.assertEqual(rect.size, V(3, 4))
+        self.assertIs(rect.move_to(V(10, 10)), rect)
+        self.assertEqual(rect, Rect(10, 10, 13, 14))
+        self.assertEqual(rect.place(V(0, 0), V(1, 1)), Rect(0, 0, 1, 1))
+        self.assertEqual((rect.lo, rect.hi), (V(0, 0), V(1, 1)))
+
+class VectorArrayTests(unittest.TestCase):
+
+    def setUp(self):
+        self.vectors = [V(randint(LOW, HIGH) / 7, randint(LOW, HIGH) / 13) for _ in range(2000)]
+        self.others = [V(randint(LOW, HIGH) / 3, randint(LOW, HIGH) / 11 + 0.5) for _ in range(2000)]
+        self.array = VA.from_vectors(self.vectors)
+        self.otherArray = VA.from_vectors(self.others)
+
+    def assertRowsEqual(self, array: VectorArray, vectors: list[Vector], places: int = 7):
+        self.assertEqual(len(array), len(vectors))
+        for row, vec in zip(array, vectors):
+            self.assertAlmostEqual(row._x, vec._x, places)
+            self.assertAlmostEqual(row._y, vec._y, places)
+
+    def test_round_trip(self):
+        self.assertEqual(self.array._data.shape, (2000, 2))
+        self.assertTrue(self.array._data.flags["C_CONTIGUOUS"])
+        self.assertEqual(self.array.to_vectors(), self.vectors)
+        self.assertEqual(self.array[5], self.vectors[5])
+        self.assertIsInstance(self.array[5], Vector)
+        self.assertEqual(len(self.array[10:20]), 10)
+
+    def test_arithmetic(self):
+        self.assertRowsEqual(self.array + self.otherArray, [a + b for a, b in zip(self.vectors, self.others)])
+        self.assertRowsEqual(self.array - self.otherArray, [a - b for a, b in zip(self.vectors, self.others)])
+        self.assertRowsEqual(self.array * self.otherArray, [a * b for a, b in zip(self.vectors, self.others)])
+        self.assertRowsEqual(self.array / self.otherArray, [a / b for a, b in zip(self.vectors, self.others)])
+        self.assertRowsEqual(self.array * 3, [a * 3 for a in self.vectors])
+        self.assertRowsEqual(self.array + V(4, -2), [a + V(4, -2) for a in self.vectors])
+        self.assertRowsEqual(abs(self.array), [abs(a) for a in self.vectors])
+        self.assertRowsEqual(-self.array, [-a for a in self.vectors])
+
+    def test_in_place(self):
+        array = self.array.copy()
+        buffer = array._data
+        array += self.otherArray
+        array *= V(2, 0.5)
+        array -= V(1, 1)
+        self.assertIs(array._data, buffer)
+        self.assertRowsEqual(array, [((a + b) * V(2, 0.5)) - V(1, 1) for a, b in zip(self.vectors, self.others)])
+
+    def test_bind_inside(self):
+        lo, hi = V(-HIGH / 10, -HIGH / 20), V(HIGH / 10, HIGH / 20)
+        self.assertRowsEqual(self.array.bind(lo, hi), [a.bind(lo, hi) for a in self.vectors])
+        self.assertEqual(self.array.inside(lo, hi).tolist(), [a.inside(lo, hi) for a in self.vectors])
+
+    def test_signs_approach(self):
+        self.assertRowsEqual(self.array.signs(), [a.signs() for a in self.vectors])
+        self.assertRowsEqual(self.array.approach(V(200, 150), 0.0006), [a.approach(V(200, 150), 0.0006) for a in self.vectors])
+        # half-way rounding of the sign test matches Vector.signs
+        edge = VA.from_vectors([V(-0.5, -0.51), V(0.49, -1)])
+        self.assertRowsEqual(edge.signs(), [V(-0.5, -0.51).signs(), V(0.49, -1).signs()])
+
+    def test_rotate(self):
+        angle = A(degrees=37)
+        self.assertRowsEqual(self.array.rotate(angle), [a.rotate(angle) for a in self.vectors], 4)
+
+    def test_random(self):
+        signs = VA.random_signs(2000, 3)
+        self.assertTrue(np.all(np.abs(signs._data) == 1))
+        squares = VA.random_squares(V(-4, -2), V(4, 2), 2000, np.random.default_rng(3))
+        self.assertTrue(np.all(squares.inside(V(-4, -2), V(4, 2))))
+        self.assertTrue(np.all(VA.random_signs(2000, 3) == signs))
+
+    def test_to_and_from_vectors(self):
+        mutable = self.array.to_vectors(MV)
+        self.assertIsInstance(mutable[0], MV)
+        self.assertEqual(mutable, self.vectors)
+        copy = VA.from_vectors(self.array)
+        self.assertIsNot(copy._data, self.array._data)
+        self.assertTrue(np.all(copy == self.array))
+
+    def test_rotate_many(self):
+        angles = [A(degrees=randint(0, 720)) for _ in self.vectors]
+        expected = [a.rotate(angle) for a, angle in zip(self.vectors, angles)]
+        self.assertRowsEqual(self.array.rotate_many(angles), expected, 4)
+        radians = np.array([angle._angle for angle in angles])
+        self.assertRowsEqual(self.array.rotate_many(radians), expected, 4)
+        with self.assertRaises(ValueError):
+            self.array.rotate_many(radians[:-1])
+
+    def test_length_normal(self):
+        for length, vec in zip(self.otherArray.length, self.others):
+            self.assertAlmostEqual(length, vec.length, 6)
+        self.assertRowsEqual(self.otherArray.normal, [a.normal for a in self.others])
+        self.assertRowsEqual(self.array.vx + self.array.vy, self.vectors)
+        self.assertRowsEqual(self.array.vx, [a.vx for a in self.vectors])
+
+    def test_invalid(self):
+        with self.assertRaises(TypeError):
+            self.array + "0"
+        with self.assertRaises(ValueError):
+            VA([1, 2, 3])
+
+class PackedVectorsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.vectors = [V(randint(LOW, HIGH) / 7, randint(LOW, HIGH) / 13) for _ in range(500)]
+
+    def test_round_trip(self):
+        packed = vector.PackedVectors.from_vectors(self.vectors)
+        self.assertEqual(len(packed), 500)
+        data = packed.tobytes()
+        self.assertEqual(len(data), 500 * 2 * 8)
+        unpacked = vector.PackedVectors.frombytes(data)
+        self.assertEqual(unpacked, packed)
+        self.assertEqual(unpacked.to_vectors(), self.vectors)
+        self.assertEqual(list(unpacked), self.vectors)
+        self.assertTrue(all(isinstance(vec, MV) for vec in unpacked.to_vectors(MV)))
+
+    def test_buffer_protocol(self):
+        packed = vector.PackedVectors.from_vectors(self.vectors[:2])
+        view = memoryview(packed.buffer)
+        self.assertEqual(view.format, "d")
+        self.assertEqual(view.tolist(), [self.vectors[0]._x, self.vectors[0]._y, self.vectors[1]._x, self.vectors[1]._y])
+
+    def test_vector_array(self):
+        array = VA.from_vectors(self.vectors)
+        packed = vector.PackedVectors.from_array(array)
+        self.assertEqual(packed.to_vectors(), self.vectors)
+        self.assertTrue(np.all(packed.to_array() == array))
+        restored = VA.frombytes(array.tobytes())
+        self.assertTrue(np.all(restored == array))
+        # decoded buffers are writable copies
+        restored += V(1, 1)
+        self.assertEqual(packed.tobytes(), array.tobytes())
+
+class KeyTests(unittest.TestCase):
+
+    def test_swapped_components_hash_apart(self):
+        hashes = {hash(vector.VectorKey(x, y)) for x in range(64) for y in range(64)}
+        self.assertEqual(len(hashes), 64 * 64)
+        self.assertNotEqual(hash(V(3, 7)), hash(V(7, 3)))
+
+    def test_vector_key_quantizes(self):
+        key = vector.VectorKey.from_vector(V(12.0000001, 7.49999), 1 / 64)
+        self.assertEqual(key, vector.VectorKey(12, 7.5))
+        self.assertEqual(hash(key), hash(vector.VectorKey(12, 7.5)))
+        self.assertEqual(key, V(12, 7.5))
+        self.assertEqual(hash(key), hash(V(12, 7.5)))
+        # operators hand back ordinary Vectors
+        self.assertIs(type(key + V(1, 1)), FastVector)
+
+    def test_vector_key_cache_hits(self):
+        calls = []
+        @lru_cache(maxsize=8)
+        def scaled(scale):
+            calls.append(scale)
+            return scale * 2
+        for wobble in (0, 1e-9, -1e-9, 2e-4):
+            scaled(vector.VectorKey.from_vector(V(1.5 + wobble, 0.75 - wobble), 1 / 64))
+        self.assertEqual(len(calls), 1)
+
+    def test_angle_key_quantizes(self):
+        key = vector.AngleKey.from_angle(A(degrees=359.7), vector.DEGREE)
+        self.assertEqual(key, vector.AngleKey(0))
+        self.assertEqual(hash(key), hash(vector.AngleKey(tau)))
+        self.assertAlmostEqual(vector.AngleKey.from_angle(A(degrees=44.6), vector.DEGREE).degrees, 45)
+
+class TrigTests(unittest.TestCase):
+
+    def tearDown(self):
+        vector.set_trig(None)
+
+    def test_angle_caches_sincos(self):
+        angle = A(degrees=30)
+        self.assertIs(angle.sincos, angle.sincos)
+        self.assertAlmostEqual(angle.sincos[0], 0.5)
+        self.assertEqual(angle.radians, angle._angle % tau)
+
+    def test_table_close_to_exact(self):
+        table = vector.set_trig(4096)
+        self.assertIsInstance(table, vector.TrigTable)
+        for _ in range(2000):
+            exact = A(randint(LOW, HIGH) / 997)
+            sina, cosa = table.sincos(exact.radians)
+            # one table step is tau / 4096 radians
+            self.assertAlmostEqual(sina, sin(exact._angle), delta=tau / 4096)
+            self.assertAlmostEqual(cosa, cos(exact._angle), delta=tau / 4096)
+
+    def test_table_backs_rotation(self):
+        vector.set_trig(4)
+        # quarter turn steps are exact, everything else snaps to one
+        self.assertEqual(V(1, 0).rotate(A(degrees=80)).force_round(), V(0, 1))
+        self.assertEqual(V.from_angle(A(degrees=100), 2).force_round(), V(2, 0))
+        array = VA.from_vectors([V(1, 0), V(0, 1)])
+        self.assertRowsEqual(array.rotate_many(np.array([pi, pi / 2 + 0.1])), [V(-1, 0), V(-1, 0)], 6)
+
+    def test_invalid_resolution(self):
+        with self.assertRaises(ValueError):
+            vector.TrigTable(0)
+
+    assertRowsEqual = VectorArrayTests.assertRowsEqual
+
+class ModeTests(unittest.TestCase):
+
+    def tearDown(self):
+        vector.set_mode(self.mode)
+
+    def setUp(self):
+        self.mode = vector.mode
+
+    def test_set_mode_rebinds_names(self):
+        vector.set_mode(vector.CHECKED)
+        self.assertIs(vector.V, Vector)
+        self.assertIs(vector.A, Angle)
+        self.assertIs(vector.MV, MV)
+        self.assertIs(vector.VA, VectorArray)
+        self.assertIsInstance(vector.V_ZERO, Vector)
+        with self.assertRaises(TypeError):
+            vector.V(1, 1) + (1, 1)
+        vector.set_mode(vector.FAST)
+        self.assertIs(vector.V, FastVector)
+        self.assertNotIsInstance(vector.V_ZERO, Vector)
+
+    def test_environment_variable(self):
+        env = dict(os.environ, **{vector.MODE_VARIABLE: vector.CHECKED})
+        result = subprocess.run([sys.executable, "-c", "import vector; print(vector.V.__name__)"],
+            env=env, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "CheckedVector")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            vector.set_mode("strict")
+
+    def test_modes_interoperate(self):
+        self.assertEqual(FastVector(1, 2) + V(3, 4), V(4, 6))
+        self.assertEqual(V(1, 2) + FastVector(3, 4), FastVector(4, 6))
+        self.assertEqual(A(vector=FastVector(0, 1)), A(vector=V(0, 1)))
+        self.assertIsInstance(V(1, 2) + FastVector(3, 4), Vector)
+
 
 if __name__ == "__main__":
     unittest.main()
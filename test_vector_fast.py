@@ -2,9 +2,13 @@
 from __future__ import annotations
 
 import unittest
+from math import tau
 from random import randint
 
-from unsafe_vector import A, Angle, V, Vector
+from vector import FastAngle as Angle, FastMutableVector as MV, FastVector as Vector, FastVectorArray as VA
+
+A = Angle
+V = Vector
 
 LOW, HIGH = -1000000, 1000000
 
@@ -146,16 +150,58 @@ class VectorTests(unittest.TestCase):
 class AngleTests(unittest.TestCase):
 
     def test_creation(self):
-        with self.assertRaises(TypeError):
-            A(radians=V(0, 0))
-        with self.assertRaises(TypeError):
-            A(degrees=V(0, 0))
-        with self.assertRaises(TypeError):
-            A(radians=2, degrees=1)
+        self.assertEqual(A(tau / 2), A(degrees=180))
+        self.assertEqual(A(radians=tau / 4), A(degrees=90))
+        self.assertAlmostEqual(A(vector=V(0, 1))._angle, 0)
 
     def test_equality(self):
         self.assertEqual(A(0), A(0))
 
+class MutableVectorTests(unittest.TestCase):
+
+    def test_in_place_matches_operators(self):
+        for _ in range(4800):
+            x, y = randint(LOW, HIGH) / 21, randint(LOW, HIGH) / 61
+            z, w = randint(LOW, HIGH) / 7, randint(LOW, HIGH) / 3
+            vec, other = V(x, y), V(z, w)
+            mvec = MV(x, y)
+            self.assertIs(mvec.iadd(other), mvec)
+            self.assertEqual(mvec, vec + other)
+            self.assertEqual(mvec.assign(vec).isub(other), vec - other)
+            self.assertEqual(mvec.assign(vec).imul(other), vec * other)
+            self.assertEqual(mvec.assign(vec).imul(3), vec * 3)
+            self.assertEqual(mvec.assign(vec).iadd(other, 0.5), vec + other * 0.5)
+            self.assertEqual(mvec.assign(vec).ibind(V(-1, -1), V(1, 1)), vec.bind(V(-1, -1), V(1, 1)))
+            self.assertEqual(mvec.assign(vec).iapproach(other, 0.25), vec.approach(other, 0.25))
+            self.assertEqual(mvec.assign(vec).isigns(), vec.signs())
+            self.assertEqual(mvec.assign(vec).iabs(), abs(vec))
+            self.assertEqual(mvec.assign(vec).inside(V(LOW, 0), V(HIGH, HIGH)), vec.inside(V(LOW, 0), V(HIGH, HIGH)))
+
+    def test_sign_rounding_edge(self):
+        for x in (-0.5, -0.51, -0.49, 0, 0.5):
+            self.assertEqual(MV(x, x).isigns(), V(x, x).signs())
+
+    def test_length_not_stale(self):
+        vec = MV(3, 4)
+        self.assertEqual(vec.length, 5)
+        vec.imul(2)
+        self.assertEqual(vec.length, 10)
+
+    def test_unhashable(self):
+        with self.assertRaises(TypeError):
+            hash(MV(0, 0))
+
+class VectorArrayTests(unittest.TestCase):
+
+    def test_rows_are_fast_vectors(self):
+        vectors = [V(randint(LOW, HIGH) / 7, randint(LOW, HIGH) / 13) for _ in range(500)]
+        array = VA.from_vectors(vectors)
+        self.assertIsInstance(array[0], Vector)
+        self.assertEqual(array.to_vectors(), vectors)
+        self.assertEqual((array + V(1, 2)).to_vectors(), [vec + V(1, 2) for vec in vectors])
+        self.assertEqual(array.signs().to_vectors(), [vec.signs() for vec in vectors])
+
+
 if __name__ == "__main__":
     unittest.main()
 
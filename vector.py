@@ -1,26 +1,201 @@
 
 from __future__ import annotations
 
-from functools import cached_property, total_ordering
+import os
+import sys
+from array import array
+from contextlib import suppress
+from itertools import chain
+from functools import cached_property
 from math import atan2, cos, hypot, pi, sin, sqrt, tau
-from random import randint, random
+import random as global_random
+from random import Random, randint, random
 from typing import Union
 
-__all__ = ["Vector", "V", "Angle", "A"]
+__all__ = ["Vector", "V", "Angle", "A", "MutableVector", "MV", "Rect", "VectorArray", "VA",
+    "V_ZERO", "V_ONE", "V_NEG_ONE", "V_UNIT_X", "V_UNIT_Y", "set_mode", "Trig", "TrigTable", "set_trig",
+    "VectorKey", "AngleKey", "DEGREE", "PackedVectors"]
 
-from dataclasses import dataclass
+# numpy is only needed for VectorArray; Vector and Angle work without it
+np = None
+with suppress(ImportError):
+    import numpy as np
 
+# Every type here comes in two flavours. The Fast* classes never validate
+# their operands; the Checked* subclasses add isinstance checks in front of
+# the same code and raise TypeError on misuse. Which flavour the public names
+# (Vector, V, Angle, ...) refer to is picked once, when this module is
+# imported, from the VECTOR_MODE environment variable or by calling
+# set_mode() before anything imports those names.
+FAST = "fast"
+CHECKED = "checked"
+MODE_VARIABLE = "VECTOR_MODE"
+# one degree in radians, e.g. as an AngleKey quantum
+DEGREE = tau / 360
 
-def operand_error(op: str, a) -> str:
-    return f"unsupported operand type for `{op}`: `Vector` and `{a.__class__.__qualname__}`({a})"
+# optional TrigTable resolution; exact trig when unset
+TRIG_VARIABLE = "VECTOR_TRIG_RESOLUTION"
 
-class Angle:
+
+def operand_error(op: str, a, name: str = "Vector") -> str:
+    return f"unsupported operand type for `{op}`: `{name}` and `{a.__class__.__qualname__}`({a})"
+
+class Trig:
+    """
+    Exact sin/cos backend, straight from math (or numpy for arrays).
+    """
+
+    __slots__ = []
+
+    def sincos(self, radians: float) -> tuple[float, float]:
+        return sin(radians), cos(radians)
+
+    def sincos_many(self, radians: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        return np.sin(radians), np.cos(radians)
+
+class TrigTable(Trig):
+    """
+    sin/cos backend reading from tables precomputed over one period.
+    Angles snap to the nearest of `resolution` equal steps, so results
+    are off by at most about pi / resolution radians.
+    """
+
+    resolution: int
+
+    __slots__ = ["resolution", "_step", "_sin", "_cos", "_sinArray", "_cosArray"]
+
+    def __init__(self, resolution: int = 4096):
+        if not isinstance(resolution, int) or resolution < 1:
+            raise ValueError(f"TrigTable resolution must be a positive int, got {resolution!r}")
+        self.resolution = resolution
+        self._step = resolution / tau
+        self._sin = [sin(tau * i / resolution) for i in range(resolution)]
+        self._cos = [cos(tau * i / resolution) for i in range(resolution)]
+        if np is not None:
+            self._sinArray = np.array(self._sin)
+            self._cosArray = np.array(self._cos)
+
+    def __repr__(self) -> str:
+        return f"TrigTable({self.resolution})"
+
+    def sincos(self, radians: float) -> tuple[float, float]:
+        i = round(radians * self._step) % self.resolution
+        return self._sin[i], self._cos[i]
+
+    def sincos_many(self, radians: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        i = np.rint(radians * self._step).astype(np.int64) % self.resolution
+        return self._sinArray[i], self._cosArray[i]
+
+# active backend used by Angle.sincos and VectorArray.rotate_many
+trig: Trig = Trig()
+
+def set_trig(resolution: int = None) -> Trig:
+    """
+    Use exact trig (resolution None) or a TrigTable of `resolution` steps.
+
+    Angles cache their sin/cos pair the first time it's asked for, so
+    call this before building the angles that should use the new backend.
+    """
+    global trig
+    trig = Trig() if resolution is None else TrigTable(resolution)
+    return trig
+
+class FastAngle:
     """
     An angle in radians. Exposes .degrees, .unit
+
+    Angle(radians), Angle(degrees=...) or Angle(vector=...)
     """
     _angle: float
 
-    def __init__(self, *, degrees: Number = None, radians: Number = None, vector: Vector = None):
+    def __init__(self, radians: Number = None, *, degrees: Number = None, vector: Vector = None):
+        if degrees is not None:
+            radians = tau * (degrees / 360)
+        elif vector is not None:
+            radians = -atan2(vector.y, vector.x) + (pi / 2)
+        self._angle = radians
+
+    def __hash__(self) -> int:
+        return hash(self._angle)
+
+    def __repr__(self) -> str:
+        return f"R[{self.degrees, self.radians}]"
+
+    def __eq__(self, ia: Angle) -> bool:
+        return (ia._angle == self._angle)
+
+    def __lt__(self, ia: Angle) -> bool:
+        return (self._angle < ia._angle)
+
+    def __gt__(self, ia: Angle) -> bool:
+        return (self._angle > ia._angle)
+
+    def __le__(self, ia: Angle) -> bool:
+        return (self._angle < ia._angle)
+
+    def __add__(self, ia: Angle) -> Angle:
+        return self.__class__(self.radians + ia.radians)
+
+    def __sub__(self, ia: Angle) -> Angle:
+        return self.__class__(self.radians - ia.radians)
+
+    def __round__(self, places: int) -> Angle:
+        return self.__class__(round(self._angle, places))
+
+    @classmethod
+    def fromvector(cls, vec: Vector) -> Angle:
+        return cls((-((atan2(vec.y, vec.x)))) + (pi / 4))
+
+    # angles never change once built, so everything derived from _angle is cached
+
+    @cached_property
+    def degrees(self) -> float:
+        "this angle as float, measured in degrees and contained in one period"
+        return ((self.radians / tau) * 360)
+
+    @cached_property
+    def radians(self) -> float:
+        "this angle as float, measured in radians and contained in one period"
+        return self._angle % tau
+
+    @cached_property
+    def sincos(self) -> tuple[float, float]:
+        "(sin, cos) of this angle from the active trig backend"
+        return trig.sincos(self.radians)
+
+    @cached_property
+    def unit(self) -> Vector:
+        "this angle as Vector, with distance 1 (unit vector)"
+        return V.from_angle(self, 1)
+
+class AngleKey(FastAngle):
+    """
+    Angle for dict and lru_cache keys: stored within one period, snapped
+    to multiples of `quantum` radians when one is given (DEGREE for whole
+    degrees) and hashed once up front.
+    """
+
+    _hash: int
+
+    def __init__(self, radians: Number, quantum: float = None):
+        if quantum is not None:
+            radians = round(radians / quantum) * quantum
+        self._angle = radians % tau
+        self._hash = hash(self._angle)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @classmethod
+    def from_angle(cls, angle: AngleType, quantum: float = None) -> AngleKey:
+        return cls(angle._angle, quantum)
+
+class CheckedAngle(FastAngle):
+    """
+    FastAngle that validates its arguments and operands.
+    """
+
+    def __init__(self, radians: Number = None, *, degrees: Number = None, vector: Vector = None):
         given = sum(kwarg is not None for kwarg in (degrees, radians, vector))
         if given == 0:
             raise TypeError(f"{self.__init__.__qualname__}() recieved no arguments. One keyword argument is required.")
@@ -40,12 +215,6 @@ class Angle:
             raise TypeError(f"Angle(radians={radians}) has radians supplied but is invalid type {radians.__class__.__qualname__}")
         self._angle = radians
 
-    def __hash__(self) -> int:
-        return hash(self._angle)
-
-    def __repr__(self) -> str:
-        return f"R[{self.degrees, self.radians}]"
-
     def __eq__(self, ia: Angle) -> bool:
         if not isinstance(ia, AngleType):
             raise TypeError(operand_error("==", ia))
@@ -67,34 +236,19 @@ class Angle:
         return (self._angle < ia._angle)
 
     def __add__(self, ia: Angle) -> Angle:
-        if not isinstance(ia, Angle):
+        if not isinstance(ia, AngleType):
             raise TypeError(operand_error("+", ia))
-        return A(radians=(self.radians + ia.radians))
+        return self.__class__(self.radians + ia.radians)
 
     def __sub__(self, ia: Angle) -> Angle:
-        if not isinstance(ia, Angle):
+        if not isinstance(ia, AngleType):
             raise TypeError(operand_error("-", ia))
-        return A(radians=(self.radians - ia.radians))
-
-    def __round__(self, places: int) -> Angle:
-        return A(round(self._angle, places))
-
-    @property
-    def degrees(self) -> float:
-        "this angle as float, measured in degrees and contained in one period"
-        return ((self.radians / tau) * 360)
+        return self.__class__(self.radians - ia.radians)
 
-    @property
-    def radians(self) -> float:
-        "this angle as float, measured in radians and contained in one period"
-        return self._angle % tau
-
-    @cached_property
-    def unit(self) -> Vector:
-        "this angle as Vector, with distance 1 (unit vector)"
-        return V.from_angle(self, 1)
+    # hash is dropped when a subclass defines __eq__
+    __hash__ = FastAngle.__hash__
 
-class Vector:
+class FastVector:
     """
     Vector represents a 2D coordernate on a pixel grid with
     backend values being floats.
@@ -103,34 +257,27 @@ class Vector:
     .y: int
     ._x: float
     ._y: float
+
+    Slotted; .length and .normal are worked out on first use and kept
+    in their own slots rather than a per-instance __dict__.
     """
 
     _x: float
     _y: float
+    _length: float
+    _normal: Vector
 
-    def __init__(self, x, y, *, vector: VectorType = None, angle: AngleType = None, magnitude: float = 1):
-        given = sum(kwarg is not None for kwarg in (vector, angle))
-        if given > 1:
-            raise TypeError(f"{self.__init__.__qualname__}() recieved multiple keyword arguments. Max one allowed.")
-        if vector is not None:
-            if isinstance(vector, VectorType):
-                x, y = vector._x, vector._y
-            else:
-                raise TypeError(f"Vector(vector={vector}) has vector supplied but is invalid type {vector.__class__.__qualname__}")
-        if angle is not None:
-            if isinstance(angle, AngleType):
-                x, y = (sin(angle._angle) * magnitude, cos(angle._angle) * magnitude)
-            else:
-                raise TypeError(f"Vector(angle={angle}) has vector supplied but is invalid type {angle.__class__.__qualname__}")
-        if not isinstance(x, Number):
-            raise TypeError(f"Supplied value {x.__class__.__qualname__}({x}) is not a Number")
-        if not isinstance(y, Number):
-            raise TypeError(f"Supplied value {y.__class__.__qualname__}({y}) is not a Number")
+    # immutable type that operators build their results as; subclasses override
+    _frozen: type
+
+    __slots__ = ["_x", "_y", "_length", "_normal"]
+
+    def __init__(self, x: float, y: float):
         self._x = x
         self._y = y
 
     def __hash__(self) -> int:
-        return hash(self._x) + hash(self._y)
+        return hash((self._x, self._y))
 
     def __iter__(self):
         """Yield ._x then ._y for unpacking"""
@@ -152,85 +299,62 @@ class Vector:
         "x == self[0]; y == self[1]"
         "x, y are rounded ints"
         # treats Vector like a tuple and yields x if i == 0 or y if i == 1
-        if i not in range(2):
-            raise IndexError(f"Vector index `{i}` is not valid")
         return (self.x * ((i + 1) % 2) + self.y * i)
 
     def __round__(self, places: int) -> Vector:
         "round components of self to `places` decimal places"
-        return V(round(self._x, places), round(self._y, places))
+        return self._frozen(round(self._x, places), round(self._y, places))
 
     def __abs__(self) -> Vector:
         "this Vector as Vector, reflected so _x and _y are positive"
-        return Vector(abs(self._x), abs(self._y))
+        return self._frozen(abs(self._x), abs(self._y))
 
     def __add__(self, ia: VectorType) -> Vector:
         "add to this Vector the Vector `ia.x, ia.y`"
-        if not isinstance(ia, VectorType):
-            raise TypeError(operand_error("+", ia))
-        x, y = ia
-        return Vector(self._x + x, self._y + y)
+        return self._frozen(self._x + ia._x, self._y + ia._y)
 
     def __neg__(self) -> Vector:
         "return Vector equal to V(0, 0) - self"
-        return V(-self._x, -self._y)
+        return self._frozen(-self._x, -self._y)
 
     def __sub__(self, ia: VectorType) -> Vector:
         "subtract from this Vector the Vector `ia.x, ia.y`"
-        if not isinstance(ia, VectorType):
-            raise TypeError(operand_error("-", ia))
-        x, y = ia
-        return Vector(self._x - x, self._y - y)
+        return self._frozen(self._x - ia._x, self._y - ia._y)
 
     def __mul__(self, ia: Union[VectorType, Number]) -> Vector:
         "multiply this Vector by scalar `ia` or Vector `ia.x, ia.y`"
         if isinstance(ia, Number):
-            return V(self._x * ia, self._y * ia)
-        elif isinstance(ia, VectorType):
-            return V(self._x * ia._x, self._y * ia._y)
-        else:
-            raise TypeError(operand_error("*", ia))
+            return self._frozen(self._x * ia, self._y * ia)
+        return self._frozen(self._x * ia._x, self._y * ia._y)
 
     def __pow__(self, ia: Number) -> Vector:
         "raise Vector's components to power `ia`"
-        if not isinstance(ia, Number):
-            raise TypeError(operand_error("**", ia))
-        return Vector(self._x ** ia, self._y ** ia)
+        return self._frozen(self._x ** ia, self._y ** ia)
 
     def __truediv__(self, ia: Union[VectorType, Number]) -> Vector:
         "divide this Vector by scalar `ia` or Vector `ia.x, ia.y`"
         if isinstance(ia, Number):
-            return V(self._x / ia, self._y / ia)
-        elif isinstance(ia, VectorType):
-            return V(self._x / ia._x, self._y / ia._y)
-        raise TypeError(operand_error("/", ia))
+            return self._frozen(self._x / ia, self._y / ia)
+        return self._frozen(self._x / ia._x, self._y / ia._y)
 
     def __eq__(self, ia: VectorType) -> bool:
         "unrounded equality with another Vector"
-        if isinstance(ia, VectorType):
-            return self._x == ia._x and self._y == ia._y
-        raise TypeError(operand_error("==", ia))
+        return self._x == ia._x and self._y == ia._y
 
     def __mod__(self, ia: Union[VectorType, Number]) -> Vector:
         "apply modulo to Vector's components with Vector `ia.x, ia.y`"
         "or with number `ia`"
         if isinstance(ia, Number):
-            return Vector(self.x % ia, self.y % ia)
-        elif isinstance(ia, VectorType):
-            return Vector(self.x % ia.x, self.y % ia.y)
-        raise TypeError(operand_error("%", ia))
+            return self._frozen(self.x % ia, self.y % ia)
+        return self._frozen(self.x % ia.x, self.y % ia.y)
 
     def lobind(self, v: VectorType) -> Vector:
         "(min(v._x, self._x)), (min(v._y, self._y))"
-        if not isinstance(v, VectorType):
-            raise TypeError(operand_error("lobind 'lo'", v))
-        return Vector((min(v._x, self._x)), (min(v._y, self._y)))
+        return self._frozen((min(v._x, self._x)), (min(v._y, self._y)))
 
     def hibind(self, v: VectorType) -> Vector:
         "(max(v._x, self._x)), (max(v._y, self._y))"
-        if not isinstance(v, VectorType):
-            raise TypeError(operand_error("hibind 'hi'", v))
-        return Vector((max(v._x, self._x)), (max(v._y, self._y)))
+        return self._frozen((max(v._x, self._x)), (max(v._y, self._y)))
 
     def bind(self, lo: VectorType, hi: VectorType) -> Vector:
         "lobind and hibind to force `self` into bounds `lo`, `hi`"
@@ -242,38 +366,60 @@ class Vector:
         return self.bind(lo, hi) == self
 
     def shift_context(self) -> Vector:
-        return V(self._x, -self._y)
+        return self._frozen(self._x, -self._y)
 
     def approach(self, target: Vector, factor: float) -> Vector:
         return self + (target - self) * factor
 
     def signs(self) -> Vector:
-        return V(1 if self.x >= 0 else -1, 1 if self.y >= 0 else -1)
+        return self._frozen(1 if self.x >= 0 else -1, 1 if self.y >= 0 else -1)
 
     def force_round(self) -> Vector:
-        return V(self.x, self.y)
+        return self._frozen(self.x, self.y)
 
     def rotate(self, angle: Angle) -> Vector:
-        b = angle.radians
-        sinb = sin(b)
-        cosb = cos(b)
-        return V(
+        sinb, cosb = angle.sincos
+        return self._frozen(
             (cosb * self._x) - (sinb * self._y),
             (sinb * self._x) + (cosb * self._y)
         )
 
-    @staticmethod
-    def from_angle(angle: Angle, magnitude: float = 1) -> Vector:
-        return V(sin(angle._angle) * magnitude, cos(angle._angle) * magnitude)
+    @classmethod
+    def from_vector(cls, vector: VectorType) -> Vector:
+        return cls(vector._x, vector._y)
 
-    @staticmethod
-    def from_random_sign() -> Vector:
-        return Vector((randint(0, 1) * 2) - 1, (randint(0, 1) * 2) - 1)
+    @classmethod
+    def from_angle(cls, angle: Angle, magnitude: float = 1) -> Vector:
+        sina, cosa = angle.sincos
+        return cls(sina * magnitude, cosa * magnitude)
+
+    @classmethod
+    def from_random_sign(cls, rng: Random = None) -> Vector:
+        rng = rng or global_random
+        return cls((rng.randint(0, 1) * 2) - 1, (rng.randint(0, 1) * 2) - 1)
 
     @staticmethod
-    def from_random_square(lo: Vector, hi: Vector) -> Vector:
+    def from_random_square(lo: Vector, hi: Vector, rng: Random = None) -> Vector:
+        rng = rng or global_random
         dv = hi - lo
-        return lo + (dv.vx * random() + dv.vy * random())
+        return lo + (dv.vx * rng.random() + dv.vy * rng.random())
+
+    # batched constructors: `count` Vectors from one call, drawing from
+    # `rng` (a random.Random) or the global generator when rng is None
+
+    @classmethod
+    def from_random_signs(cls, count: int, rng: Random = None) -> list[Vector]:
+        "`count` Vectors with each component -1 or 1"
+        bit = (rng or global_random).getrandbits
+        return [cls((bit(1) << 1) - 1, (bit(1) << 1) - 1) for _ in range(count)]
+
+    @classmethod
+    def from_random_squares(cls, lo: Vector, hi: Vector, count: int, rng: Random = None) -> list[Vector]:
+        "`count` Vectors uniformly distributed in the box `lo`, `hi`"
+        draw = (rng or global_random).random
+        x, y = lo._x, lo._y
+        dx, dy = hi._x - x, hi._y - y
+        return [cls(x + dx * draw(), y + dy * draw()) for _ in range(count)]
      
     @property
     def x(self) -> int:
@@ -287,28 +433,709 @@ class Vector:
 
     @property
     def vx(self) -> Vector:
-        return V(self._x, 0)
+        return self._frozen(self._x, 0)
 
     @property
     def vy(self) -> Vector:
-        return V(0, self._y)
+        return self._frozen(0, self._y)
 
-    @cached_property
+    @property
     def length(self) -> float:
-        return hypot(self._x, self._y)
+        try:
+            return self._length
+        except AttributeError:
+            self._length = hypot(self._x, self._y)
+            return self._length
         #return sqrt((self._x ** 2) + (self._y ** 2))
         
-    @cached_property
+    @property
     def normal(self) -> Vector:
-        return V(self._x / self.length, self._y / self.length)
+        try:
+            return self._normal
+        except AttributeError:
+            self._normal = self._frozen(self._x / self.length, self._y / self.length)
+            return self._normal
+
+class CheckedVector(FastVector):
+    """
+    FastVector that validates its arguments and operands and raises
+    TypeError on anything that isn't a Vector or Number.
+
+    Vector(x, y), Vector(0, 0, vector=...) or Vector(0, 0, angle=..., magnitude=...)
+    """
+
+    __slots__ = []
+
+    def __init__(self, x, y, *, vector: VectorType = None, angle: AngleType = None, magnitude: float = 1):
+        given = sum(kwarg is not None for kwarg in (vector, angle))
+        if given > 1:
+            raise TypeError(f"{self.__init__.__qualname__}() recieved multiple keyword arguments. Max one allowed.")
+        if vector is not None:
+            if isinstance(vector, VectorType):
+                x, y = vector._x, vector._y
+            else:
+                raise TypeError(f"Vector(vector={vector}) has vector supplied but is invalid type {vector.__class__.__qualname__}")
+        if angle is not None:
+            if isinstance(angle, AngleType):
+                sina, cosa = angle.sincos
+                x, y = (sina * magnitude, cosa * magnitude)
+            else:
+                raise TypeError(f"Vector(angle={angle}) has vector supplied but is invalid type {angle.__class__.__qualname__}")
+        if not isinstance(x, Number):
+            raise TypeError(f"Supplied value {x.__class__.__qualname__}({x}) is not a Number")
+        if not isinstance(y, Number):
+            raise TypeError(f"Supplied value {y.__class__.__qualname__}({y}) is not a Number")
+        self._x = x
+        self._y = y
+
+    def __getitem__(self, i: int) -> int:
+        if i not in range(2):
+            raise IndexError(f"Vector index `{i}` is not valid")
+        return FastVector.__getitem__(self, i)
 
+    def __add__(self, ia: VectorType) -> Vector:
+        if not isinstance(ia, VectorType):
+            raise TypeError(operand_error("+", ia))
+        return FastVector.__add__(self, ia)
+
+    def __sub__(self, ia: VectorType) -> Vector:
+        if not isinstance(ia, VectorType):
+            raise TypeError(operand_error("-", ia))
+        return FastVector.__sub__(self, ia)
 
-# shorthand definition of Vector
+    def __mul__(self, ia: Union[VectorType, Number]) -> Vector:
+        if not isinstance(ia, (VectorType, *Number)):
+            raise TypeError(operand_error("*", ia))
+        return FastVector.__mul__(self, ia)
+
+    def __pow__(self, ia: Number) -> Vector:
+        if not isinstance(ia, Number):
+            raise TypeError(operand_error("**", ia))
+        return FastVector.__pow__(self, ia)
+
+    def __truediv__(self, ia: Union[VectorType, Number]) -> Vector:
+        if not isinstance(ia, (VectorType, *Number)):
+            raise TypeError(operand_error("/", ia))
+        return FastVector.__truediv__(self, ia)
+
+    def __eq__(self, ia: VectorType) -> bool:
+        if not isinstance(ia, VectorType):
+            raise TypeError(operand_error("==", ia))
+        return FastVector.__eq__(self, ia)
+
+    # hash is dropped when a subclass defines __eq__
+    __hash__ = FastVector.__hash__
+
+    def __mod__(self, ia: Union[VectorType, Number]) -> Vector:
+        if not isinstance(ia, (VectorType, *Number)):
+            raise TypeError(operand_error("%", ia))
+        return FastVector.__mod__(self, ia)
+
+    def lobind(self, v: VectorType) -> Vector:
+        if not isinstance(v, VectorType):
+            raise TypeError(operand_error("lobind 'lo'", v))
+        return FastVector.lobind(self, v)
+
+    def hibind(self, v: VectorType) -> Vector:
+        if not isinstance(v, VectorType):
+            raise TypeError(operand_error("hibind 'hi'", v))
+        return FastVector.hibind(self, v)
+
+FastVector._frozen = FastVector
+CheckedVector._frozen = CheckedVector
+
+class InPlace:
+    """
+    In place operations for a Vector subclass. Every i* method writes
+    its result into self and returns self, so chains such as
+    `v.iadd(w, dt).ibind(lo, hi)` allocate nothing. Operands are not
+    type checked; anything exposing ._x, ._y is accepted.
+    """
+
+    __slots__ = []
+
+    # mutable vectors can't be dictionary keys
+    __hash__ = None
+
+    def set(self, x: float, y: float):
+        "overwrite both components"
+        self._x = x
+        self._y = y
+        return self
+
+    def assign(self, v):
+        "copy the components of Vector `v` into self"
+        self._x = v._x
+        self._y = v._y
+        return self
+
+    def copy(self):
+        return self.__class__(self._x, self._y)
+
+    def iadd(self, v, scale: float = 1):
+        "self += v * scale"
+        self._x += v._x * scale
+        self._y += v._y * scale
+        return self
+
+    def isub(self, v):
+        "self -= v"
+        self._x -= v._x
+        self._y -= v._y
+        return self
+
+    def imul(self, ia):
+        "self *= ia for a scalar or Vector `ia`"
+        if isinstance(ia, Number):
+            self._x *= ia
+            self._y *= ia
+        else:
+            self._x *= ia._x
+            self._y *= ia._y
+        return self
+
+    def iabs(self):
+        "reflect self so both components are positive"
+        self._x = abs(self._x)
+        self._y = abs(self._y)
+        return self
+
+    def isigns(self):
+        "replace self by Vector.signs() of self"
+        # round(c) >= 0 exactly when c >= -0.5
+        self._x = 1 if self._x >= -0.5 else -1
+        self._y = 1 if self._y >= -0.5 else -1
+        return self
+
+    def ibind(self, lo, hi):
+        "Vector.bind(lo, hi) in place"
+        self._x = min(max(self._x, lo._x), hi._x)
+        self._y = min(max(self._y, lo._y), hi._y)
+        return self
+
+    def iapproach(self, target, factor: float):
+        "Vector.approach(target, factor) in place"
+        self._x += (target._x - self._x) * factor
+        self._y += (target._y - self._y) * factor
+        return self
+
+    def inside(self, lo, hi) -> bool:
+        "Vector.inside(lo, hi) without building the bound copy"
+        return lo._x <= self._x <= hi._x and lo._y <= self._y <= hi._y
+
+    # the base class caches these, which would go stale after an in place write
+    @property
+    def length(self) -> float:
+        return hypot(self._x, self._y)
+
+    @property
+    def normal(self):
+        length = self.length
+        return self._frozen(self._x / length, self._y / length)
+
+class VectorKey(FastVector):
+    """
+    Immutable Vector for dict and lru_cache keys. The hash is worked
+    out once, up front, and components snap to multiples of `quantum`
+    when one is given so Vectors a float error apart share a key.
+
+    Operators return plain Vectors.
+    """
+
+    _hash: int
+
+    __slots__ = ["_hash"]
+
+    def __init__(self, x: float, y: float, quantum: float = None):
+        if quantum is not None:
+            x = round(x / quantum) * quantum
+            y = round(y / quantum) * quantum
+        self._x = x
+        self._y = y
+        self._hash = hash((x, y))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    @classmethod
+    def from_vector(cls, vector: VectorType, quantum: float = None) -> VectorKey:
+        return cls(vector._x, vector._y, quantum)
+
+class FastMutableVector(InPlace, FastVector):
+    """
+    Vector that hot simulation loops update in place.
+    Read-only operators (+, -, bind, ...) still return new Vectors.
+    """
+
+    __slots__ = []
+
+class CheckedMutableVector(InPlace, CheckedVector):
+    """
+    FastMutableVector whose read-only operators validate their operands.
+    The i* methods are shared with the fast path and never check.
+    """
+
+    __slots__ = []
+
+class Rect:
+    """
+    Axis aligned box from corner (x0, y0) to corner (x1, y1), edges
+    inclusive, stored as four plain floats. Slotted.
+
+    overlaps and contains are float comparisons and allocate nothing;
+    place and move_to update the box in place so one Rect can be
+    reused for every ball in a tick.
+    """
+
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+
+    __slots__ = ["x0", "y0", "x1", "y1"]
+
+    def __init__(self, x0: float, y0: float, x1: float, y1: float):
+        self.x0 = x0
+        self.y0 = y0
+        self.x1 = x1
+        self.y1 = y1
+
+    @classmethod
+    def from_vectors(cls, pos: Vector, size: Vector) -> Rect:
+        "the box with top left corner `pos` and dimensions `size`"
+        return cls(pos._x, pos._y, pos._x + size._x, pos._y + size._y)
+
+    def __repr__(self) -> str:
+        return f"Rect({self.x0}, {self.y0}, {self.x1}, {self.y1})"
+
+    def __eq__(self, ia: Rect) -> bool:
+        return (self.x0 == ia.x0 and self.y0 == ia.y0
+            and self.x1 == ia.x1 and self.y1 == ia.y1)
+
+    __hash__ = None
+
+    def place(self, pos: Vector, size: Vector) -> Rect:
+        "in place: make self the box at `pos` with dimensions `size`"
+        self.x0 = pos._x
+        self.y0 = pos._y
+        self.x1 = pos._x + size._x
+        self.y1 = pos._y + size._y
+        return self
+
+    def move_to(self, pos: Vector) -> Rect:
+        "in place: move the top left corner to `pos`, keeping the size"
+        self.x1 += pos._x - self.x0
+        self.y1 += pos._y - self.y0
+        self.x0 = pos._x
+        self.y0 = pos._y
+        return self
+
+    def overlaps(self, other: Rect) -> bool:
+        "True when self and `other` share at least one point"
+        return (self.x0 <= other.x1 and other.x0 <= self.x1
+            and self.y0 <= other.y1 and other.y0 <= self.y1)
+
+    def contains(self, point: Vector) -> bool:
+        "True when `point` is inside self, edges included"
+        return self.x0 <= point._x <= self.x1 and self.y0 <= point._y <= self.y1
+
+    def intersection(self, other: Rect) -> Rect:
+        "the box shared by self and `other`, or None when they don't overlap"
+        if not self.overlaps(other):
+            return None
+        return Rect(max(self.x0, other.x0), max(self.y0, other.y0), min(self.x1, other.x1), min(self.y1, other.y1))
+
+    def penetration(self, other: Rect) -> tuple[float, float]:
+        "signed distance self has to move along x and along y to stop"
+        "overlapping `other`, pushing out through the nearer edge."
+        "(0, 0) when they don't overlap"
+        if not self.overlaps(other):
+            return (0., 0.)
+        # push left/up when self's centre is before other's centre
+        if self.x0 + self.x1 < other.x0 + other.x1:
+            dx = other.x0 - self.x1
+        else:
+            dx = other.x1 - self.x0
+        if self.y0 + self.y1 < other.y0 + other.y1:
+            dy = other.y0 - self.y1
+        else:
+            dy = other.y1 - self.y0
+        return (dx, dy)
+
+    @property
+    def lo(self) -> Vector:
+        return V(self.x0, self.y0)
+
+    @property
+    def hi(self) -> Vector:
+        return V(self.x1, self.y1)
+
+    @property
+    def size(self) -> Vector:
+        return V(self.x1 - self.x0, self.y1 - self.y0)
+
+class PackedVectors:
+    """
+    A sequence of Vectors packed into one contiguous float64 buffer as
+    x0, y0, x1, y1, ... for sending over the network.
+
+    .buffer is an array.array, so it supports the buffer protocol
+    (memoryview(packed.buffer)); tobytes and frombytes are single
+    copies of that buffer, little endian on the wire.
+    """
+
+    buffer: array
+
+    __slots__ = ["buffer"]
+
+    def __init__(self, buffer: array = None):
+        self.buffer = array("d") if buffer is None else buffer
+
+    @classmethod
+    def from_vectors(cls, vectors) -> PackedVectors:
+        return cls(array("d", chain.from_iterable((v._x, v._y) for v in vectors)))
+
+    @classmethod
+    def from_array(cls, vectors: VectorArray) -> PackedVectors:
+        buffer = array("d")
+        buffer.frombytes(vectors._data.tobytes())
+        return cls(buffer)
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> PackedVectors:
+        buffer = array("d")
+        buffer.frombytes(data)
+        if sys.byteorder == "big":
+            buffer.byteswap()
+        return cls(buffer)
+
+    def tobytes(self) -> bytes:
+        if sys.byteorder == "big":
+            swapped = array("d", self.buffer)
+            swapped.byteswap()
+            return swapped.tobytes()
+        return self.buffer.tobytes()
+
+    def __len__(self) -> int:
+        return len(self.buffer) // 2
+
+    def __eq__(self, ia: PackedVectors) -> bool:
+        return self.buffer == ia.buffer
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PackedVectors[{len(self)}]"
+
+    def __iter__(self):
+        """Yield every pair as a Vector"""
+        return map(V, self.buffer[0::2], self.buffer[1::2])
+
+    def to_vectors(self, cls: type = None) -> list[Vector]:
+        "unpack into a list of `cls` (V when not given), e.g. MV for mutable copies"
+        return list(map(cls or V, self.buffer[0::2], self.buffer[1::2]))
+
+    def to_array(self) -> VectorArray:
+        return VA(np.frombuffer(self.buffer, dtype=np.float64).reshape((-1, 2)).copy())
+
+class FastVectorArray:
+    """
+    VectorArray holds many 2D Vectors as rows of one contiguous
+    float64 (N, 2) buffer. Every operation is a single vectorised
+    numpy call over all rows instead of one Vector per row.
+
+    Operands may be another VectorArray of the same length (row-wise),
+    a Vector (applied to every row), a Number or a numpy array of N
+    numbers (one per row).
+
+    ._data: numpy.ndarray
+    """
+
+    _data: np.ndarray
+    # type yielded when a single row is read back out as a Vector
+    _vector: type = FastVector
+
+    __slots__ = ["_data"]
+
+    def __init__(self, data):
+        if np is None:
+            raise ImportError(f"{self.__class__.__qualname__} requires numpy")
+        if isinstance(data, FastVectorArray):
+            data = data._data
+        array = np.ascontiguousarray(data, dtype=np.float64)
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError(f"{self.__class__.__qualname__} requires an (N, 2) buffer, got shape {array.shape}")
+        self._data = array
+
+    @classmethod
+    def from_vectors(cls, vectors) -> VectorArray:
+        "pack a sequence of Vectors into one buffer; another VectorArray is copied without unpacking it"
+        if isinstance(vectors, FastVectorArray):
+            return cls(vectors._data.copy())
+        return cls(np.array([(v._x, v._y) for v in vectors], dtype=np.float64).reshape((-1, 2)))
+
+    @classmethod
+    def random_signs(cls, n: int, rng=None) -> VectorArray:
+        "n rows with each component -1 or 1; `rng` is a numpy Generator or a seed"
+        rng = np.random.default_rng(rng)
+        return cls(rng.integers(0, 2, (n, 2)) * 2.0 - 1.0)
+
+    @classmethod
+    def random_squares(cls, lo: Vector, hi: Vector, n: int, rng=None) -> VectorArray:
+        "n rows uniformly distributed in the box `lo`, `hi`; `rng` is a numpy Generator or a seed"
+        rng = np.random.default_rng(rng)
+        return cls(rng.uniform((lo._x, lo._y), (hi._x, hi._y), (n, 2)))
+
+    @classmethod
+    def zeros(cls, n: int) -> VectorArray:
+        return cls(np.zeros((n, 2), dtype=np.float64))
+
+    @classmethod
+    def full(cls, n: int, vector: Vector) -> VectorArray:
+        "n copies of `vector`"
+        return cls(np.tile(np.array((vector._x, vector._y), dtype=np.float64), (n, 1)))
+
+    def _operand(self, op: str, ia):
+        # translate `ia` into something that broadcasts against self._data
+        if isinstance(ia, FastVectorArray):
+            return ia._data
+        if isinstance(ia, Number):
+            return ia
+        if isinstance(ia, VectorType):
+            return np.array((ia._x, ia._y), dtype=np.float64)
+        if np is not None and isinstance(ia, np.ndarray):
+            return ia[:, None] if ia.ndim == 1 else ia
+        # duck type any other vector implementation exposing ._x, ._y
+        try:
+            return np.array((ia._x, ia._y), dtype=np.float64)
+        except AttributeError:
+            raise TypeError(operand_error(op, ia, self.__class__.__qualname__)) from None
+
+    def to_vectors(self, cls: type = None) -> list[Vector]:
+        "unpack every row into its own `cls` (a Vector of the array's flavour when not given), e.g. MV for mutable copies"
+        return list(map(cls or self._vector, self._data[:, 0].tolist(), self._data[:, 1].tolist()))
+
+    def copy(self) -> VectorArray:
+        return self.__class__(self._data.copy())
+
+    def tobytes(self) -> bytes:
+        "rows as one little endian float64 buffer, as PackedVectors.tobytes"
+        return self._data.astype("<f8", copy=False).tobytes()
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> VectorArray:
+        return cls(np.frombuffer(data, dtype="<f8").reshape((-1, 2)).astype(np.float64))
+
+    def __array__(self, dtype=None, copy=None):
+        return self._data if dtype is None else self._data.astype(dtype)
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __iter__(self):
+        """Yield every row as a Vector"""
+        for x, y in self._data.tolist():
+            yield self._vector(x, y)
+
+    def __repr__(self) -> str:
+        return f"VA[{len(self)}]({np.rint(self._data).astype(np.int64).tolist()})"
+
+    def __str__(self) -> str:
+        "__repr__"
+        return repr(self)
+
+    def __getitem__(self, i):
+        "int index yields a Vector; slices, masks and index arrays yield a VectorArray"
+        if isinstance(i, int) or (np is not None and isinstance(i, np.integer)):
+            x, y = self._data[i].tolist()
+            return self._vector(x, y)
+        return self.__class__(self._data[i])
+
+    def __setitem__(self, i, value):
+        self._data[i] = self._operand("[]=", value)
+
+    def __eq__(self, ia) -> np.ndarray:
+        "row-wise unrounded equality; returns a bool array"
+        return np.all(self._data == self._operand("==", ia), axis=1)
+
+    __hash__ = None
+
+    def __abs__(self) -> VectorArray:
+        return self.__class__(np.abs(self._data))
+
+    def __neg__(self) -> VectorArray:
+        return self.__class__(-self._data)
+
+    def __add__(self, ia) -> VectorArray:
+        return self.__class__(self._data + self._operand("+", ia))
+
+    def __sub__(self, ia) -> VectorArray:
+        return self.__class__(self._data - self._operand("-", ia))
+
+    def __mul__(self, ia) -> VectorArray:
+        return self.__class__(self._data * self._operand("*", ia))
+
+    def __truediv__(self, ia) -> VectorArray:
+        return self.__class__(self._data / self._operand("/", ia))
+
+    def __pow__(self, ia: Number) -> VectorArray:
+        if not isinstance(ia, Number):
+            raise TypeError(operand_error("**", ia, self.__class__.__qualname__))
+        return self.__class__(self._data ** ia)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __rsub__(self, ia) -> VectorArray:
+        return self.__class__(self._operand("-", ia) - self._data)
+
+    # in place operators write back into the existing buffer and allocate nothing per row
+
+    def __iadd__(self, ia) -> VectorArray:
+        np.add(self._data, self._operand("+=", ia), out=self._data)
+        return self
+
+    def __isub__(self, ia) -> VectorArray:
+        np.subtract(self._data, self._operand("-=", ia), out=self._data)
+        return self
+
+    def __imul__(self, ia) -> VectorArray:
+        np.multiply(self._data, self._operand("*=", ia), out=self._data)
+        return self
+
+    def __itruediv__(self, ia) -> VectorArray:
+        np.divide(self._data, self._operand("/=", ia), out=self._data)
+        return self
+
+    def lobind(self, v) -> VectorArray:
+        return self.__class__(np.minimum(self._data, self._operand("lobind 'lo'", v)))
+
+    def hibind(self, v) -> VectorArray:
+        return self.__class__(np.maximum(self._data, self._operand("hibind 'hi'", v)))
+
+    def bind(self, lo, hi) -> VectorArray:
+        "force every row into bounds `lo`, `hi` inclusive"
+        return self.__class__(np.clip(self._data, self._operand("bind 'lo'", lo), self._operand("bind 'hi'", hi)))
+
+    def inside(self, lo, hi) -> np.ndarray:
+        "bool array, True where the row is inside bounds `lo`, `hi` inclusive"
+        data = self._data
+        return np.all((data >= self._operand("inside 'lo'", lo)) & (data <= self._operand("inside 'hi'", hi)), axis=1)
+
+    def approach(self, target, factor) -> VectorArray:
+        return self.__class__(self._data + (self._operand("approach", target) - self._data) * self._operand("approach", factor))
+
+    def signs(self) -> VectorArray:
+        # matches Vector.signs, which tests the rounded components
+        return self.__class__(np.where(np.rint(self._data) >= 0, 1.0, -1.0))
+
+    def rotate(self, angle: Angle) -> VectorArray:
+        sinb, cosb = angle.sincos
+        x, y = self._data[:, 0], self._data[:, 1]
+        return self.__class__(np.column_stack((
+            (cosb * x) - (sinb * y),
+            (sinb * x) + (cosb * y)
+        )))
+
+    def rotate_many(self, angles) -> VectorArray:
+        "rotate every row by its own angle; `angles` is N Angles or N radians"
+        if not isinstance(angles, np.ndarray):
+            angles = np.fromiter((a.radians if isinstance(a, AngleType) else a for a in angles), dtype=np.float64, count=len(angles))
+        if angles.shape != (len(self),):
+            raise ValueError(f"rotate_many needs one angle per row: {len(self)} rows, angles of shape {angles.shape}")
+        sinb, cosb = trig.sincos_many(np.mod(angles, tau))
+        x, y = self._data[:, 0], self._data[:, 1]
+        return self.__class__(np.column_stack((
+            (cosb * x) - (sinb * y),
+            (sinb * x) + (cosb * y)
+        )))
+
+    @property
+    def x(self) -> np.ndarray:
+        """Return x components as rounded ints"""
+        return np.rint(self._data[:, 0]).astype(np.int64)
+
+    @property
+    def y(self) -> np.ndarray:
+        """Return y components as rounded ints"""
+        return np.rint(self._data[:, 1]).astype(np.int64)
+
+    @property
+    def vx(self) -> VectorArray:
+        data = np.zeros_like(self._data)
+        data[:, 0] = self._data[:, 0]
+        return self.__class__(data)
+
+    @property
+    def vy(self) -> VectorArray:
+        data = np.zeros_like(self._data)
+        data[:, 1] = self._data[:, 1]
+        return self.__class__(data)
+
+    @property
+    def length(self) -> np.ndarray:
+        return np.hypot(self._data[:, 0], self._data[:, 1])
+
+    @property
+    def normal(self) -> VectorArray:
+        return self.__class__(self._data / self.length[:, None])
+
+class CheckedVectorArray(FastVectorArray):
+    """
+    FastVectorArray that yields CheckedVectors when rows are read back out.
+    """
+    _vector: type = CheckedVector
+
+    __slots__ = []
 
-V = Vector
-A = Angle
 
 Number = (float, int)
-VectorType = (Vector)
-AngleType = (Angle)
+# the checked classes subclass the fast ones, so either kind is accepted
+VectorType = (FastVector,)
+AngleType = (FastAngle,)
+
+# public name -> class, for each mode
+_FAMILIES = {
+    FAST: {"Vector": FastVector, "Angle": FastAngle, "MutableVector": FastMutableVector, "VectorArray": FastVectorArray},
+    CHECKED: {"Vector": CheckedVector, "Angle": CheckedAngle, "MutableVector": CheckedMutableVector, "VectorArray": CheckedVectorArray},
+}
+
+# interned constants; use these instead of rebuilding V(0, 0) etc. every tick
+_CONSTANTS = {
+    mode: {
+        "V_ZERO": family["Vector"](0, 0),
+        "V_ONE": family["Vector"](1, 1),
+        "V_NEG_ONE": family["Vector"](-1, -1),
+        "V_UNIT_X": family["Vector"](1, 0),
+        "V_UNIT_Y": family["Vector"](0, 1),
+    }
+    for mode, family in _FAMILIES.items()
+}
+
+mode: str
+
+def set_mode(new: str) -> None:
+    """
+    Point Vector, V, Angle, A, MutableVector, MV, VectorArray, VA and
+    the V_* constants at the fast or checked classes.
+
+    Only affects names looked up after the call: a module that already
+    ran `from vector import V` keeps whatever V was at that time, so
+    call this before importing the game modules.
+    """
+    global mode, Vector, V, Angle, A, MutableVector, MV, VectorArray, VA
+    global V_ZERO, V_ONE, V_NEG_ONE, V_UNIT_X, V_UNIT_Y
+    if new not in _FAMILIES:
+        raise ValueError(f"unknown vector mode {new!r}, expected {FAST!r} or {CHECKED!r}")
+    family = _FAMILIES[new]
+    # shorthand definition of Vector
+    V = Vector = family["Vector"]
+    A = Angle = family["Angle"]
+    MV = MutableVector = family["MutableVector"]
+    VA = VectorArray = family["VectorArray"]
+    globals().update(_CONSTANTS[new])
+    mode = new
 
+set_mode(os.environ.get(MODE_VARIABLE, FAST))
+if os.environ.get(TRIG_VARIABLE):
+    set_trig(int(os.environ[TRIG_VARIABLE]))